@@ -12,50 +12,158 @@ on the reflectance curves (not tinting strength); the hull boundary in a subtrac
 system is driven by pure pigments and 2-pigment mixes. This makes one set's gamut a
 handful of cheap matrix ops + a 3-D ConvexHull.
 
+Those samples are the same for every set, so they are tabulated once per library: the
+mix-Lab table (n, n, len(_RATIOS), 3) holds the Lab of every ordered pair at every ratio
+step — [i, j, k] = _RATIOS[k]·K/S_i + (1 − _RATIOS[k])·K/S_j, the diagonal being the pure
+pigments — and a set's sample cloud is an index gather from it. scripts/
+build_gamut_mix_labs.py writes it to app/data/gamut_mix_labs.npy (memory-mapped on load,
+shared by the gunicorn workers) next to a meta JSON carrying the sha256 of the library
+file it was built from; a missing or stale table is rebuilt in memory on first use.
+
+The library itself loads from its binary companion when there is one: scripts/
+build_pigment_library_bin.py writes app/data/pigments_library/ — R, KS and lab as .npy
+(memory-mapped, so a recycled worker neither parses 12k JSON floats nor holds its own
+copy) plus meta.json with the per-pigment metadata, the JSON's sha256 and the format
+version. Anything stale falls back to parsing the JSON.
+
 Public API:
   catalog()                      -> [pigment dicts] for the picker
   gamut_volume(pnumbers)         -> float
   gamut_detail(pnumbers)         -> {volume, ab_hull, pigment_points, ...} for plotting
-  greedy(locked, size, pool)     -> ordered [pigment + volume_after + delta]
+  greedy(locked, size, pool, lazy)   -> ordered [pigment + volume_after + delta]
+  greedy_steps(..., cancel)      -> the same search, yielding each pick as it is made
+  pigment(pnumber)               -> library record incl. its R curve (None if unknown)
+  save_library_bin(dir)          the binary library companion
+  build_mix_labs() / save_mix_labs(path)   the mix-Lab table and its artifact
+  set_gamut_workers(n)           resize the candidate-scoring pool (1 = serial)
+  CACHE.stats()                  per-set memo hit rates (reported by the /gamut routes)
 
 The lab compares two independently configured palettes against each other (A vs B), so
 there is no privileged baseline set — every palette is scored on its own and the client
 takes the A↔B difference.
 """
+import atexit
+import copy
+import hashlib
+import heapq
 import json
+import multiprocessing
 import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
 
 import numpy as np
-from scipy.spatial import ConvexHull, Delaunay, QhullError
+from scipy.spatial import ConvexHull, Delaunay, QhullError, cKDTree
 
 from . import spectral_km as E
 
 _DATA = os.path.join(os.path.dirname(__file__), 'data', 'pigments_library.json')
+LIBRARY_BIN_DIR = os.path.join(os.path.dirname(__file__), 'data', 'pigments_library')
+# Bump when the companion's layout or the K/S it stores (E.ks) changes.
+LIBRARY_BIN_VERSION = 1
 _RATIOS = np.linspace(0.1, 0.9, 9)   # interior pairwise-mix steps
+MIX_LABS_PATH = os.path.join(os.path.dirname(__file__), 'data', 'gamut_mix_labs.npy')
+# Bump when the table layout or the KM → Lab pipeline (E.ks, E.km, E.lab_batch) changes.
+MIX_LABS_VERSION = 1
+# Lazy greedy: bounds are kept from the 4th pick on (before that the hull is still flat or
+# a sliver and gains grow step to step), and a stale bound is multiplied by 1 + _LAZY_SLACK
+# for every step it ages, since hull-volume gain is only roughly submodular. A heuristic,
+# not a bound — tuned with scripts/bench_gamut_greedy.py: pick sequences identical to the
+# exhaustive scan over 99 searches (slack 1.0 differed in 4), ~60% fewer volumes.
+_LAZY_FROM = 4
+_LAZY_SLACK = 3.0
 
 # ΔE2000 reachability thresholds reported by the coverage metric (imperceptible / very
 # good / edge-of-gamut — the same bands the /reverse_engineer reachability verdict uses).
 _DE_THRESHOLDS = (1.0, 3.0, 6.0)
 
+# Nearest-reachable search (coverage): Euclidean-Lab KD-tree candidates per target, then
+# lower-bound-certified exact ΔE2000 (see _nearest_delta_e).
+_KD_CANDIDATES = 16
+_BOUND_CHUNK = 1 << 16    # (target, sample) lower bounds evaluated at a time
+_DE00_KAPPA = 1.0 - np.sin(np.pi / 3)   # 1 − max|R_T|/2
+
 _STATE = None
+_MIX_LABS = None      # (n, n, len(_RATIOS), 3) Lab of every pure/pairwise sample
+_MIX_LOCK = threading.Lock()
 _CATALOG_LAB = None   # (n,3) masstone CIELAB of every catalog pigment — the coverage targets
 _REF_VOLUME = None    # CIELAB convex-hull volume of all catalog masstones (coverage reference)
 
 
 def _load():
-    """Load + cache the library: pigment metadata, KS matrix, pnumber→index."""
+    """Load + cache the library: pigment metadata P (records without their R curve), the
+    R / KS / masstone-Lab arrays, pnumber→index and the sha256 of the library file (the
+    checksum guard of the binary companion and the mix-Lab table)."""
     global _STATE
     if _STATE is not None:
         return _STATE
-    lib = json.load(open(_DATA))
-    P = lib['pigments']
-    R = np.clip(np.array([p['R'] for p in P], dtype=float), 1e-4, 1.0)
-    KS = E.ks(R)                                  # (n, 38)
-    index = {str(p['pnumber']): i for i, p in enumerate(P)}
-    _STATE = {'lib': lib, 'P': P, 'KS': KS, 'index': index}
+    with open(_DATA, 'rb') as f:
+        raw = f.read()
+    sha = hashlib.sha256(raw).hexdigest()
+    st = _load_bin(sha)
+    if st is None:
+        lib = json.loads(raw)
+        P = lib.pop('pigments')
+        R = np.array([p.pop('R') for p in P], dtype=float)
+        st = {'lib': lib, 'P': P, 'R': R, 'KS': E.ks(np.clip(R, 1e-4, 1.0)),
+              'lab': np.array([p['lab'] for p in P], dtype=float)}
+    st['index'] = {str(p['pnumber']): i for i, p in enumerate(st['P'])}
+    st['sha256'] = sha
+    _STATE = st
     return _STATE
 
 
+def _library_bin_meta(sha):
+    return {'version': LIBRARY_BIN_VERSION, 'library_sha256': sha}
+
+
+def save_library_bin(directory=LIBRARY_BIN_DIR):
+    """Write the binary companion of pigments_library.json into `directory` (from the JSON
+    itself, whatever _load last used)."""
+    with open(_DATA, 'rb') as f:
+        raw = f.read()
+    lib = json.loads(raw)
+    P = lib.pop('pigments')
+    R = np.array([p.pop('R') for p in P], dtype=float)
+    os.makedirs(directory, exist_ok=True)
+    np.save(os.path.join(directory, 'R.npy'), R)
+    np.save(os.path.join(directory, 'KS.npy'), E.ks(np.clip(R, 1e-4, 1.0)))
+    np.save(os.path.join(directory, 'lab.npy'), np.array([p['lab'] for p in P], dtype=float))
+    with open(os.path.join(directory, 'meta.json'), 'w') as f:
+        json.dump({**_library_bin_meta(hashlib.sha256(raw).hexdigest()), 'lib': lib, 'pigments': P}, f)
+    return len(P)
+
+
+def _load_bin(sha, directory=LIBRARY_BIN_DIR):
+    """The library state from the binary companion (arrays memory-mapped), or None if it's
+    missing or wasn't built from this JSON (sha256) in this LIBRARY_BIN_VERSION format."""
+    try:
+        with open(os.path.join(directory, 'meta.json')) as f:
+            meta = json.load(f)
+        if {k: meta.get(k) for k in ('version', 'library_sha256')} != _library_bin_meta(sha):
+            return None
+        arrays = {name: np.load(os.path.join(directory, f'{name}.npy'), mmap_mode='r')
+                  for name in ('R', 'KS', 'lab')}
+    except (OSError, ValueError):
+        return None
+    n = len(meta['pigments'])
+    if any(a.shape[0] != n for a in arrays.values()):
+        return None
+    return {'lib': meta['lib'], 'P': meta['pigments'], **arrays}
+
+
+def pigment(pnumber):
+    """Library record of `pnumber` with its reflectance 'R' (list on the 38-bin grid), or
+    None if it isn't in the library."""
+    st = _load()
+    i = st['index'].get(str(pnumber))
+    if i is None:
+        return None
+    return {**st['P'][i], 'R': st['R'][i].tolist()}
+
+
 def _idx(pnumbers):
     """Resolve pnumbers → unique library indices, preserving order, skipping unknowns."""
     index = _load()['index']
@@ -70,28 +178,175 @@ def _idx(pnumbers):
 
 # ── Gamut geometry ──────────────────────────────────────────────────────────
 def _labs_from_ks(ks_rows):
-    """(m,38) K/S → (m,3) CIELAB under the engine D65 white (vectorised)."""
-    R = E.km(ks_rows)
-    XYZ = R @ E.CMF.T
-    ratios = XYZ / E.WHITE_XYZ
-    f = np.where(ratios > 0.008856451679035631, np.cbrt(ratios),
-                 7.787037037037037 * ratios + 16.0 / 116.0)
-    return np.stack([116.0 * f[:, 1] - 16.0,
-                     500.0 * (f[:, 0] - f[:, 1]),
-                     200.0 * (f[:, 1] - f[:, 2])], axis=1)
+    """(m,38) K/S → (m,3) CIELAB under the engine D65 white (vectorised). The gamut mixes
+    are plain K/S averages (tinting-free, see the module docstring), so they skip
+    E.mix_batch's concentration stage and share only its KM → Lab tail."""
+    return E.lab_batch(E.km(ks_rows))
+
+
+def build_mix_labs():
+    """The mix-Lab table of the loaded library, computed: (n, n, len(_RATIOS), 3) float64."""
+    KS = _load()['KS']
+    n, r = len(KS), _RATIOS[None, :, None]
+    out = np.empty((n, n, len(_RATIOS), 3))
+    for j in range(n):                            # column j: every pigment mixed with j
+        mix = r * KS[:, None, :] + (1 - r) * KS[j][None, None, :]
+        out[:, j] = _labs_from_ks(mix.reshape(-1, KS.shape[1])).reshape(n, len(_RATIOS), 3)
+    return out
+
+
+def _mix_labs_meta():
+    st = _load()
+    return {'version': MIX_LABS_VERSION, 'library_sha256': st['sha256'],
+            'ratios': [round(float(x), 6) for x in _RATIOS], 'n': len(st['P'])}
+
+
+def save_mix_labs(path=MIX_LABS_PATH):
+    """Build the mix-Lab table and write it to `path` (+ its meta JSON beside it)."""
+    table = build_mix_labs()
+    np.save(path, table)
+    with open(os.path.splitext(path)[0] + '.json', 'w') as f:
+        json.dump(_mix_labs_meta(), f, indent=1)
+    return table
+
+
+def load_mix_labs(path=MIX_LABS_PATH):
+    """Memory-map a saved mix-Lab table; None if it's missing or wasn't built from this
+    library file / ratio grid / MIX_LABS_VERSION (checksum mismatch). Deliberately not
+    keyed on the solver version: the table is KM mixing + Lab only."""
+    try:
+        with open(os.path.splitext(path)[0] + '.json') as f:
+            meta = json.load(f)
+        table = np.load(path, mmap_mode='r')
+    except (OSError, ValueError):
+        return None
+    n = len(_load()['P'])
+    if meta != _mix_labs_meta() or table.shape != (n, n, len(_RATIOS), 3):
+        return None
+    return table
+
+
+def _mix_labs():
+    """The mix-Lab table: the built artifact if it matches the library, else an in-memory
+    build (cached)."""
+    global _MIX_LABS
+    if _MIX_LABS is None:
+        with _MIX_LOCK:
+            if _MIX_LABS is None:
+                table = load_mix_labs()
+                _MIX_LABS = table if table is not None else build_mix_labs()
+    return _MIX_LABS
 
 
 def _sample_labs(idx):
     """Lab samples of the reachable gamut for indices `idx`: pures + pairwise mixes."""
-    KS = _load()['KS']
-    ks = KS[idx]
-    chunks = [ks]
+    L = _mix_labs()
+    idx = np.asarray(idx, dtype=int)
+    chunks = [L[idx, idx, 0]]
     if len(idx) >= 2:
         ii, jj = np.triu_indices(len(idx), k=1)
-        mix = (_RATIOS[None, :, None] * ks[ii][:, None, :]
-               + (1 - _RATIOS)[None, :, None] * ks[jj][:, None, :])
-        chunks.append(mix.reshape(-1, ks.shape[1]))
-    return _labs_from_ks(np.concatenate(chunks, axis=0))
+        chunks.append(L[idx[ii], idx[jj]].reshape(-1, 3))
+    return np.concatenate(chunks, axis=0)
+
+
+def _pair_mix_labs(rows, j):
+    """Lab of the _RATIOS interior mixes of every pigment in `rows` with pigment j →
+    (len(rows), len(_RATIOS), 3) — the pairwise samples that j adds."""
+    return np.asarray(_mix_labs()[rows, j])
+
+
+# ── Candidate-scoring pool ──────────────────────────────────────────────────
+# An exhaustive greedy step scores every pool candidate independently, so the hulls can
+# fan out across processes (Qhull + numpy per candidate; threads would contend for the
+# GIL). Workers reach the mix-Lab table without it being pickled: they memory-map the
+# built artifact themselves, or attach to a SharedMemory copy of an in-memory table; each
+# task carries only the step's hull and a chunk of candidate indices. Volumes come back in
+# candidate order and the parent applies the same _spread tie-break as the serial scan,
+# so the picks do not depend on the worker count. Each worker holds its own numpy/scipy
+# stack (~60–80 MB): the default of 1 scores in the request thread, which is what fits
+# the 512 MB layout in gunicorn.conf.py; set GAMUT_WORKERS where there is CPU to spare.
+GAMUT_WORKERS = max(1, int(os.environ.get('GAMUT_WORKERS', '1')))
+_GAMUT_POOL = None
+_GAMUT_POOL_LOCK = threading.Lock()
+_SHM = None           # SharedMemory this process created for its workers' mix-Lab table
+_SHM_ATTACHED = None  # (in a worker) the parent's block, kept referenced while mapped
+
+
+def set_gamut_workers(workers):
+    """Resize the candidate-scoring pool (1 = serial). Shuts down the current pool, if any."""
+    global GAMUT_WORKERS, _GAMUT_POOL, _SHM
+    with _GAMUT_POOL_LOCK:
+        GAMUT_WORKERS = max(1, int(workers))
+        if _GAMUT_POOL is not None:
+            _GAMUT_POOL.shutdown(wait=False, cancel_futures=True)
+            _GAMUT_POOL = None
+        if _SHM is not None:
+            _SHM.close()
+            _SHM.unlink()
+            _SHM = None
+
+
+atexit.register(set_gamut_workers, 1)
+
+
+def _table_handle():
+    """How a worker reaches the parent's mix-Lab table: ('file', path) for the memory-
+    mapped artifact, else ('shm', name, shape) for a SharedMemory copy made once here."""
+    global _SHM
+    table = _mix_labs()
+    if isinstance(table, np.memmap):
+        return ('file', table.filename)
+    if _SHM is None:
+        _SHM = shared_memory.SharedMemory(create=True, size=table.nbytes)
+        np.ndarray(table.shape, dtype=table.dtype, buffer=_SHM.buf)[...] = table
+    return ('shm', _SHM.name, table.shape)
+
+
+def _init_gamut_worker(handle):
+    """Pool-worker initializer: attach the parent's mix-Lab table (see _table_handle)."""
+    global _MIX_LABS, _SHM_ATTACHED
+    if handle[0] == 'file':
+        _MIX_LABS = np.load(handle[1], mmap_mode='r')
+        return
+    # Spawned workers report to the parent's resource tracker, which unlinks the block
+    # only if the parent never does (set_gamut_workers / exit).
+    _SHM_ATTACHED = shared_memory.SharedMemory(name=handle[1])
+    _MIX_LABS = np.ndarray(handle[2], dtype=np.float64, buffer=_SHM_ATTACHED.buf)
+
+
+def _gamut_pool():
+    """The candidate-scoring pool, or None to score serially (GAMUT_WORKERS is 1, or this
+    already is a pool process)."""
+    global _GAMUT_POOL
+    if GAMUT_WORKERS <= 1 or multiprocessing.parent_process() is not None:
+        return None
+    with _GAMUT_POOL_LOCK:
+        if _GAMUT_POOL is None:
+            # spawn, not fork: the gunicorn worker is threaded (see spectral_km._subset_pool).
+            _GAMUT_POOL = ProcessPoolExecutor(max_workers=GAMUT_WORKERS,
+                                              mp_context=multiprocessing.get_context('spawn'),
+                                              initializer=_init_gamut_worker,
+                                              initargs=(_table_handle(),))
+        return _GAMUT_POOL
+
+
+def _score_candidates(chosen, cands, verts, equations, base_vol):
+    """Hull volume of the chosen cloud + each candidate in `cands` (one pool task): the
+    candidate's samples outside the hull (`equations`) joined to its vertices `verts`."""
+    L = _mix_labs()
+    out = []
+    for c in cands:
+        pts = np.concatenate([L[c, c, :1], L[c, chosen].reshape(-1, 3)])
+        pts = pts[((pts @ equations[:, :3].T + equations[:, 3]) > 1e-9).any(axis=1)]
+        out.append(_hull_volume(np.concatenate([verts, pts])) if len(pts) else base_vol)
+    return out
+
+
+def _hull(points):
+    try:
+        return ConvexHull(points)
+    except (QhullError, ValueError):
+        return None
 
 
 def _hull_volume(points):
@@ -106,6 +361,100 @@ def _spread(points):
     return float(np.linalg.norm(points - c, axis=1).mean())
 
 
+# ── Per-set memo ────────────────────────────────────────────────────────────
+class GamutCache:
+    """Bounded, thread-safe LRU of gamut results per pigment set, keyed by the frozenset of
+    library indices (so A/B toggling between a few palettes, in any pick order, re-uses
+    them). Each entry holds independently computed parts — 'samples' (the Lab cloud),
+    'volume' (its 3-D hull), 'containment' (which catalog masstones its Delaunay
+    triangulation contains), 'coverage:<dtype>', 'ab_hull' — so e.g. a volume lookup
+    never pays for a coverage block. Parts are computed from the sorted indices, so a
+    set's numbers don't depend on the order it was picked in. Per-part hits/misses: see
+    stats(). The Delaunay triangulation itself (~1 MB for a 24-pigment cloud) is not
+    kept, only the containment mask it yields."""
+
+    def __init__(self, maxsize=64):
+        self.maxsize = max(1, int(maxsize))
+        self._entries = OrderedDict()
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def part(self, idx, name, compute):
+        """Part `name` of set `idx`: the cached value, or compute(sorted indices) stored.
+        Dicts/lists are returned as copies, arrays read-only."""
+        key = frozenset(idx)
+        with self._lock:
+            entry = self._entries.get(key)
+            counts = self._counts.setdefault(name, [0, 0])
+            if entry is not None and name in entry:
+                self._entries.move_to_end(key)
+                counts[0] += 1
+                value = entry[name]
+                return copy.deepcopy(value) if isinstance(value, (dict, list)) else value
+            counts[1] += 1
+        value = compute(sorted(key))                    # outside the lock: can take 100 ms
+        if isinstance(value, np.ndarray):
+            value.flags.writeable = False
+        self.put(key, name, value)
+        return copy.deepcopy(value) if isinstance(value, (dict, list)) else value
+
+    def put(self, idx, name, value):
+        """Store a part computed elsewhere (greedy's per-step volumes); not counted."""
+        key = frozenset(idx)
+        with self._lock:
+            self._entries.setdefault(key, {})[name] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            parts = {name: {'hits': h, 'misses': m, 'hit_rate': round(h / (h + m), 3) if h + m else None}
+                     for name, (h, m) in sorted(self._counts.items())}
+            hits, total = sum(h for h, _ in self._counts.values()), sum(h + m for h, m in self._counts.values())
+            return {'entries': len(self._entries), 'maxsize': self.maxsize, 'parts': parts,
+                    'hit_rate': round(hits / total, 3) if total else None}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._counts.clear()
+
+
+CACHE = GamutCache(int(os.environ.get('GAMUT_CACHE_SIZE', '64')))
+
+
+def _set_samples(idx):
+    return CACHE.part(idx, 'samples', _sample_labs)
+
+
+def _set_volume(idx):
+    """Hull volume of the set's samples (0 below 4 pigments, where it is degenerate)."""
+    if len(idx) < 4:
+        return 0.0
+    return CACHE.part(idx, 'volume', lambda ix: _hull_volume(_set_samples(ix)))
+
+
+def _containment(samples):
+    """Which catalog masstones lie inside the hull of `samples` (Delaunay point location)."""
+    try:
+        return Delaunay(samples).find_simplex(_catalog_lab()) >= 0
+    except (QhullError, ValueError):
+        return np.zeros(len(_catalog_lab()), dtype=bool)
+
+
+def _set_coverage(idx, dtype=np.float64):
+    if len(idx) < 4:
+        return _coverage_from_samples(None, 0.0)
+
+    def compute(ix):
+        samples = _set_samples(ix)
+        inside = CACHE.part(ix, 'containment', lambda _: _containment(samples))
+        return _coverage_from_samples(samples, _set_volume(ix), dtype, inside=inside)
+
+    return CACHE.part(idx, 'coverage:' + np.dtype(dtype).name, compute)
+
+
 # ── Coverage error (ΔE2000 reachability of the catalog) ─────────────────────
 def _catalog_lab():
     """Cache + return the (n,3) masstone CIELAB of every catalog pigment, and as a side
@@ -114,13 +463,12 @@ def _catalog_lab():
     "can this palette reach the colours that exist?" target set."""
     global _CATALOG_LAB, _REF_VOLUME
     if _CATALOG_LAB is None:
-        P = _load()['P']
-        _CATALOG_LAB = np.array([p['lab'] for p in P], dtype=float)
+        _CATALOG_LAB = np.array(_load()['lab'], dtype=float)
         _REF_VOLUME = _hull_volume(_CATALOG_LAB)
     return _CATALOG_LAB
 
 
-def _coverage_from_samples(samples, volume):
+def _coverage_from_samples(samples, volume, dtype=np.float64, inside=None):
     """Coverage of the catalog masstones by a reachable gamut given as its Lab sample cloud.
 
     Two complementary numbers, per the colour-reproduction literature:
@@ -131,6 +479,10 @@ def _coverage_from_samples(samples, volume):
         the coverage error is the ΔE2000 to the nearest reachable sample. Reported as
         mean/median/p90/max over all targets (inside-hull targets scored 0) plus the share of
         targets reachable within each ΔE band. mean_delta_e is the headline coverage error.
+
+    The nearest-sample ΔE2000s come from _nearest_delta_e (no targets × samples matrix);
+    dtype=np.float32 opts into the single-precision ΔE2000 path (~1e-4 ΔE — far below the
+    reported 0.01 rounding). `inside` is the containment mask if already known (GamutCache).
     """
     targets = _catalog_lab()
     n = int(targets.shape[0])
@@ -145,17 +497,14 @@ def _coverage_from_samples(samples, volume):
     out['volume_coverage_pct'] = round(100.0 * volume / _REF_VOLUME, 1)
 
     # Gamut-containment: targets inside the reachable hull are reachable (ΔE → 0).
-    try:
-        inside = Delaunay(samples).find_simplex(targets) >= 0
-    except (QhullError, ValueError):
-        inside = np.zeros(n, dtype=bool)
+    if inside is None:
+        inside = _containment(samples)
 
     # ΔE2000 from each *outside* target to its nearest reachable sample = the coverage error.
     de = np.zeros(n, dtype=float)
     out_idx = np.where(~inside)[0]
     if out_idx.size:
-        d = E.ciede2000(targets[out_idx][:, None, :], samples[None, :, :])   # (k, s)
-        de[out_idx] = d.min(axis=1)
+        de[out_idx] = _nearest_delta_e(targets[out_idx], samples, dtype)
 
     out['containment_pct'] = round(100.0 * float(inside.mean()), 1)
     out['mean_delta_e'] = round(float(de.mean()), 2)
@@ -166,13 +515,48 @@ def _coverage_from_samples(samples, volume):
     return out
 
 
-def coverage(pnumbers):
-    """ΔE2000 + volume coverage of the catalog masstones by the chosen pigment set."""
-    idx = _idx(pnumbers)
-    if len(idx) < 4:
-        return _coverage_from_samples(None, 0.0)
-    labs = _sample_labs(idx)
-    return _coverage_from_samples(labs, _hull_volume(labs))
+def _de00_lower_bound(targets, samples):
+    """(k, s) lower bounds on ΔE2000 between CIELAB `targets` (k,3) and `samples` (s,3),
+    from cheap terms only. ΔL' = ΔL and S_L are exact; ΔC'² + ΔH'² = Δa'² + Δb² ≥ Δa² + Δb²
+    (a' = (1+G)·a, G ≥ 0); S_C and S_H are ≤ 1 + 0.045·C̄' with C̄' ≤ 1.5·C̄; and the
+    rotation term costs at most half the chroma/hue part, |R_T| ≤ 2·sin 60°."""
+    dL = targets[:, None, 0] - samples[None, :, 0]
+    dab2 = ((targets[:, None, 1] - samples[None, :, 1]) ** 2
+            + (targets[:, None, 2] - samples[None, :, 2]) ** 2)
+    x = (targets[:, None, 0] + samples[None, :, 0]) / 2.0 - 50.0
+    SL = 1.0 + 0.015 * x * x / np.sqrt(20.0 + x * x)
+    Cbar = (np.hypot(targets[:, 1], targets[:, 2])[:, None] + np.hypot(samples[:, 1], samples[:, 2])[None, :]) / 2.0
+    S = 1.0 + 0.045 * 1.5 * Cbar
+    return np.sqrt(dL * dL / (SL * SL) + _DE00_KAPPA * dab2 / (S * S))
+
+
+def _nearest_delta_e(targets, samples, dtype=np.float64):
+    """ΔE2000 from each target (k,3) to its nearest sample (s,3) — exactly the minimum of
+    the dense (k × s) ΔE2000 matrix, without building it. ΔE2000 is not monotone in
+    Euclidean Lab distance (the ΔE2000-nearest sample can rank in the hundreds), so the
+    KD-tree's _KD_CANDIDATES Euclidean neighbours only give a starting minimum; every
+    sample whose _de00_lower_bound falls below it is then scored exactly, _BOUND_CHUNK
+    pairs at a time. ~16% of the pairs for typical palettes, a ninth of the peak memory."""
+    k = min(_KD_CANDIDATES, len(samples))
+    _, nn = cKDTree(samples).query(targets, k=k)
+    nn = nn.reshape(len(targets), k)
+    best = E.ciede2000(E.prepare_reference(targets[:, None, :], dtype), samples[nn]).min(axis=1)
+    if k == len(samples):
+        return best
+    rows = max(1, _BOUND_CHUNK // len(samples))
+    for a in range(0, len(targets), rows):
+        lb = _de00_lower_bound(targets[a:a + rows], samples)
+        ti, si = np.nonzero(lb < best[a:a + rows, None] * (1 + 1e-9) + 1e-9)
+        if len(ti):
+            d = E.ciede2000(E.prepare_reference(targets[a + ti][:, None, :], dtype), samples[si][:, None, :])
+            np.minimum.at(best, a + ti, d[:, 0].astype(best.dtype))
+    return best
+
+
+def coverage(pnumbers, dtype=np.float64):
+    """ΔE2000 + volume coverage of the catalog masstones by the chosen pigment set
+    (dtype: see _coverage_from_samples)."""
+    return _set_coverage(_idx(pnumbers), dtype)
 
 
 # ── Human skin-colour gamut (a*–b* reference overlay) ───────────────────────
@@ -255,10 +639,7 @@ def skin_targets():
 
 
 def gamut_volume(pnumbers):
-    idx = _idx(pnumbers)
-    if len(idx) < 4:
-        return 0.0
-    return _hull_volume(_sample_labs(idx))
+    return _set_volume(_idx(pnumbers))
 
 
 # ── Public, picker-facing ───────────────────────────────────────────────────
@@ -284,31 +665,53 @@ def gamut_detail(pnumbers):
                                'srgb': st['P'][i]['srgb'], 'name': st['P'][i]['name']} for i in idx]}
     if len(idx) < 2:
         return out
-    labs = _sample_labs(idx)
-    out['volume'] = round(_hull_volume(labs), 1) if len(idx) >= 4 else 0.0
-    out['coverage'] = _coverage_from_samples(labs if len(idx) >= 4 else None, out['volume'])
+    out['volume'] = round(_set_volume(idx), 1)
+    out['coverage'] = _set_coverage(idx)
+    out['ab_hull'] = CACHE.part(idx, 'ab_hull', lambda ix: _ab_hull(_set_samples(ix)))
+    return out
+
+
+def _ab_hull(labs):
     ab = labs[:, 1:3]
     try:
         h = ConvexHull(ab)
-        out['ab_hull'] = [[round(float(ab[v, 0]), 2), round(float(ab[v, 1]), 2)] for v in h.vertices]
+        return [[round(float(ab[v, 0]), 2), round(float(ab[v, 1]), 2)] for v in h.vertices]
     except (QhullError, ValueError):
-        pass
-    return out
+        return []
 
 
 # ── Greedy widest-gamut search ──────────────────────────────────────────────
-def greedy(locked=None, size=8, pool=None, max_pool=400):
+def greedy(locked=None, size=8, pool=None, max_pool=400, lazy=False):
     """Grow a palette to `size` pigments, maximising CIELAB gamut volume at each step.
 
     locked : pnumbers to force-include first (in order). If fewer than 2, the search
              seeds with the lightest + darkest pigment in the pool so the hull is
              non-degenerate.
     pool   : candidate pnumbers to choose from (default: whole catalog).
+    lazy   : lazy greedy (CELF) — a candidate's gain from an earlier step, inflated by
+             _LAZY_SLACK, is treated as a bound on its gain now (hull volume is close
+             to submodular), so each step re-evaluates candidates in bound order only
+             until the best fresh gain beats every remaining bound; ties break on
+             spread exactly as in the exhaustive scan. Not exact where
+             submodularity fails badly; scripts/bench_gamut_greedy.py checks it against
+             the exhaustive scan.
     Returns the ordered chosen pigments, each annotated with the gamut volume reached
-    and the marginal gain it added.
+    and the marginal gain it added, plus how many hull-volume evaluations the search
+    made vs an exhaustive step-by-step scan.
     """
+    for kind, payload in greedy_steps(locked, size, pool, max_pool, lazy):
+        if kind == 'done':
+            return payload
+
+
+def greedy_steps(locked=None, size=8, pool=None, max_pool=400, lazy=False, cancel=None):
+    """greedy() as a generator, for streaming (/gamut/optimize/stream): yields ('pick',
+    record) for each seed/locked pigment and then each pigment as soon as its step is
+    decided, and finally ('done', the greedy() result). `cancel` (a threading.Event or
+    anything with is_set()) is checked before every step; once set, the search stops
+    without a 'done'. Closing the generator stops it the same way."""
     st = _load()
-    P, KS = st['P'], st['KS']
+    P = st['P']
     n = len(P)
     pool_idx = _idx(pool) if pool else list(range(n))
     pool_idx = pool_idx[:max_pool]
@@ -330,31 +733,126 @@ def greedy(locked=None, size=8, pool=None, max_pool=400):
 
     size = max(len(chosen), min(int(size), len(pool_set)))
     seq = []
-    prev_vol = gamut_volume([P[i]['pnumber'] for i in chosen]) if len(chosen) >= 4 else 0.0
+    prev_vol = _set_volume(chosen)
     # Record the seed/locked pigments first.
     for i in chosen:
-        v = _hull_volume(_sample_labs(chosen[:chosen.index(i) + 1])) if chosen.index(i) + 1 >= 4 else 0.0
+        v = _set_volume(chosen[:chosen.index(i) + 1])
         seq.append({**_rec(i), 'volume_after': round(v, 1), 'delta': None, 'locked': i in locked_idx})
-
-    while len(chosen) < size:
-        base = set(chosen)
-        best, best_vol, best_spr = None, -1.0, -1.0
-        for c in pool_set:
-            if c in base:
-                continue
-            pts = _sample_labs(chosen + [c])
-            vol = _hull_volume(pts)
-            if vol > best_vol + 1e-9 or (abs(vol - best_vol) <= 1e-9 and _spread(pts) > best_spr):
-                best, best_vol, best_spr = c, vol, _spread(pts)
-        if best is None:
-            break
-        chosen.append(best)
-        seq.append({**_rec(best), 'volume_after': round(best_vol, 1),
+        yield 'pick', seq[-1]
+
+    # Incremental search: the chosen set's sample cloud and hull are kept between steps,
+    # and every candidate carries just the samples it would add (its pure + its mixes with
+    # each chosen pigment, extended by one pigment's worth per step). Only samples outside
+    # the current hull can grow it, and one that falls inside stays inside for good (the
+    # hull only grows), so each step re-tests only the survivors, and a candidate's volume
+    # is the hull of the current hull's vertices + its surviving samples — exactly the
+    # volume of the full cloud, from a fraction of the points.
+    cands = [c for c in pool_set if c not in chosen]
+    cloud = _sample_labs(chosen)
+    extra = np.concatenate([_mix_labs()[cands, cands, :1]]
+                           + [_pair_mix_labs(cands, j) for j in chosen], axis=1)  # (C, m, 3)
+    alive = np.ones(extra.shape[:2], dtype=bool)       # samples not yet inside the hull
+    heap = []                   # lazy: (-gain bound, pigment index, step it was computed at)
+    evaluations = exhaustive = 0
+    while len(chosen) < size and cands:
+        if cancel is not None and cancel.is_set():
+            return
+        exhaustive += len(cands)
+        hull = _hull(cloud)
+        spreads = {}
+
+        def spread(ci):
+            if ci not in spreads:
+                spreads[ci] = _spread(np.concatenate([cloud, extra[ci]]))
+            return spreads[ci]
+
+        def pick(scored):
+            """(ci, volume) of the best of `scored` [(ci, volume)] in candidate order: the
+            largest volume, ties (1e-9) to the wider spread. Both modes decide with this."""
+            best, best_vol = None, -1.0
+            for ci, vol in scored:
+                if vol > best_vol + 1e-9 or (abs(vol - best_vol) <= 1e-9 and spread(ci) > spread(best)):
+                    best, best_vol = ci, vol
+            return best, best_vol
+
+        def volume(ci):
+            """Hull volume of the chosen cloud + candidate ci (alive[ci] already current)."""
+            nonlocal evaluations
+            evaluations += 1
+            if hull is None:
+                return _hull_volume(np.concatenate([cloud, extra[ci]]))
+            pts = extra[ci][alive[ci]]
+            return _hull_volume(np.concatenate([verts, pts])) if len(pts) else base_vol
+
+        best, best_vol = None, -1.0
+        if hull is not None:
+            verts, base_vol = cloud[hull.vertices], float(hull.volume)
+            eq = hull.equations
+        if lazy and hull is not None and heap and len(chosen) >= _LAZY_FROM:
+            # Re-evaluate stale bounds (computed at an earlier step) — samples re-tested
+            # against this step's hull — until every bound within 1e-9 of the top one is
+            # fresh: the top's gain is then at least every other candidate's bound, and the
+            # fresh entries level with it are exactly the candidates that tie for the step,
+            # settled by the exhaustive scan's rule (pick) so both modes choose alike.
+            pos = {c: ci for ci, c in enumerate(cands)}
+            step = len(chosen)
+            heap = [(neg * (1 + _LAZY_SLACK), c, at) for neg, c, at in heap]
+            heapq.heapify(heap)
+            while True:
+                top = heap[0][0]
+                stale = [e for e in heap if e[0] <= top + 1e-9 and e[2] != step]
+                if not stale:
+                    break
+                for _, c, _ in stale:
+                    ci = pos[c]
+                    row = alive[ci]
+                    if row.any():
+                        row[row] = ((extra[ci][row] @ eq[:, :3].T + eq[:, 3]) > 1e-9).any(axis=1)
+                heap = [e for e in heap if e[0] > top + 1e-9 or e[2] == step]
+                heap += [(base_vol - volume(pos[c]), c, step) for _, c, _ in stale]
+                heapq.heapify(heap)
+            best, best_vol = pick(sorted((pos[c], base_vol - neg) for neg, c, _ in heap
+                                         if neg <= top + 1e-9))
+            heap = [e for e in heap if e[1] != cands[best]]
+            heapq.heapify(heap)
+        else:
+            if hull is not None:
+                dist = extra[alive] @ eq[:, :3].T + eq[:, 3]
+                alive[alive] = (dist > 1e-9).any(axis=1)
+            pool = _gamut_pool() if hull is not None and len(cands) > 1 else None
+            if pool is None:
+                vols = [volume(ci) for ci in range(len(cands))]
+            else:
+                chunk = -(-len(cands) // (4 * GAMUT_WORKERS))
+                parts = [cands[i:i + chunk] for i in range(0, len(cands), chunk)]
+                vols = [v for part in pool.map(_score_candidates, *zip(*[
+                    (chosen, part, verts, eq, base_vol) for part in parts])) for v in part]
+                evaluations += len(cands)
+            best, best_vol = pick(enumerate(vols))
+            if lazy and hull is not None and len(chosen) + 1 >= _LAZY_FROM:
+                heap = [(base_vol - v, c, len(chosen)) for c, v in zip(cands, vols) if c != cands[best]]
+                heapq.heapify(heap)
+        c = cands.pop(best)
+        chosen.append(c)
+        cloud = np.concatenate([cloud, extra[best]])
+        extra = np.delete(extra, best, axis=0)
+        alive = np.delete(alive, best, axis=0)
+        if cands:
+            extra = np.concatenate([extra, _pair_mix_labs(cands, c)], axis=1)
+            alive = np.concatenate([alive, np.ones((len(cands), len(_RATIOS)), dtype=bool)], axis=1)
+        seq.append({**_rec(c), 'volume_after': round(best_vol, 1),
                     'delta': round(best_vol - prev_vol, 1) if len(chosen) >= 5 else None,
                     'locked': False})
         prev_vol = best_vol
+        if len(chosen) >= 4:
+            CACHE.put(chosen, 'volume', best_vol)
+        yield 'pick', seq[-1]
 
+    if cancel is not None and cancel.is_set():
+        return
     detail = gamut_detail([P[i]['pnumber'] for i in chosen])
-    return {'sequence': seq, 'total_volume': round(prev_vol, 1),
-            'coverage': detail['coverage'], 'ab_hull': detail['ab_hull'],
-            'pigment_points': detail['pigment_points']}
+    yield 'done', {'sequence': seq, 'total_volume': round(prev_vol, 1), 'cache': CACHE.stats(),
+                   'coverage': detail['coverage'], 'ab_hull': detail['ab_hull'],
+                   'pigment_points': detail['pigment_points'],
+                   'evaluations': {'mode': 'lazy' if lazy else 'exhaustive', 'performed': evaluations,
+                                   'exhaustive': exhaustive, 'saved': exhaustive - evaluations}}
@@ -0,0 +1,162 @@
+"""Precomputed integer-drop recipe atlas for small palettes, with a Lab nearest-neighbour
+index.
+
+For a five-pigment palette the set of practical integer recipes is finite: every drop
+vector with at most MAX_TOTAL drops in total (49 586 distinct colours for five pigments at
+20 drops, after dropping vectors that are a multiple of a smaller one — 2:2 mixes the same
+colour as 1:1). The atlas mixes every one of them once (spectral_km.mix_batch), stores its
+Lab under every illuminant and indexes the D65 Labs with a KD-tree. That gives
+
+  • instant_recipe — the best integer recipe for a target in O(log n), no optimiser;
+  • seeds for solve_recipe's subset solves (the nearest real recipe of each pigment set).
+
+Built per palette (fingerprinted, see CompiledPalette.fingerprint) by
+scripts/build_recipe_atlas.py into app/data/recipe_atlas/<fingerprint>/ as .npy files that
+are memory-mapped on load, so the (recycled) gunicorn workers share the pages instead of
+each holding a copy. A palette without a built artifact gets an in-memory atlas on first
+use (~0.2 s); palettes wider than MAX_PIGMENTS get none (the recipe count explodes).
+"""
+import json
+import os
+import threading
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+from . import spectral_km as E
+
+ATLAS_DIR = os.path.join(os.path.dirname(__file__), 'data', 'recipe_atlas')
+MAX_TOTAL = 20       # drops per recipe, summed over pigments
+MAX_PIGMENTS = 5     # wider palettes: C(MAX_TOTAL + k, k) recipes — not worth tabulating
+ATLAS_VERSION = 1
+
+_ATLASES = {}        # (palette fingerprint, scoring-light fingerprint) → RecipeAtlas
+_LOCK = threading.Lock()
+
+
+class RecipeAtlas:
+    """drops (n, k) uint8 aligned to `keys`; labs (n, n_illum, 3) float32 in
+    spectral_km.ILLUMINANTS order; R (n, 38) float32 (memory-mapped, None for an
+    in-memory atlas); a KD-tree over the D65 Labs."""
+
+    def __init__(self, keys, drops, labs, R=None, fingerprint=None, max_total=MAX_TOTAL):
+        self.keys = list(keys)
+        self.drops = drops
+        self.labs = labs
+        self.R = R
+        self.fingerprint = fingerprint
+        self.max_total = max_total
+        self.tree = cKDTree(np.asarray(labs[:, 0, :], dtype=float))
+
+    def __len__(self):
+        return len(self.drops)
+
+    @classmethod
+    def build(cls, palette, max_total=MAX_TOTAL, keep_R=False):
+        palette = E.compile_palette(palette)
+        drops = E.drop_vectors(len(palette), max_total)
+        R = E.mix_batch(palette, drops)
+        labs = E._labs_under_all(R).astype(np.float32)
+        return cls(palette.keys, drops, labs, R.astype(np.float32) if keep_R else None,
+                   palette.fingerprint, max_total)
+
+    def save(self, directory):
+        """Write the artifact (needs R — build with keep_R=True)."""
+        if self.R is None:
+            raise ValueError('atlas was built without R; rebuild with keep_R=True to save it')
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, 'drops.npy'), self.drops)
+        np.save(os.path.join(directory, 'labs.npy'), self.labs)
+        np.save(os.path.join(directory, 'R.npy'), self.R)
+        with open(os.path.join(directory, 'meta.json'), 'w') as f:
+            json.dump({'version': ATLAS_VERSION, 'fingerprint': self.fingerprint,
+                       'keys': self.keys, 'max_total': self.max_total, 'n': len(self),
+                       'illuminants': list(E.ILLUMINANTS), 'scoring': E._SCORING.fingerprint},
+                      f, indent=1)
+
+    @classmethod
+    def load(cls, directory, fingerprint=None):
+        """Memory-map a saved atlas; None if it's missing, from another atlas/engine
+        version, built under other scoring lights (names or SPDs — IlluminantStack
+        fingerprint), or (when `fingerprint` is given) built for a different palette."""
+        try:
+            with open(os.path.join(directory, 'meta.json')) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if (meta.get('version') != ATLAS_VERSION or meta.get('illuminants') != list(E.ILLUMINANTS)
+                or meta.get('scoring') != E._SCORING.fingerprint
+                or (fingerprint and meta.get('fingerprint') != fingerprint)):
+            return None
+        load = lambda name: np.load(os.path.join(directory, name), mmap_mode='r')   # noqa: E731
+        return cls(meta['keys'], load('drops.npy'), load('labs.npy'), load('R.npy'),
+                   meta['fingerprint'], meta['max_total'])
+
+    # ── Queries ──
+    def nearest(self, target_labs, k=32, keys=None):
+        """Indices of the (up to) k atlas recipes nearest the target in D65 Lab, closest
+        first. `keys` restricts to recipes using only those pigments (a superset query
+        is filtered, so it may return fewer than k)."""
+        target_labs = np.asarray(target_labs, dtype=float)
+        if keys is None:
+            _, idx = self.tree.query(target_labs[0], k=min(k, len(self)))
+            return np.atleast_1d(idx)
+        allowed = set(keys)
+        banned = [i for i, key in enumerate(self.keys) if key not in allowed]
+        _, idx = self.tree.query(target_labs[0], k=min(8 * k, len(self)))
+        idx = np.atleast_1d(idx)
+        if banned:
+            idx = idx[(np.asarray(self.drops[idx])[:, banned] == 0).all(axis=1)]
+        return idx[:k]
+
+    def best(self, target_labs, k=32, keys=None):
+        """(drops vector, metameric cost) of the best of the k nearest recipes, scored with
+        the solver's own multi-illuminant cost — or (None, inf) if none qualify."""
+        idx = self.nearest(target_labs, k, keys)
+        if not len(idx):
+            return None, np.inf
+        costs = E._metameric_costs(E.ciede2000(target_labs, np.asarray(self.labs[idx], dtype=float)))
+        j = int(np.argmin(costs))
+        return np.asarray(self.drops[idx[j]], dtype=int), float(costs[j])
+
+
+def atlas_dir(palette):
+    """Where scripts/build_recipe_atlas.py puts the artifact for `palette`."""
+    return os.path.join(ATLAS_DIR, E.compile_palette(palette).fingerprint[:16])
+
+
+def atlas_for(palette):
+    """The recipe atlas of `palette` (a CompiledPalette or bases dict): the built artifact
+    if one matches its fingerprint, else an in-memory build (cached per fingerprint).
+    None for palettes wider than MAX_PIGMENTS."""
+    palette = E.compile_palette(palette)
+    if not 0 < len(palette) <= MAX_PIGMENTS:
+        return None
+    fp = palette.fingerprint
+    cache_key = (fp, E._SCORING.fingerprint)    # the Labs are per scoring light
+    atlas = _ATLASES.get(cache_key)
+    if atlas is None:
+        with _LOCK:
+            atlas = _ATLASES.get(cache_key)
+            if atlas is None:
+                atlas = RecipeAtlas.load(atlas_dir(palette), fingerprint=fp)
+                if atlas is None:
+                    atlas = RecipeAtlas.build(palette)
+                _ATLASES[cache_key] = atlas
+    return atlas
+
+
+def instant_recipe(target_color, bases, k=32):
+    """The best integer-drop recipe for `target_color` straight from the atlas — a KD-tree
+    query plus k ΔE evaluations, no optimiser. Returns a spectral_km._recipe_result dict
+    (amounts in drops) + 'reachability', or None if the palette has no atlas."""
+    palette = E.compile_palette(bases)
+    atlas = atlas_for(palette)
+    if atlas is None:
+        return None
+    target_labs = E.prepare_reference(E._labs_under_all(target_color.R))
+    vec, _ = atlas.best(target_labs, k)
+    amounts = {atlas.keys[i]: int(vec[i]) for i in range(len(vec)) if vec[i] > 0}
+    result = E._recipe_result(palette, list(amounts), amounts, target_labs)
+    result['reachability'] = E._reachability(result['delta_e'])
+    return result
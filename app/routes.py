@@ -1,4 +1,4 @@
-from flask import Blueprint, render_template, request, jsonify, send_from_directory, Response, current_app, redirect, url_for
+from flask import Blueprint, render_template, request, jsonify, send_from_directory, Response, current_app, redirect, url_for, stream_with_context
 from datetime import datetime, date, timedelta, timezone
 import colorsys
 import copy
@@ -27,6 +27,9 @@ from .probe import (
 import string
 from .utils import calculate_delta_e, spectrum_to_xyz, xyz_to_rgb
 from . import spectral_km
+from . import spectral_batch
+from . import spectrum_files
+from . import recipe_atlas
 from . import email_utils
 import pandas as pd
 import os
@@ -876,14 +879,12 @@ def build_spectral_palettes():
     sizes = []
     try:
         data_dir = os.path.join(os.path.dirname(__file__), 'data')
-        lib = json.load(open(os.path.join(data_dir, 'pigments_library.json')))
         recs = json.load(open(os.path.join(data_dir, 'palette_recommendations.json')))
-        by_pn = {str(p['pnumber']): p for p in lib['pigments']}
         sizes = recs['sizes']
         for size in sizes:
             pigs = []
             for p in recs['palettes'][str(size)]['pigments']:
-                src = by_pn.get(str(p['pnumber']))
+                src = gamut_lab.pigment(p['pnumber'])     # the library, binary companion first
                 if not src:
                     continue
                 pigs.append({
@@ -904,6 +905,63 @@ def build_spectral_palettes():
     return _SPECTRAL_PALETTES_CACHE
 
 
+_COMPILED_PALETTES = {}
+
+# Solve results for /spectral/solve and /reverse_engineer (spectral_km.SolveCache). Set
+# SPECTRAL_SOLVE_CACHE_PATH (e.g. /tmp/spectral_solves.sqlite) to add the on-disk tier that
+# survives gunicorn's max_requests worker recycling.
+_SOLVE_CACHE = spectral_km.SolveCache(
+    maxsize=int(os.environ.get('SPECTRAL_SOLVE_CACHE_SIZE', '512')),
+    path=os.environ.get('SPECTRAL_SOLVE_CACHE_PATH') or None,
+)
+
+
+# Time budget for the interactive solves (/spectral/solve, /reverse_engineer): a request
+# may send deadline_ms; SPECTRAL_SOLVE_DEADLINE_MS sets the default and the ceiling, so
+# one slow solve can't hold a gthread worker thread for seconds. Unset = no budget.
+_SOLVE_DEADLINE_MS = os.environ.get('SPECTRAL_SOLVE_DEADLINE_MS')
+
+
+def solve_deadline_ms(requested=None):
+    """deadline_ms for a solve: the request's value (if a positive number) capped at the
+    deployment's SPECTRAL_SOLVE_DEADLINE_MS, else that default; None = unbounded."""
+    limit = float(_SOLVE_DEADLINE_MS) if _SOLVE_DEADLINE_MS else None
+    try:
+        requested = float(requested) if requested is not None else None
+    except (TypeError, ValueError):
+        requested = None
+    if requested is None or requested <= 0:
+        return limit
+    return min(requested, limit) if limit is not None else requested
+
+
+def compiled_spectral_palette(palette='classic'):
+    """A /spectral palette compiled for the batched KM engine (spectral_km.CompiledPalette).
+
+    `palette` is a build_spectral_palettes() id (unknown/empty ids fall back to 'classic',
+    as /spectral/solve always has), or 'measured' for the raw build_spectrum_plots() bases
+    /reverse_engineer solves with. Compiled once per id and cached: the palette JSON is
+    static, so per-request rebuilding of SpectralColor bases was pure overhead. Returns
+    None if the palette has no pigments.
+    """
+    if palette == 'measured':
+        key = 'measured'
+    else:
+        palettes = build_spectral_palettes()['palettes']
+        key = palette if palettes.get(palette) else 'classic'
+    compiled = _COMPILED_PALETTES.get(key)
+    if compiled is None:
+        if key == 'measured':
+            bases = spectral_km.bases_from_spectrum_plots(build_spectrum_plots())
+        else:
+            bases = {p['key']: spectral_km.SpectralColor(p['R'], tinting=p.get('tinting', 1.0))
+                     for p in palettes.get(key) or []}
+        if not bases:
+            return None
+        compiled = _COMPILED_PALETTES[key] = spectral_km.compile_palette(bases)
+    return compiled
+
+
 @main.route('/spectral')
 def spectral():
     return render_template('spectral_mixer.html',
@@ -922,20 +980,24 @@ def spectral_solve():
     multi-illuminant solve over the active pigments via spectral_km.solve_mix), so it works
     for the gamut palettes too. The client sends the target reflectance it already
     reconstructed (spectral.Color(rgb).R) so server and client agree on the target curve.
+    Optional deadline_ms bounds the solve (see solve_deadline_ms); a recipe cut short by it
+    comes back with truncated=true. Optional backend: 'lbfgsb' (default) or 'de'.
     """
     data = request.get_json(silent=True) or {}
     palette = str(data.get('palette', 'classic'))
     target_R = data.get('target_R')
     if not target_R or len(target_R) != spectral_km.SIZE:
         return jsonify({'error': f'target_R must be {spectral_km.SIZE} values'}), 400
+    backend = str(data.get('backend', 'lbfgsb'))
+    if backend not in spectral_km.BACKENDS:
+        return jsonify({'error': f'backend must be one of {list(spectral_km.BACKENDS)}'}), 400
     try:
-        sp = build_spectral_palettes()
-        pigs = sp['palettes'].get(palette) or sp['palettes'].get('classic')
-        if not pigs:
+        bases = compiled_spectral_palette(palette)
+        if bases is None:
             return jsonify({'error': 'palette unavailable'}), 400
-        bases = {p['key']: spectral_km.SpectralColor(p['R'], tinting=p.get('tinting', 1.0))
-                 for p in pigs}
-        res = spectral_km.solve_mix(spectral_km.SpectralColor(target_R), bases)
+        res = spectral_km.solve_mix(spectral_km.SpectralColor(target_R), bases, cache=_SOLVE_CACHE,
+                                    deadline_ms=solve_deadline_ms(data.get('deadline_ms')),
+                                    backend=backend)
         if not res:
             return jsonify({'error': 'no solution'}), 500
         return jsonify({
@@ -944,12 +1006,122 @@ def spectral_solve():
             'achieved_rgb': res['achieved_rgb'],
             'delta_e': res['delta_e'],
             'reachability': res['reachability'],
+            'truncated': res.get('truncated', False),
         })
     except Exception:
         current_app.logger.exception('spectral_solve failed')
         return jsonify({'error': 'solve failed'}), 500
 
 
+@main.route('/spectral/instant', methods=['POST'])
+def spectral_instant():
+    """Instant integer-drop recipe from the palette's recipe atlas (app.recipe_atlas): a
+    nearest-neighbour lookup over every tabulated drop recipe, no optimiser — for live
+    preview while the user drags the target. Same body as /spectral/solve; palettes wider
+    than recipe_atlas.MAX_PIGMENTS have no atlas (400 — use /spectral/solve).
+    """
+    data = request.get_json(silent=True) or {}
+    target_R = data.get('target_R')
+    if not target_R or len(target_R) != spectral_km.SIZE:
+        return jsonify({'error': f'target_R must be {spectral_km.SIZE} values'}), 400
+    try:
+        bases = compiled_spectral_palette(str(data.get('palette', 'classic')))
+        if bases is None:
+            return jsonify({'error': 'palette unavailable'}), 400
+        res = recipe_atlas.instant_recipe(spectral_km.SpectralColor(target_R), bases)
+        if res is None:
+            return jsonify({'error': f'no recipe atlas for palettes over {recipe_atlas.MAX_PIGMENTS} pigments'}), 400
+        return jsonify({
+            'amounts': res['amounts'],
+            'percentages': res['percentages'],
+            'achieved_rgb': res['achieved_rgb'],
+            'delta_e': res['delta_e'],
+            'delta_e_by_illuminant': res['delta_e_by_illuminant'],
+            'reachability': res['reachability'],
+        })
+    except Exception:
+        current_app.logger.exception('spectral_instant failed')
+        return jsonify({'error': 'lookup failed'}), 500
+
+
+# Bulk solves: at most this many targets per request, spread over SPECTRAL_SOLVE_WORKERS
+# processes (each a full numpy/scipy worker). Default 1 solves serially in the request
+# thread — raise it only where there is memory headroom beyond the 512 MB plan.
+_SOLVE_BATCH_MAX = 1000
+_SOLVE_WORKERS = max(1, min(int(os.environ.get('SPECTRAL_SOLVE_WORKERS', '1')), os.cpu_count() or 1))
+
+
+@main.route('/spectral/solve_batch', methods=['POST'])
+def spectral_solve_batch():
+    """Solve many targets with one palette, streamed back as NDJSON.
+
+    Body: {palette, solver: 'mix' | 'recipe', backend?, targets: [...]} where each target is a
+    38-value curve, an sRGB triple, or {id, R | rgb}. One line per target as soon as it is
+    solved — {index, id, result} (completion order, not input order) — then a final
+    {done, solved, cache} line. Shares the compiled palette, the solve cache and a
+    per-batch process pool (app.spectral_batch).
+    """
+    data = request.get_json(silent=True) or {}
+    solver = str(data.get('solver', 'mix'))
+    if solver not in spectral_batch.SOLVERS:
+        return jsonify({'error': f'solver must be one of {sorted(spectral_batch.SOLVERS)}'}), 400
+    backend = str(data.get('backend', 'lbfgsb'))
+    if backend not in spectral_km.BACKENDS:
+        return jsonify({'error': f'backend must be one of {list(spectral_km.BACKENDS)}'}), 400
+    try:
+        ids, targets_R = spectral_batch.parse_targets(data.get('targets'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    if not len(ids):
+        return jsonify({'error': 'targets must be a non-empty list'}), 400
+    if len(ids) > _SOLVE_BATCH_MAX:
+        return jsonify({'error': f'at most {_SOLVE_BATCH_MAX} targets per request'}), 400
+    bases = compiled_spectral_palette(str(data.get('palette', 'classic')))
+    if bases is None:
+        return jsonify({'error': 'palette unavailable'}), 400
+
+    def generate():
+        solved = 0
+        try:
+            for i, res in spectral_batch.solve_batch(bases, targets_R, kind=solver,
+                                                     workers=_SOLVE_WORKERS, cache=_SOLVE_CACHE,
+                                                     backend=backend):
+                solved += 1
+                yield json.dumps({'index': i, 'id': ids[i], 'result': res}) + '\n'
+        except Exception:
+            current_app.logger.exception('spectral_solve_batch failed')
+            yield json.dumps({'error': 'solve failed', 'solved': solved}) + '\n'
+            return
+        yield json.dumps({'done': True, 'solved': solved, 'cache': _SOLVE_CACHE.stats()}) + '\n'
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+
+@main.route('/spectral/solve_cache')
+def spectral_solve_cache():
+    """Hit/miss counters of the shared solve-result cache (this worker's view)."""
+    return jsonify(_SOLVE_CACHE.stats())
+
+
+# Batch /spectral/delta_e: at most this many target × mix pairs per request.
+_DELTA_E_MAX_PAIRS = 20000
+
+
+def _delta_e_curves(value, name):
+    """One reflectance curve or a list of them (JSON) → (n, SIZE) floats; ValueError
+    naming the field otherwise."""
+    try:
+        curves = np.asarray(value, dtype=float)
+    except (TypeError, ValueError):
+        curves = None
+    if curves is not None and curves.ndim == 1:
+        curves = curves[None]
+    if (curves is None or curves.ndim != 2 or not len(curves)
+            or curves.shape[1] != spectral_km.SIZE or not np.isfinite(curves).all()):
+        raise ValueError(f'{name} must be a {spectral_km.SIZE}-value curve or a list of them')
+    return curves
+
+
 @main.route('/spectral/delta_e', methods=['POST'])
 def spectral_delta_e():
     """Headline match between a target and a mix, scored under each illuminant.
@@ -959,23 +1131,52 @@ def spectral_delta_e():
     Both curves come from the client (target_R reconstructed from its sRGB, mixed_R the
     true mix reflectance), so server and client agree on the colours being compared.
     Returns ΔE2000 per illuminant; the client picks the active one for the headline.
+
+    Batch forms score every mix against every target in one vectorised call:
+      • JSON with target_R and/or mixed_R as lists of curves →
+        {illuminants, shape: [T, M, n_illum], delta_e: T×M×n_illum nested lists (4 dp)};
+      • an application/octet-stream body of float32 little-endian curves, the ?targets=T
+        (default 1) target curves first and the mixes after → the float32 LE matrix,
+        shape and illuminant order in the X-Delta-E-Shape / X-Illuminants headers.
     """
-    data = request.get_json(silent=True) or {}
-    target_R = data.get('target_R')
-    mixed_R = data.get('mixed_R')
-    if (not target_R or not mixed_R
-            or len(target_R) != spectral_km.SIZE or len(mixed_R) != spectral_km.SIZE):
-        return jsonify({'error': f'target_R and mixed_R must each be {spectral_km.SIZE} values'}), 400
+    binary = request.mimetype == 'application/octet-stream'
+    single = False
+    try:
+        if binary:
+            body = request.get_data(cache=False)
+            n_targets = request.args.get('targets', 1, type=int)
+            row = 4 * spectral_km.SIZE
+            if len(body) % row or not 0 < n_targets < len(body) // row:
+                raise ValueError(f'body must be (targets + mixes) × {spectral_km.SIZE} float32 '
+                                 f'little-endian values, with at least one target and one mix')
+            curves = np.frombuffer(body, dtype='<f4').reshape(-1, spectral_km.SIZE)
+            if not np.isfinite(curves).all():
+                raise ValueError('curves must be finite')
+            targets, mixes = curves[:n_targets], curves[n_targets:]
+        else:
+            data = request.get_json(silent=True) or {}
+            targets = _delta_e_curves(data.get('target_R'), 'target_R')
+            mixes = _delta_e_curves(data.get('mixed_R'), 'mixed_R')
+            single = (np.ndim(data['target_R']) == 1 and np.ndim(data['mixed_R']) == 1)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    if len(targets) * len(mixes) > _DELTA_E_MAX_PAIRS:
+        return jsonify({'error': f'at most {_DELTA_E_MAX_PAIRS} target × mix pairs per request'}), 400
     try:
-        # Pass reflectance curves as lists, not ndarrays: delta_e_by_illuminant treats any
-        # ndarray as a pre-computed Lab stack (the solver's fast path), so an ndarray here
-        # would be mis-read as Lab instead of reflectance.
-        des = spectral_km.delta_e_by_illuminant(
-            [float(v) for v in target_R], [float(v) for v in mixed_R])
-        return jsonify({'by_illuminant': des, 'illuminants': spectral_km.ILLUMINANTS})
+        matrix = spectral_km.delta_e_matrix(targets, mixes)      # (T, M, n_illum)
     except Exception:
         current_app.logger.exception('spectral_delta_e failed')
         return jsonify({'error': 'delta_e failed'}), 500
+    illuminants = spectral_km.ILLUMINANTS
+    if binary:
+        return Response(matrix.astype('<f4').tobytes(), mimetype='application/octet-stream',
+                        headers={'X-Delta-E-Shape': ','.join(map(str, matrix.shape)),
+                                 'X-Illuminants': ','.join(illuminants)})
+    if single:
+        des = {name: float(matrix[0, 0, i]) for i, name in enumerate(illuminants)}
+        return jsonify({'by_illuminant': des, 'illuminants': illuminants})
+    return jsonify({'illuminants': illuminants, 'shape': list(matrix.shape),
+                    'delta_e': np.round(matrix, 4).tolist()})
 
 
 # ── Calibration game (/calibration): perceptibility/acceptability threshold probe ──
@@ -1149,32 +1350,96 @@ def gamut_catalog():
         return jsonify({'pigments': []}), 500
 
 
-@main.route('/gamut/optimize', methods=['POST'])
-def gamut_optimize():
-    """Greedily grow a palette to the requested size, maximising CIELAB gamut volume."""
-    data = request.get_json(silent=True) or {}
+def _gamut_optimize_args(data):
+    """greedy() keyword arguments from an /gamut/optimize[/stream] body."""
     try:
         size = int(data.get('size', 8))
     except (TypeError, ValueError):
         size = 8
     size = max(2, min(size, 24))   # keep a single request bounded
-    locked = [str(p) for p in (data.get('locked') or [])]
     pool = data.get('pool')
-    pool = [str(p) for p in pool] if pool else None
+    return {'size': size, 'locked': [str(p) for p in (data.get('locked') or [])],
+            'pool': [str(p) for p in pool] if pool else None,
+            'lazy': data.get('mode') != 'exhaustive'}
+
+
+@main.route('/gamut/optimize', methods=['POST'])
+def gamut_optimize():
+    """Greedily grow a palette to the requested size, maximising CIELAB gamut volume.
+    Lazy greedy (CELF) by default; {"mode": "exhaustive"} scores every candidate at
+    every step."""
+    data = request.get_json(silent=True) or {}
     try:
-        return jsonify(gamut_lab.greedy(locked=locked, size=size, pool=pool))
+        return jsonify(gamut_lab.greedy(**_gamut_optimize_args(data)))
     except Exception:
         current_app.logger.exception('gamut_optimize failed')
         return jsonify({'error': 'optimization failed'}), 500
 
 
+# Running /gamut/optimize/stream searches: job id → cancel Event. In-process, which is
+# all there is under the single gunicorn worker (gunicorn.conf.py).
+_GAMUT_JOBS = {}
+_GAMUT_JOBS_LOCK = threading.Lock()
+
+
+@main.route('/gamut/optimize/stream', methods=['POST'])
+def gamut_optimize_stream():
+    """/gamut/optimize streamed as NDJSON: a {job, size} line, then one {pick} line per
+    pigment as soon as its greedy step is decided, then a {done} line carrying the rest of
+    the /gamut/optimize result (total_volume, coverage, ab_hull, …; the picks are not
+    repeated). The search stops between steps when the client disconnects or POSTs the
+    job id to /gamut/optimize/cancel — then the last line is {cancelled, picked}."""
+    data = request.get_json(silent=True) or {}
+    args = _gamut_optimize_args(data)
+    job, cancel = secrets.token_hex(8), threading.Event()
+    with _GAMUT_JOBS_LOCK:
+        _GAMUT_JOBS[job] = cancel
+
+    def generate():
+        picked = 0
+        try:
+            yield json.dumps({'job': job, 'size': args['size']}) + '\n'
+            for kind, payload in gamut_lab.greedy_steps(cancel=cancel, **args):
+                if kind == 'pick':
+                    picked += 1
+                    yield json.dumps({'pick': payload, 'index': picked - 1}) + '\n'
+                else:
+                    payload = {k: v for k, v in payload.items() if k != 'sequence'}
+                    yield json.dumps({'done': True, 'picked': picked, **payload}) + '\n'
+                    return
+            yield json.dumps({'cancelled': True, 'picked': picked}) + '\n'
+        except Exception:
+            current_app.logger.exception('gamut_optimize_stream failed')
+            yield json.dumps({'error': 'optimization failed', 'picked': picked}) + '\n'
+        finally:
+            # Also reached when the client goes away: the WSGI server closes this
+            # generator, which closes greedy_steps mid-search.
+            with _GAMUT_JOBS_LOCK:
+                _GAMUT_JOBS.pop(job, None)
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+
+@main.route('/gamut/optimize/cancel', methods=['POST'])
+def gamut_optimize_cancel():
+    """Stop a running /gamut/optimize/stream search: {job}. 404 if it already finished."""
+    data = request.get_json(silent=True) or {}
+    with _GAMUT_JOBS_LOCK:
+        cancel = _GAMUT_JOBS.get(str(data.get('job', '')))
+    if cancel is None:
+        return jsonify({'error': 'no such search'}), 404
+    cancel.set()
+    return jsonify({'cancelled': True})
+
+
 @main.route('/gamut/score', methods=['POST'])
 def gamut_score():
-    """Gamut volume + a*b* hull for an exact, user-chosen pigment set."""
+    """Gamut volume + a*b* hull for an exact, user-chosen pigment set, plus the per-set
+    memo's hit rates (gamut_lab.CACHE)."""
     data = request.get_json(silent=True) or {}
     pnumbers = [str(p) for p in (data.get('pnumbers') or [])]
     try:
-        return jsonify(gamut_lab.gamut_detail(pnumbers))
+        return jsonify({**gamut_lab.gamut_detail(pnumbers), 'cache': gamut_lab.CACHE.stats()})
     except Exception:
         current_app.logger.exception('gamut_score failed')
         return jsonify({'error': 'scoring failed'}), 500
@@ -5857,41 +6122,89 @@ def reverse_engineer_page():
 
 @main.route('/reverse_engineer', methods=['POST'])
 def reverse_engineer():
+    """Recipes for a measured spectrum (the 'measured' palette, solve_recipe's Pareto
+    ladder + reachability).
+
+    A single Wavelength,Reflectance curve answers with one JSON result, as the
+    /reverse_engineer page expects. A multi-sample export (app.spectrum_files: long,
+    one column per sample, or one row per sample) is parsed in chunks and solved through
+    the bulk-solve pool, streamed back as NDJSON — one {index, id, result} line per sample
+    as it completes (result as for a single curve), then {done, solved, cache}. The optional
+    deadline_ms form field bounds the solve — each sample's on its own in a stream.
+    """
     try:
         if 'spectrum_file' not in request.files:
             return jsonify({'error': 'No file uploaded'}), 400
         file = request.files['spectrum_file']
         if file.filename == '':
             return jsonify({'error': 'No file selected'}), 400
-        spectrum_data = pd.read_csv(file)
-        if 'Wavelength' not in spectrum_data.columns or 'Reflectance' not in spectrum_data.columns:
-            return jsonify({'error': 'File must have Wavelength and Reflectance columns'}), 400
-
-        wl = spectrum_data['Wavelength'].astype(float).tolist()
-        refl = spectrum_data['Reflectance'].astype(float).tolist()
-        if not wl or not refl:
-            return jsonify({'error': 'Spectrum file is empty'}), 400
-        # Scale guard: accept 0–100% spectra, normalise to 0–1 for the engine grid.
-        if max(refl) > 1.5:
-            refl = [r / 100.0 for r in refl]
+        try:
+            layout, chunks = spectrum_files.open_spectra(file)
+            if layout == 'single':
+                ids, targets_R = next(chunks)
+        except spectrum_files.SpectrumFileError as e:
+            return jsonify({'error': str(e)}), 400
+        bases = compiled_spectral_palette('measured')
+        if layout != 'single':
+            deadline_ms = solve_deadline_ms(request.form.get('deadline_ms'))
+            return Response(stream_with_context(_reverse_engineer_stream(chunks, bases, deadline_ms)),
+                            mimetype='application/x-ndjson')
 
         # Match the measured spectrum with the Kubelka–Munk engine (same as /spectral),
         # using the uploaded curve as the target. solve_recipe returns a Pareto ladder of
         # recipes (simplest→most accurate) plus a gamut-reachability verdict.
-        target_R = spectral_km.resample_to_grid(wl, refl)
-        target = spectral_km.SpectralColor(target_R)
-        bases = spectral_km.bases_from_spectrum_plots(build_spectrum_plots())
-        result = spectral_km.solve_recipe(target, bases)
-        return jsonify({
-            'options': result['options'],
-            'reachability': result['reachability'],
-            'target_rgb': target.sRGB,
-        })
+        target = spectral_km.SpectralColor(targets_R[0])
+        result = spectral_km.solve_recipe(target, bases, cache=_SOLVE_CACHE,
+                                          deadline_ms=solve_deadline_ms(request.form.get('deadline_ms')))
+        return jsonify(_reverse_engineer_result(result, target.sRGB))
     except Exception as e:
         import traceback; traceback.print_exc()
         return jsonify({'error': str(e)}), 500
 
 
+def _reverse_engineer_result(result, target_rgb):
+    return {
+        'options': result['options'],
+        'reachability': result['reachability'],
+        'target_rgb': target_rgb,
+        'truncated': result.get('truncated', False),
+        'search': result.get('search'),
+    }
+
+
+def _reverse_engineer_stream(chunks, bases, deadline_ms=None):
+    """NDJSON lines for a multi-sample upload: samples are handed to the solve pool chunk
+    by chunk as the file is parsed (spectral_batch.solve_stream), at most _SOLVE_BATCH_MAX,
+    each solve bounded by `deadline_ms` on its own (see solve_deadline_ms)."""
+    ids, curves = [], []
+
+    def parsed():
+        for chunk_ids, chunk_R in chunks:
+            if len(ids) + len(chunk_ids) > _SOLVE_BATCH_MAX:
+                raise spectrum_files.SpectrumFileError(f'at most {_SOLVE_BATCH_MAX} samples per upload')
+            ids.extend(chunk_ids)
+            curves.extend(chunk_R)
+            yield chunk_R
+
+    solved = 0
+    try:
+        for i, res in spectral_batch.solve_stream(bases, parsed(), kind='recipe',
+                                                  workers=_SOLVE_WORKERS, cache=_SOLVE_CACHE,
+                                                  deadline_ms=deadline_ms):
+            solved += 1
+            target_rgb = spectral_km.SpectralColor(curves[i]).sRGB
+            yield json.dumps({'index': i, 'id': ids[i],
+                              'result': _reverse_engineer_result(res, target_rgb)}) + '\n'
+    except spectrum_files.SpectrumFileError as e:    # the upload's fault: tell the client
+        yield json.dumps({'error': str(e), 'solved': solved}) + '\n'
+        return
+    except Exception:
+        current_app.logger.exception('reverse_engineer stream failed')
+        yield json.dumps({'error': 'solve failed', 'solved': solved}) + '\n'
+        return
+    yield json.dumps({'done': True, 'solved': solved, 'cache': _SOLVE_CACHE.stats()}) + '\n'
+
+
 @main.route('/ishihara/<filename>')
 def serve_ishihara_image(filename):
     ishihara_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'ishihara')
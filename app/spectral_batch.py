@@ -0,0 +1,152 @@
+"""Bulk recipe solving — many targets against one palette (/spectral/solve_batch and
+scripts/solve_batch.py).
+
+Looping /spectral/solve over a target set (the ~330 gamut targets, an uploaded swatch
+list) repeats the per-request work N times. Here the palette is compiled once and shipped
+to each pool worker once (initializer, not per task), every target's per-illuminant Lab
+stack is computed in one batched pass, and the independent solves fan out across a
+process pool. Results are yielded as they complete, so a streaming response can send
+the first recipes long before the whole batch is done.
+
+Public API:
+  parse_targets(items)                             -> (ids, R (N,38))
+  solve_batch(palette, targets_R, kind, workers)   -> yields (index, result)
+  solve_stream(palette, chunks, kind, workers)     -> the same, for targets arriving in chunks
+"""
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from . import spectral_km as E
+
+# kind → (SolveCache kind, default solver parameters). The cache kinds are the ones
+# solve_mix/solve_recipe use themselves, so batch and single solves share entries.
+SOLVERS = {
+    'mix': ('solve_mix', {'seed': 0, 'significance': 0.03, 'backend': 'lbfgsb'}),
+    'recipe': ('solve_recipe', {'seed': 0, 'max_options': 3, 'significance': 0.02,
+                                'backend': 'lbfgsb', 'prune': False}),
+}
+
+_PALETTE = None   # per pool-worker compiled palette, set once by _init_worker
+
+
+def parse_targets(items):
+    """Targets as sent by a client → (ids, reflectance (N, 38)).
+
+    Each item is either a 38-value reflectance curve, a 3-value 8-bit sRGB triple
+    (reconstructed exactly as the /spectral client does, spectral_km.srgb_to_reflectance),
+    or a dict {'id'?, 'R' | 'rgb'} of the same. Raises ValueError naming the bad item."""
+    ids, curves = [], []
+    for i, item in enumerate(items or []):
+        ident = i
+        if isinstance(item, dict):
+            ident = item.get('id', i)
+            item = item.get('R') if item.get('R') is not None else item.get('rgb')
+        try:
+            vals = [float(v) for v in item]
+        except (TypeError, ValueError):
+            raise ValueError(f'target {i}: expected {E.SIZE} reflectance values or an sRGB triple')
+        if len(vals) == E.SIZE:
+            curves.append(np.array(vals))
+        elif len(vals) == 3:
+            curves.append(E.srgb_to_reflectance(np.clip(vals, 0, 255)))
+        else:
+            raise ValueError(f'target {i}: expected {E.SIZE} reflectance values or an sRGB triple')
+        ids.append(ident)
+    if not curves:
+        return ids, np.zeros((0, E.SIZE))
+    return ids, np.stack(curves)
+
+
+def _run(kind, target_labs, palette, params, deadline_ms=None):
+    if kind == 'recipe':
+        return E._solve_recipe_labs(target_labs, palette, **params, deadline_ms=deadline_ms)
+    return E._solve_mix_labs(target_labs, palette, **params, deadline_ms=deadline_ms)
+
+
+def _init_worker(palette, illuminants):
+    global _PALETTE
+    _PALETTE = palette
+    E.configure_illuminants(*illuminants)
+
+
+def _solve_one(kind, index, target_labs, params, deadline_ms=None):
+    return index, _run(kind, target_labs, _PALETTE, params, deadline_ms)
+
+
+def solve_batch(palette, targets_R, kind='mix', workers=1, cache=None, deadline_ms=None, **params):
+    """Solve every target curve in `targets_R` (N, 38) with `palette`; yields (index,
+    result) in completion order (cache hits first). `kind` is 'mix' (solve_mix) or
+    'recipe' (solve_recipe); extra keyword args override that solver's parameters.
+    `deadline_ms` bounds each target's solve on its own (its clock starts when that solve
+    does); as with single solves, truncated results are not cached.
+
+    With workers > 1 the cache misses are spread over a process pool created for this
+    batch; closing the generator early (e.g. the client went away) cancels the solves
+    that have not started yet."""
+    return solve_stream(palette, [targets_R], kind, workers, cache, deadline_ms, **params)
+
+
+def solve_stream(palette, chunks, kind='mix', workers=1, cache=None, deadline_ms=None, **params):
+    """solve_batch for targets that arrive in pieces: `chunks` is an iterable of (n, 38)
+    curve arrays (e.g. an upload still being parsed) and indices run on across chunks.
+    Each chunk's Lab stacks are computed in one pass and its cache misses submitted as
+    soon as it arrives; solves that finished meanwhile are yielded before the next chunk
+    is read, so the first recipes go out while the rest of the input is still coming.
+    One pool serves the whole stream (created when the misses first justify it)."""
+    if kind not in SOLVERS:
+        raise ValueError(f'unknown solver {kind!r}')
+    cache_kind, defaults = SOLVERS[kind]
+    params = {**defaults, **{k: v for k, v in params.items() if k in defaults}}
+    palette = E.compile_palette(palette)
+
+    pool, futures, offset = None, {}, 0
+    try:
+        for chunk in chunks:
+            R = np.clip(np.asarray(chunk, dtype=float).reshape(-1, E.SIZE), 1e-4, 1.0)
+            labs = E._labs_under_all(R)          # (n, n_illum, 3) — one pass for the chunk
+            pending = []
+            for j in range(len(R)):
+                key = E.SolveCache.key(cache_kind, palette, R[j], params) if cache is not None else None
+                hit = cache.get(key) if key is not None else None
+                if hit is not None:
+                    yield offset + j, hit
+                else:
+                    pending.append((j, key))
+
+            if pool is None and (workers <= 1 or len(pending) < 2):
+                for j, key in pending:
+                    result = _run(kind, labs[j], palette, params, deadline_ms)
+                    _store(cache, key, result)
+                    yield offset + j, result
+            else:
+                if pool is None:
+                    # spawn, not fork: this runs in a threaded gunicorn worker, and forking a
+                    # threaded process can copy a lock (solve cache, sqlite, logging) some
+                    # other request thread holds. initargs carry everything a worker needs.
+                    pool = ProcessPoolExecutor(max_workers=int(workers),
+                                               mp_context=multiprocessing.get_context('spawn'),
+                                               initializer=_init_worker,
+                                               initargs=(palette, E.illuminant_config()))
+                for j, key in pending:
+                    futures[pool.submit(_solve_one, kind, offset + j, labs[j], params, deadline_ms)] = key
+                for fut in [f for f in futures if f.done()]:
+                    yield _collect(fut, futures.pop(fut), cache)
+            offset += len(R)
+        for fut in as_completed(futures):
+            yield _collect(fut, futures[fut], cache)
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _collect(fut, key, cache):
+    i, result = fut.result()
+    _store(cache, key, result)
+    return i, result
+
+
+def _store(cache, key, result):
+    if key is not None and not result.get('truncated'):
+        cache.put(key, result)
@@ -36,7 +36,19 @@ so it requires a calibration assumption to validate first — kept as a separate
 because it diverges from the /spectral rendering this module is deliberately consistent
 with.
 """
+import copy
+import functools
+import hashlib
+import json
+import multiprocessing
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from itertools import combinations
+from math import comb
 
 import numpy as np
 from scipy.optimize import minimize
@@ -83,6 +95,46 @@ XYZ_RGB = np.array([
     [0.05563007969699366, -0.20397695888897652, 1.0569715142428786],
 ])
 
+# Base spectra of the sRGB → reflectance reconstruction (spectral.js BASE_SPECTRA, :687),
+# rows W, C, M, Y, R, G, B — 7×38.
+BASE_SPECTRA = np.array([
+    [1.00116072718764, 1.00116065159728, 1.00116031922747, 1.00115867270789, 1.00115259844552, 1.00113252528998, 1.00108500663327, 1.00099687889453,
+     1.00086525152274, 1.0006962900094, 1.00050496114888, 1.00030808187992, 1.00011966602013, 0.999952765968407, 0.999821836899297, 0.999738609557593,
+     0.999709551639612, 0.999731930210627, 0.999799436346195, 0.999900330316671, 1.00002040652611, 1.00014478793658, 1.00025997903412, 1.00035579697089,
+     1.00042753780269, 1.00047623344888, 1.00050720967508, 1.00052519156373, 1.00053509606896, 1.00054022097482, 1.00054272816784, 1.00054389569087,
+     1.00054448212151, 1.00054476959992, 1.00054489887762, 1.00054496254689, 1.00054498927058, 1.000544996993],
+    [0.970585001322962, 0.970592498143425, 0.970625348729891, 0.970786806119017, 0.971368673228248, 0.973163230621252, 0.976740223158765, 0.981587605491377,
+     0.986280265652949, 0.989949147689134, 0.99249270153842, 0.994145680405256, 0.995183975033212, 0.995756750110818, 0.99591281828671, 0.995606157834528,
+     0.994597600961854, 0.99221571549237, 0.986236452783249, 0.967943337264541, 0.891285004244943, 0.536202477862053, 0.154108119001878, 0.0574575093228929,
+     0.0315349873107007, 0.0222633920086335, 0.0182022841492439, 0.016299055973264, 0.0153656239334613, 0.0149111568733976, 0.0146954339898235, 0.0145964146717719,
+     0.0145470156699655, 0.0145228771899495, 0.0145120341118965, 0.0145066940939832, 0.0145044507314479, 0.0145038009464639],
+    [0.990673557319988, 0.990671524961979, 0.990662582353421, 0.990618107644795, 0.99045148087871, 0.989871081400204, 0.98828660875964, 0.984290692797504,
+     0.973934905625306, 0.941817838460145, 0.817390326195156, 0.432472805065729, 0.13845397825887, 0.0537347216940033, 0.0292174996673231, 0.021313651750859,
+     0.0201349530181136, 0.0241323096280662, 0.0372236145223627, 0.0760506552706601, 0.205375471942399, 0.541268903460439, 0.815841685086486, 0.912817704123976,
+     0.946339830166962, 0.959927696331991, 0.966260595230312, 0.969325970058424, 0.970854536721399, 0.971605066528128, 0.971962769757392, 0.972127272274509,
+     0.972209417745812, 0.972249577678424, 0.972267621998742, 0.97227650946215, 0.972280243306874, 0.97228132482656],
+    [0.0210523371789306, 0.0210564627517414, 0.0210746178695038, 0.0211649058448753, 0.0215027957272504, 0.0226738799041561, 0.0258235649693629, 0.0334879385639851,
+     0.0519069663740307, 0.100749014833473, 0.239129899706847, 0.534804312272748, 0.79780757864303, 0.911449894067384, 0.953797963004507, 0.971241615465429,
+     0.979303123807588, 0.983380119507575, 0.985461246567755, 0.986435046976605, 0.986738250670141, 0.986617882445032, 0.986277776758643, 0.985860592444056,
+     0.98547492767621, 0.985176934765558, 0.984971574014181, 0.984846303415712, 0.984775351811199, 0.984738066625265, 0.984719648311765, 0.984711023391939,
+     0.984706683300676, 0.984704554393091, 0.98470359630937, 0.984703124077552, 0.98470292561509, 0.984702868122795],
+    [0.0315605737777207, 0.0315520718330149, 0.0315148215513658, 0.0313318044982702, 0.0306729857725527, 0.0286480476989607, 0.0246450407045709, 0.0192960753663651,
+     0.0142066612220556, 0.0102942608878609, 0.0076191460521811, 0.005898041083542, 0.0048233247781713, 0.0042298748350633, 0.0040599171299341, 0.0043533695594676,
+     0.0053434425970201, 0.0076917201010463, 0.0135969795736536, 0.0316975442661115, 0.107861196355249, 0.463812603168704, 0.847055405272011, 0.943185409393918,
+     0.968862150696558, 0.978030667473603, 0.982043643854306, 0.983923623718707, 0.984845484154382, 0.985294275814596, 0.985507295219825, 0.985605071539837,
+     0.985653849933578, 0.985677685033883, 0.985688391806122, 0.985693664690031, 0.985695879848205, 0.985696521463762],
+    [0.0095560747554212, 0.0095581580120851, 0.0095673245444588, 0.0096129126297349, 0.0097837090401843, 0.010378622705871, 0.0120026452378567, 0.0160977721473922,
+     0.026706190223168, 0.0595555440185881, 0.186039826532826, 0.570579820116159, 0.861467768400292, 0.945879089767658, 0.970465486474305, 0.97841363028445,
+     0.979589031411224, 0.975533536908632, 0.962288755397813, 0.92312157451312, 0.793434018943111, 0.459270135902429, 0.185574103666303, 0.0881774959955372,
+     0.05436302287667, 0.0406288447060719, 0.034221520431697, 0.0311185790956966, 0.0295708898336134, 0.0288108739348928, 0.0284486271324597, 0.0282820301724731,
+     0.0281988376490237, 0.0281581655342037, 0.0281398910216386, 0.0281308901665811, 0.0281271086805816, 0.0281260133612096],
+    [0.979404752502014, 0.97940070684313, 0.979382903470261, 0.979294364945594, 0.97896301460857, 0.977814466694043, 0.974724321133836, 0.967198482343973,
+     0.949079657530575, 0.900850128940977, 0.76315044546224, 0.465922171649319, 0.201263280451005, 0.0877524413419623, 0.0457176793291679, 0.0284706050521843,
+     0.020527176756985, 0.0165302792310211, 0.0145135107212858, 0.0136003508637687, 0.0133604258769571, 0.013548894314568, 0.0139594356366992, 0.014443425575357,
+     0.0148854440621406, 0.0152254296999746, 0.0154592848180209, 0.0156018026485961, 0.0156824871281936, 0.0157248764360615, 0.0157458108784121, 0.0157556123350225,
+     0.0157605443964911, 0.0157629637515278, 0.0157640525629106, 0.015764589232951, 0.0157648147772649, 0.0157648801149616],
+])
+
 # Engine white point = CMF · ones (the reflectance of a perfect diffuser on this grid).
 WHITE_XYZ = CMF @ np.ones(SIZE)
 EPS = np.finfo(float).eps
@@ -108,22 +160,152 @@ _OBS = np.vstack([
     np.asarray(_spectral_constants.STDOBSERV_Z2, dtype=float),
 ])[:, _CM_I0:_CM_I1]
 
-# Reference light first (D65 = what /spectral renders under), then test lights
-# that surface metamerism: A = warm incandescent, F11 = narrow-band fluorescent
-# (the classic metameric-failure stressor).
-ILLUMINANTS = ['D65', 'A', 'F11']
-_ILLUM_SPD = {
-    'D65': _spectral_constants.REFERENCE_ILLUM_D65,
-    'A': _spectral_constants.REFERENCE_ILLUM_A,
-    'F11': _spectral_constants.REFERENCE_ILLUM_F11,
+# ── Illuminant registry ──
+# Every light the engine can score under, as an SPD on the 38-bin grid: the CIE tables
+# colormath ships, the CIE daylight series generated from its S0/S1/S2 basis (D55, D75 —
+# daylight_spd gives any other CCT), and whatever is registered at runtime
+# (register_illuminant: a measured LED, a gallery's lamp, …). Only the SPD's shape
+# matters — Lab is taken relative to the light's own white, so any scale works.
+#
+# CIE 15 daylight basis S0, S1, S2 on 380–750 nm @10 nm. daylight_spd(6504) and (5003)
+# reproduce colormath's D65 and D50 tables to within 0.07 (the CIE's own rounding).
+_DAYLIGHT_BASIS = np.array([
+    [63.4, 65.8, 94.8, 104.8, 105.9, 96.8, 113.9, 125.6, 125.5, 121.3, 121.3, 113.5, 113.1,
+     110.8, 106.5, 108.8, 105.3, 104.4, 100.0, 96.0, 95.1, 89.1, 90.5, 90.3, 88.4, 84.0,
+     85.1, 81.9, 82.6, 84.9, 81.3, 71.9, 74.3, 76.4, 63.3, 71.7, 77.0, 65.2],
+    [38.5, 35.0, 43.4, 46.3, 43.9, 37.1, 36.7, 35.9, 32.6, 27.9, 24.3, 20.1, 16.2,
+     13.2, 8.6, 6.1, 4.2, 1.9, 0.0, -1.6, -3.5, -3.5, -5.8, -7.2, -8.6, -9.5,
+     -10.9, -10.7, -12.0, -14.0, -13.6, -12.0, -13.3, -12.9, -10.6, -11.6, -12.2, -10.2],
+    [3.0, 1.2, -1.1, -0.5, -0.7, -1.2, -2.6, -2.9, -2.8, -2.6, -2.6, -1.8, -1.5,
+     -1.3, -1.2, -1.0, -0.5, -0.3, 0.0, 0.2, 0.5, 2.1, 3.2, 4.1, 4.7, 5.1,
+     6.7, 7.3, 8.6, 9.8, 10.2, 8.3, 9.6, 8.5, 7.0, 7.6, 8.0, 6.7],
+])
+
+
+def daylight_spd(cct):
+    """CIE daylight (D-series) SPD at correlated colour temperature `cct` (4000–25000 K) on
+    the engine grid — the CIE 15 recipe: chromaticity from the CCT, then S0 + M1·S1 + M2·S2
+    with M1, M2 rounded to three decimals as the CIE tables were. Nominal CCTs follow the
+    c2 revision (D65 is 6500·1.4388/1.4380 ≈ 6504 K), so daylight_spd(7500) is D75."""
+    T = float(cct) * 1.4388 / 1.4380
+    if not 4000 <= T <= 25000:
+        raise ValueError(f'daylight CCT must be within 4000–25000 K, got {cct}')
+    if T <= 7000:
+        x = -4.6070e9 / T ** 3 + 2.9678e6 / T ** 2 + 0.09911e3 / T + 0.244063
+    else:
+        x = -2.0064e9 / T ** 3 + 1.9018e6 / T ** 2 + 0.24748e3 / T + 0.237040
+    y = -3.0 * x * x + 2.870 * x - 0.275
+    M = 0.0241 + 0.2562 * x - 0.7341 * y
+    M1 = round((-1.3515 - 1.7703 * x + 5.9114 * y) / M, 3)
+    M2 = round((0.0300 - 31.4424 * x + 30.0717 * y) / M, 3)
+    return _DAYLIGHT_BASIS[0] + M1 * _DAYLIGHT_BASIS[1] + M2 * _DAYLIGHT_BASIS[2]
+
+
+ILLUMINANT_SPDS = {
+    name: np.asarray(getattr(_spectral_constants, f'REFERENCE_ILLUM_{name}'), dtype=float)[_CM_I0:_CM_I1]
+    for name in ('D65', 'D50', 'A', 'C', 'E', 'F2', 'F7', 'F11')
 }
-# Per-illuminant weighting matrix W (3×38) and its white point, so XYZ = W·R.
-_ILLUM = {}
-for _name in ILLUMINANTS:
-    _W = _OBS * np.asarray(_ILLUM_SPD[_name], dtype=float)[_CM_I0:_CM_I1]
-    _ILLUM[_name] = (_W, _W @ np.ones(SIZE))
-# White points stacked in ILLUMINANTS order, shape (n_illum, 3), for the batched Lab transform.
-_ILLUM_WHITE = np.stack([_ILLUM[n][1] for n in ILLUMINANTS])
+ILLUMINANT_SPDS['D55'] = daylight_spd(5500)
+ILLUMINANT_SPDS['D75'] = daylight_spd(7500)
+
+
+def register_illuminant(name, spd, wavelengths=None):
+    """Add (or replace) a scoring light. `spd` is either 38 values on the engine grid or a
+    curve sampled at `wavelengths` (nm), linearly resampled with constant extrapolation —
+    as resample_to_grid, but unclamped. Raises ValueError for a curve that isn't finite,
+    non-negative and somewhere positive. Replacing an active light restacks the scoring
+    matrices (set_illuminants). Per process, like set_illuminants."""
+    if wavelengths is None:
+        v = np.asarray(spd, dtype=float)
+        if v.shape != (SIZE,):
+            raise ValueError(f'illuminant {name!r}: expected {SIZE} values on the engine grid '
+                             f'(or pass wavelengths=), got shape {v.shape}')
+    else:
+        x, y = np.asarray(wavelengths, dtype=float), np.asarray(spd, dtype=float)
+        if x.shape != y.shape or x.ndim != 1 or len(x) < 2:
+            raise ValueError(f'illuminant {name!r}: wavelengths and spd must be matching 1-D curves')
+        order = np.argsort(x)
+        v = np.interp(WAVELENGTHS, x[order], y[order])
+    if not np.all(np.isfinite(v)) or (v < 0).any() or not (v > 0).any():
+        raise ValueError(f'illuminant {name!r}: SPD must be finite, non-negative and not all zero')
+    ILLUMINANT_SPDS[name] = v
+    if name in ILLUMINANTS:
+        set_illuminants(ILLUMINANTS)
+
+
+class IlluminantStack:
+    """The weighting matrices of a list of lights (names in ILLUMINANT_SPDS), stacked so that
+    scoring a batch of reflectances under all of them is one matmul:
+
+        W      (n, 3, 38)  per-light OBS·SPD, so XYZ_i = W[i]·R
+        WT     (38, 3n)    the same, flattened and transposed — R (…, 38) @ WT = every XYZ
+        white  (n, 3)      each light's white point (W[i]·1)
+
+    A 3-light and a 12-light stack cost about the same per batch: the matmul is 38 × 3n
+    against BLAS, the Lab and ΔE2000 steps after it are elementwise."""
+
+    __slots__ = ('names', 'W', 'WT', 'white', 'fingerprint')
+
+    def __init__(self, names):
+        self.names = tuple(names)
+        unknown = [n for n in self.names if n not in ILLUMINANT_SPDS]
+        if unknown:
+            raise ValueError(f'unknown illuminant(s) {unknown}; known: {sorted(ILLUMINANT_SPDS)}')
+        self.W = np.stack([_OBS * ILLUMINANT_SPDS[n] for n in self.names])
+        self.WT = np.ascontiguousarray(self.W.reshape(-1, SIZE).T)
+        self.white = self.W.sum(axis=2)
+        h = hashlib.sha1('|'.join(self.names).encode('utf-8'))
+        h.update(self.WT.tobytes())
+        self.fingerprint = h.hexdigest()[:16]
+
+    def __len__(self):
+        return len(self.names)
+
+    def xyz(self, R):
+        """XYZ of reflectance R (…, 38) under every light → (…, n, 3)."""
+        R = np.asarray(R, dtype=float)
+        return (R @ self.WT).reshape(R.shape[:-1] + (len(self.names), 3))
+
+
+def _illuminant_names(spec):
+    names = [n.strip() for n in spec.split(',') if n.strip()]
+    if not names or names[0] != 'D65':
+        raise ValueError(f"the scoring lights must start with the D65 reference, got {names}")
+    return names
+
+
+# The lights every score uses: the D65 reference first (what /spectral renders under and
+# the headline ΔE), then test lights that surface metamerism — by default A = warm
+# incandescent and F11 = narrow-band fluorescent (the classic metameric-failure
+# stressor). Set SPECTRAL_ILLUMINANTS (e.g. "D65,A,F11,F2,F7,D50,D75") to score under more,
+# or call set_illuminants.
+ILLUMINANTS = _illuminant_names(os.environ.get('SPECTRAL_ILLUMINANTS', 'D65,A,F11'))
+_SCORING = IlluminantStack(ILLUMINANTS)
+
+
+def set_illuminants(names):
+    """Switch the scoring lights (names in ILLUMINANT_SPDS, 'D65' first). Affects every
+    later score in this process and restarts the subset-solve pool so its workers follow;
+    cached solves are keyed by the stack, so results under other lights never mix."""
+    global ILLUMINANTS, _SCORING
+    names = _illuminant_names(','.join(names))
+    _SCORING = IlluminantStack(names)
+    ILLUMINANTS = names
+    set_subset_workers(SUBSET_WORKERS)
+
+
+def illuminant_config():
+    """(SPDs, names) of the active scoring lights — pass to configure_illuminants in a
+    worker process (spawned workers re-import this module with the default lights)."""
+    return {n: ILLUMINANT_SPDS[n] for n in ILLUMINANTS}, list(ILLUMINANTS)
+
+
+def configure_illuminants(spds, names):
+    """Pool-worker initializer counterpart of illuminant_config."""
+    global ILLUMINANTS, _SCORING
+    ILLUMINANT_SPDS.update(spds)
+    _SCORING = IlluminantStack(names)
+    ILLUMINANTS = list(names)
 
 
 def render_cmfs():
@@ -142,13 +324,13 @@ def render_cmfs():
     the engine CMF unchanged, so existing swatches render byte-for-byte identically.
     Returns {illuminant: 3×38 list}, keys in ILLUMINANTS order.
     """
+    st = _SCORING
     out = {'D65': CMF.tolist()}
-    for name in ILLUMINANTS:
+    for i, name in enumerate(st.names):
         if name == 'D65':
             continue
-        W, white = _ILLUM[name]
-        adapt = (WHITE_XYZ / white)[:, None]   # (3,1) von-Kries diagonal in XYZ
-        out[name] = (adapt * W).tolist()
+        adapt = (WHITE_XYZ / st.white[i])[:, None]   # (3,1) von-Kries diagonal in XYZ
+        out[name] = (adapt * st.W[i]).tolist()
     return out
 
 
@@ -174,40 +356,107 @@ def _compand(x):
     return np.where(x > 0.0031308, 1.055 * np.power(np.clip(x, 0, None), 1.0 / GAMMA) - 0.055, x * 12.92)
 
 
+def _uncompand(x):
+    """sRGB gamma → linear (spectral.js uncompand, :447)."""
+    return np.where(x > 0.04045, ((x + 0.055) / 1.055) ** GAMMA, x / 12.92)
+
+
+# Linear value of every 8-bit code, so integer input skips the per-element power law.
+_UNCOMPAND_8BIT = _uncompand(np.arange(256) / 255.0)
+
+
+def srgb_to_reflectance(rgb):
+    """8-bit sRGB → 38-bin reflectance, exactly as spectral.js Color(rgb).R (lRGB_to_R,
+    :578): split linear RGB into white + CMY + RGB primaries and sum their base spectra.
+    `rgb` is (3,) or (N, 3); returns (38,) or (N, 38). This is the target curve the
+    /spectral client sends, so scripts and batch jobs can reconstruct it server-side.
+
+    Integer input within 0–255 is linearised through a 256-entry table (bit-identical to
+    the power law); floats take the formula. A whole catalog converts in one pass —
+    ~0.3 µs per colour, no interpolation error (a 33³ trilinear LUT was both slower
+    and off by up to ΔE 0.27)."""
+    rgb = np.asarray(rgb)
+    if rgb.dtype.kind in 'iu' and rgb.size and 0 <= rgb.min() and rgb.max() <= 255:
+        lrgb = _UNCOMPAND_8BIT[np.atleast_2d(rgb)]
+    else:
+        lrgb = _uncompand(np.atleast_2d(rgb.astype(float)) / 255.0)
+    w = lrgb.min(axis=1)
+    r, g, b = (lrgb - w[:, None]).T
+    weights = np.stack([
+        w,
+        np.minimum(g, b), np.minimum(r, b), np.minimum(r, g),          # c, m, y
+        np.maximum(0, np.minimum(r - b, r - g)),                       # r
+        np.maximum(0, np.minimum(g - b, g - r)),                       # g
+        np.maximum(0, np.minimum(b - g, b - r)),                       # b
+    ], axis=1)                                                         # (N, 7)
+    R = weights @ BASE_SPECTRA
+    np.maximum(R, EPS, out=R)
+    return R[0] if rgb.ndim == 1 else R
+
+
 def resample_to_grid(wavelengths, reflectances):
     """Linear-interpolate a measured curve onto the 38-bin engine grid, clamp to (0,1].
 
     Mirrors resampleToGrid in static/mixing-core.js:35 (constant extrapolation at the
-    ends, floor at 1e-4 so K/S stays finite).
+    ends, floor at 1e-4 so K/S stays finite). `wavelengths` (W,) ascending; `reflectances`
+    (W,) → (38,), or (N, W) curves sampled on the same wavelengths → (N, 38): the
+    interpolation weights are computed once and applied to every curve as one gather.
     """
     x = np.asarray(wavelengths, dtype=float)
     y = np.asarray(reflectances, dtype=float)
-    v = np.interp(WAVELENGTHS, x, y)  # np.interp clamps to endpoints outside [x0, xN]
+    if y.ndim == 1:
+        v = np.interp(WAVELENGTHS, x, y)  # np.interp clamps to endpoints outside [x0, xN]
+    elif len(x) < 2:
+        v = np.repeat(y[:, :1], SIZE, axis=1)
+    else:
+        j = np.clip(np.searchsorted(x, WAVELENGTHS, side='right'), 1, len(x) - 1)
+        x0, x1 = x[j - 1], x[j]
+        span = x1 - x0
+        t = np.clip(np.divide(WAVELENGTHS - x0, span, out=np.zeros(SIZE), where=span > 0), 0.0, 1.0)
+        v = y[:, j - 1] * (1.0 - t) + y[:, j] * t
     return np.clip(v, 1e-4, 1.0)
 
 
 def xyz_to_lab(XYZ):
     """XYZ → CIELAB under the engine's D65 white (WHITE_XYZ). No sRGB round-trip, so
-    out-of-gamut targets aren't clipped before scoring."""
-    xr, yr, zr = np.asarray(XYZ) / WHITE_XYZ
-
-    def f(t):
-        return np.cbrt(t) if t > 0.008856451679035631 else (7.787037037037037 * t + 16.0 / 116.0)
-
-    fx, fy, fz = f(xr), f(yr), f(zr)
-    return np.array([116.0 * fy - 16.0, 500.0 * (fx - fy), 200.0 * (fy - fz)])
+    out-of-gamut targets aren't clipped before scoring. XYZ (3,) or (…, 3)."""
+    ratios = np.asarray(XYZ, dtype=float) / WHITE_XYZ
+    f = np.where(ratios > 0.008856451679035631, np.cbrt(ratios), 7.787037037037037 * ratios + 16.0 / 116.0)
+    fx, fy, fz = f[..., 0], f[..., 1], f[..., 2]
+    return np.stack([116.0 * fy - 16.0, 500.0 * (fx - fy), 200.0 * (fy - fz)], axis=-1)
 
 
 class SpectralColor:
     """A colour as a 38-bin reflectance R, with derived XYZ / sRGB / Lab / KS, mirroring
-    spectral.js's Color built from R."""
+    spectral.js's Color built from R.
+
+    Only R is computed up front: XYZ, KS, luminance and Lab are derived on first access
+    and cached, since most instances (solve targets, mixes reported back) are only ever
+    read for R or one of them. __slots__ holds just the input curve and tinting plus the
+    three lazily filled caches (XYZ, K/S, Lab) — no per-instance __dict__."""
+
+    __slots__ = ('R', 'tinting', '_XYZ', '_KS', '_lab')
 
     def __init__(self, R, tinting=1.0):
         self.R = np.clip(np.asarray(R, dtype=float), 1e-4, 1.0)
         self.tinting = tinting
-        self.XYZ = CMF @ self.R
-        self.KS = ks(self.R)
-        self.luminance = max(EPS, float(self.XYZ[1]))
+        self._XYZ = self._KS = self._lab = None
+
+    @property
+    def XYZ(self):
+        if self._XYZ is None:
+            self._XYZ = CMF @ self.R
+        return self._XYZ
+
+    @property
+    def KS(self):
+        if self._KS is None:
+            self._KS = ks(self.R)
+        return self._KS
+
+    @property
+    def luminance(self):
+        return max(EPS, float(self.XYZ[1]))
 
     @property
     def sRGB(self):
@@ -216,7 +465,64 @@ class SpectralColor:
 
     @property
     def lab(self):
-        return xyz_to_lab(self.XYZ)
+        if self._lab is None:
+            self._lab = xyz_to_lab(self.XYZ)
+        return self._lab
+
+
+class SpectralBatch:
+    """Many colours as one (N, 38) reflectance array — the array-backed counterpart of
+    SpectralColor, with the same derived fields computed for the whole batch at once
+    (lazily, cached): XYZ (N, 3), KS (N, 38), luminance (N,), lab (N, 3), sRGB (N, 3) int.
+    Indexing gives the i-th colour as a SpectralColor."""
+
+    __slots__ = ('R', 'tinting', '_XYZ', '_KS', '_lab')
+
+    def __init__(self, R, tinting=1.0):
+        self.R = np.clip(np.asarray(R, dtype=float).reshape(-1, SIZE), 1e-4, 1.0)
+        self.tinting = np.broadcast_to(np.asarray(tinting, dtype=float), (len(self.R),))
+        self._XYZ = self._KS = self._lab = None
+
+    @classmethod
+    def from_srgb(cls, rgb):
+        """(N, 3) 8-bit sRGB → batch, reconstructed as srgb_to_reflectance."""
+        return cls(srgb_to_reflectance(np.atleast_2d(rgb)))
+
+    def __len__(self):
+        return len(self.R)
+
+    def __getitem__(self, i):
+        return SpectralColor(self.R[i], tinting=float(self.tinting[i]))
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    @property
+    def XYZ(self):
+        if self._XYZ is None:
+            self._XYZ = self.R @ CMF.T
+        return self._XYZ
+
+    @property
+    def KS(self):
+        if self._KS is None:
+            self._KS = ks(self.R)
+        return self._KS
+
+    @property
+    def luminance(self):
+        return np.maximum(EPS, self.XYZ[:, 1])
+
+    @property
+    def sRGB(self):
+        lrgb = self.XYZ @ XYZ_RGB.T
+        return np.rint(np.clip(_compand(lrgb) * 255.0, 0, 255)).astype(int)
+
+    @property
+    def lab(self):
+        if self._lab is None:
+            self._lab = xyz_to_lab(self.XYZ)
+        return self._lab
 
 
 def km_mix(entries):
@@ -250,11 +556,88 @@ def bases_from_spectrum_plots(spectrum_plots):
 
 
 def mix_amounts(bases, amounts):
-    """amounts: {key: number} → mixed SpectralColor (white if everything is zero)."""
-    entries = [(bases[k], amounts[k]) for k in bases if amounts.get(k, 0) > 0]
-    if not entries:
-        return SpectralColor(np.ones(SIZE))
-    return km_mix(entries)
+    """amounts: {key: number} → mixed SpectralColor (white if everything is zero).
+    `bases` may be a {key: SpectralColor} dict or a CompiledPalette."""
+    palette = compile_palette(bases)
+    vec = np.array([[max(0.0, float(amounts.get(k, 0))) for k in palette.keys]])
+    return SpectralColor(mix_batch(palette, vec)[0])
+
+
+# ── Compiled palettes (batched mixing) ──────────────────────────────────────
+# Mixing one recipe through a dict of SpectralColors costs a Python loop + a fresh object
+# per call, which dominated solve latency (the solver mixes thousands of recipes). A
+# compiled palette stacks the per-pigment constants once, so N recipes mix in one matmul:
+#   conc = amounts²·tinting²·luminance   (N,k)   — same weight as km_mix / spectral.js :373
+#   R    = KM(conc·KS / Σconc)           (N,38)
+class CompiledPalette:
+    """A palette stacked into arrays for mix_batch: `keys` (k,), `KS` (k,38), `tinting2`
+    and `luminance` (k,) and their product `weight` — the per-pigment concentration
+    factor. Build one with compile_palette; `subset(keys)` slices out a sub-palette."""
+
+    def __init__(self, keys, R, KS, tinting2, luminance):
+        self.keys = list(keys)
+        self.index = {k: i for i, k in enumerate(self.keys)}
+        self.R = R
+        self.KS = KS
+        self.tinting2 = tinting2
+        self.luminance = luminance
+        self.weight = tinting2 * luminance
+
+    def __len__(self):
+        return len(self.keys)
+
+    def subset(self, keys):
+        idx = [self.index[k] for k in keys]
+        return CompiledPalette(keys, self.R[idx], self.KS[idx], self.tinting2[idx],
+                               self.luminance[idx])
+
+    @property
+    def fingerprint(self):
+        """Digest of everything a solve depends on (keys, curves, tinting) — the palette
+        part of a SolveCache key, so an edited palette can never hit a stale entry."""
+        fp = getattr(self, '_fingerprint', None)
+        if fp is None:
+            h = hashlib.sha1(json.dumps(self.keys).encode('utf-8'))
+            h.update(np.ascontiguousarray(self.R, dtype=float).tobytes())
+            h.update(np.ascontiguousarray(self.tinting2, dtype=float).tobytes())
+            fp = self._fingerprint = h.hexdigest()
+        return fp
+
+
+def compile_palette(bases):
+    """{key: SpectralColor} → CompiledPalette (a CompiledPalette is returned unchanged, so
+    every solver entry point accepts either form)."""
+    if isinstance(bases, CompiledPalette):
+        return bases
+    keys = list(bases.keys())
+    if not keys:
+        empty = np.zeros((0, SIZE))
+        return CompiledPalette([], empty, empty, np.zeros(0), np.zeros(0))
+    cols = [bases[k] for k in keys]
+    return CompiledPalette(
+        keys,
+        np.stack([c.R for c in cols]),
+        np.stack([c.KS for c in cols]),
+        np.array([float(c.tinting) ** 2 for c in cols]),
+        np.array([c.luminance for c in cols]),
+    )
+
+
+def mix_batch(palette, amounts):
+    """Mix N recipes at once: amounts (N, k) aligned to palette.keys → reflectance (N, 38).
+
+    Row-for-row the same mix as km_mix (negative amounts count as zero, an all-zero row
+    mixes to the perfect white R≡1), but a few array ops instead of N Python mixes."""
+    A = np.clip(np.asarray(amounts, dtype=float), 0.0, None)
+    conc = A ** 2 * palette.weight                          # (N, k)
+    total = conc.sum(axis=1)
+    ks_mix = (conc @ palette.KS) / np.where(total > 0, total, 1.0)[:, None]
+    return np.clip(km(ks_mix), 1e-4, 1.0)                   # KM(0) = 1 for empty rows
+
+
+def lab_batch(R):
+    """(N,38) reflectance → (N,3) CIELAB under the engine D65 white."""
+    return xyz_to_lab(np.asarray(R) @ CMF.T)
 
 
 # ── Solver ──────────────────────────────────────────────────────────────────
@@ -262,60 +645,107 @@ def _delta_e(lab1, lab2):
     return delta_e_cie2000(LabColor(*lab1), LabColor(*lab2))
 
 
-def ciede2000(lab1, lab2):
+class RefLab:
+    """A reference Lab — or a stack of them, (…, 3) — prepared for repeated ciede2000
+    scoring: a solve's fixed target stack, the catalog masstones of a coverage matrix.
+    Holds the reference-only terms (L, a, b, a², b², C = √(a²+b²)) so every call computes
+    just the sample side and the pair terms. Behaves as the plain Lab array wherever one
+    is expected (np.asarray(ref), ref.shape). Build with prepare_reference."""
+
+    __slots__ = ('lab', 'L', 'a', 'b', 'a_sq', 'b_sq', 'C')
+
+    def __init__(self, lab):
+        self.lab = lab
+        self.L, self.a, self.b = lab[..., 0], lab[..., 1], lab[..., 2]
+        self.a_sq, self.b_sq = self.a * self.a, self.b * self.b
+        self.C = np.sqrt(self.a_sq + self.b_sq)
+
+    @property
+    def shape(self):
+        return self.lab.shape
+
+    @property
+    def dtype(self):
+        return self.lab.dtype
+
+    def __array__(self, dtype=None, copy=None):
+        return self.lab if dtype is None else self.lab.astype(dtype)
+
+    def __len__(self):
+        return len(self.lab)
+
+
+def prepare_reference(lab, dtype=np.float64):
+    """RefLab for `lab` ((…, 3) array, or a RefLab — returned as-is if already `dtype`).
+    dtype=np.float32 opts into the single-precision path (ΔE to ~1e-4; halves the memory
+    of big (targets × samples) matrices)."""
+    if isinstance(lab, RefLab):
+        if lab.dtype == dtype:
+            return lab
+        lab = lab.lab
+    return RefLab(np.asarray(lab, dtype=dtype))
+
+
+_25_7 = 25.0 ** 7
+_DEG = np.pi / 180.0
+
+
+def ciede2000(lab1, lab2, dtype=None):
     """Vectorised CIEDE2000 (Sharma et al. 2005), kL=kC=kH=1. lab1/lab2 are (…, 3)
     arrays and the colour difference is taken along the last axis, so a whole batch
     of Lab pairs scores in one call. Matches colormath.delta_e_cie2000 to ~1e-5 —
     this is the solver's hot path (called thousands of times), and colormath's
-    per-call object construction made the multi-illuminant solve ~3× too slow."""
-    lab1 = np.asarray(lab1, dtype=float)
-    lab2 = np.asarray(lab2, dtype=float)
-    L1, a1, b1 = lab1[..., 0], lab1[..., 1], lab1[..., 2]
+    per-call object construction made the multi-illuminant solve ~3× too slow.
+
+    lab1 may be a RefLab (prepare_reference) to skip its per-reference terms. Computed in
+    the reference's dtype unless `dtype` says otherwise (float64 by default; float32 for
+    the large coverage matrices). Angles stay in radians throughout."""
+    ref = prepare_reference(lab1, dtype or (lab1.dtype if isinstance(lab1, RefLab) else np.float64))
+    lab2 = np.asarray(lab2, dtype=ref.dtype)
     L2, a2, b2 = lab2[..., 0], lab2[..., 1], lab2[..., 2]
-    C1, C2 = np.hypot(a1, b1), np.hypot(a2, b2)
-    Cbar = (C1 + C2) / 2.0
-    G = 0.5 * (1 - np.sqrt(Cbar ** 7 / (Cbar ** 7 + 25.0 ** 7)))
-    a1p, a2p = (1 + G) * a1, (1 + G) * a2
-    C1p, C2p = np.hypot(a1p, b1), np.hypot(a2p, b2)
-    h1p = np.degrees(np.arctan2(b1, a1p)) % 360.0
-    h2p = np.degrees(np.arctan2(b2, a2p)) % 360.0
-    dLp = L2 - L1
-    dCp = C2p - C1p
+    Cbar = 0.5 * (ref.C + np.sqrt(a2 * a2 + b2 * b2))
+    c7 = Cbar ** 7
+    G1 = 1.5 - 0.5 * np.sqrt(c7 / (c7 + _25_7))           # 1 + G
+    a2p = G1 * a2
+    C1p = np.sqrt(G1 * G1 * ref.a_sq + ref.b_sq)
+    C2p = np.sqrt(a2p * a2p + b2 * b2)
+    h1p = np.arctan2(ref.b, G1 * ref.a) % (2 * np.pi)
+    h2p = np.arctan2(b2, a2p) % (2 * np.pi)
+    prod = C1p * C2p
+    zero = prod == 0
     dhp = h2p - h1p
-    dhp = np.where(dhp > 180, dhp - 360, dhp)
-    dhp = np.where(dhp < -180, dhp + 360, dhp)
-    dhp = np.where(C1p * C2p == 0, 0.0, dhp)
-    dHp = 2 * np.sqrt(C1p * C2p) * np.sin(np.radians(dhp) / 2.0)
-    Lbarp = (L1 + L2) / 2.0
-    Cbarp = (C1p + C2p) / 2.0
-    hsum, habs = h1p + h2p, np.abs(h1p - h2p)
-    hbarp = np.where(C1p * C2p == 0, hsum,
-                     np.where(habs <= 180, hsum / 2.0,
-                              np.where(hsum < 360, (hsum + 360) / 2.0, (hsum - 360) / 2.0)))
-    T = (1 - 0.17 * np.cos(np.radians(hbarp - 30)) + 0.24 * np.cos(np.radians(2 * hbarp))
-         + 0.32 * np.cos(np.radians(3 * hbarp + 6)) - 0.20 * np.cos(np.radians(4 * hbarp - 63)))
-    dtheta = 30 * np.exp(-(((hbarp - 275) / 25.0) ** 2))
-    RC = 2 * np.sqrt(Cbarp ** 7 / (Cbarp ** 7 + 25.0 ** 7))
-    SL = 1 + (0.015 * (Lbarp - 50) ** 2) / np.sqrt(20 + (Lbarp - 50) ** 2)
-    SC = 1 + 0.045 * Cbarp
-    SH = 1 + 0.015 * Cbarp * T
-    RT = -np.sin(np.radians(2 * dtheta)) * RC
-    return np.sqrt((dLp / SL) ** 2 + (dCp / SC) ** 2 + (dHp / SH) ** 2
-                   + RT * (dCp / SC) * (dHp / SH))
+    dhp = np.where(dhp > np.pi, dhp - 2 * np.pi, np.where(dhp < -np.pi, dhp + 2 * np.pi, dhp))
+    dHp = np.where(zero, 0.0, 2 * np.sqrt(prod) * np.sin(0.5 * dhp))
+    hsum = h1p + h2p
+    hbarp = np.where(zero | (np.abs(h1p - h2p) <= np.pi), hsum,
+                     np.where(hsum < 2 * np.pi, hsum + 2 * np.pi, hsum - 2 * np.pi))
+    hbarp = np.where(zero, hbarp, 0.5 * hbarp)
+    T = (1 - 0.17 * np.cos(hbarp - 30 * _DEG) + 0.24 * np.cos(2 * hbarp)
+         + 0.32 * np.cos(3 * hbarp + 6 * _DEG) - 0.20 * np.cos(4 * hbarp - 63 * _DEG))
+    Cbarp = 0.5 * (C1p + C2p)
+    cp7 = Cbarp ** 7
+    RT = -2 * np.sqrt(cp7 / (cp7 + _25_7)) * np.sin(60 * _DEG * np.exp(-((hbarp - 275 * _DEG) / (25 * _DEG)) ** 2))
+    Lm = (0.5 * (ref.L + L2) - 50) ** 2
+    dL = (L2 - ref.L) / (1 + 0.015 * Lm / np.sqrt(20 + Lm))
+    dC = (C2p - C1p) / (1 + 0.045 * Cbarp)
+    dH = dHp / (1 + 0.015 * Cbarp * T)
+    return np.sqrt(dL * dL + dC * dC + dH * dH + RT * dC * dH)
 
 
 def _labs_under_all(R):
-    """Stack the CIELAB of reflectance R under every illuminant, shape (n_illum, 3).
-
-    XYZ = W·R per illuminant (its own white point), then the standard f() lab transform —
-    all illuminants at once so it's a couple of small matmuls, no Python loop in the hot path."""
-    XYZ = np.stack([W @ R for W, _ in (_ILLUM[n] for n in ILLUMINANTS)])      # (n, 3)
-    ratios = XYZ / _ILLUM_WHITE                                              # (n, 3)
+    """Stack the CIELAB of reflectance R under every illuminant, shape (n_illum, 3) — or
+    (N, n_illum, 3) for a batch of curves R (N, 38).
+
+    XYZ under every light is one matmul against the stacked weighting matrix
+    (IlluminantStack), each over its own white point, then the standard f() lab transform —
+    no Python loop in the hot path, whatever the number of lights."""
+    st = _SCORING
+    ratios = st.xyz(R) / st.white                                    # (…, n, 3)
     fr = np.where(ratios > 0.008856451679035631,
                   np.cbrt(ratios),
                   7.787037037037037 * ratios + 16.0 / 116.0)
-    fx, fy, fz = fr[:, 0], fr[:, 1], fr[:, 2]
-    return np.stack([116.0 * fy - 16.0, 500.0 * (fx - fy), 200.0 * (fy - fz)], axis=1)
+    fx, fy, fz = fr[..., 0], fr[..., 1], fr[..., 2]
+    return np.stack([116.0 * fy - 16.0, 500.0 * (fx - fy), 200.0 * (fy - fz)], axis=-1)
 
 
 def delta_e_by_illuminant(target, sample_R):
@@ -325,11 +755,21 @@ def delta_e_by_illuminant(target, sample_R):
     _labs_under_all) — the stacked form lets the solver compute the fixed target Labs
     once and reuse them across thousands of objective evaluations. The 'D65' entry
     equals the engine headline ΔE (same observer/white point)."""
-    target_labs = target if isinstance(target, np.ndarray) else _labs_under_all(target)
+    target_labs = target if isinstance(target, (np.ndarray, RefLab)) else _labs_under_all(target)
     des = ciede2000(target_labs, _labs_under_all(sample_R))   # (n_illum,)
     return {name: float(des[i]) for i, name in enumerate(ILLUMINANTS)}
 
 
+def delta_e_matrix(targets_R, samples_R, dtype=np.float64):
+    """ΔE2000 of every sample curve against every target curve under every illuminant —
+    the batch form of delta_e_by_illuminant. targets_R (T, 38), samples_R (M, 38) →
+    (T, M, n_illum) in ILLUMINANTS order: one Lab pass per side, one ciede2000 call for
+    the whole matrix. dtype=np.float32 for big matrices (as prepare_reference)."""
+    target_labs = _labs_under_all(np.atleast_2d(np.asarray(targets_R, dtype=float)))
+    sample_labs = _labs_under_all(np.atleast_2d(np.asarray(samples_R, dtype=float)))
+    return ciede2000(prepare_reference(target_labs[:, None], dtype), sample_labs[None])
+
+
 def _metamerism_index(des):
     """How much the match degrades under the worst test light vs. the D65 reference:
     max(test ΔE) − D65 ΔE, floored at 0. ~0 means the recipe holds across lights;
@@ -348,6 +788,167 @@ def _metameric_cost(des):
     return ref + METAMERISM_WEIGHT * (sum(tests) / len(tests) if tests else 0.0)
 
 
+def _metameric_costs(des):
+    """_metameric_cost over a batch: des (N, n_illum) in ILLUMINANTS order → (N,)."""
+    if des.shape[-1] < 2:
+        return des[..., 0]
+    return des[..., 0] + METAMERISM_WEIGHT * des[..., 1:].mean(axis=-1)
+
+
+def _cost_batch(palette, target_labs, A):
+    """Metameric cost of N recipes (A: (N, k) aligned to palette.keys) against the fixed
+    target Lab stack — one mix_batch + one Lab + one ΔE pass. Empty recipes cost 1e6."""
+    des = ciede2000(target_labs, _labs_under_all(mix_batch(palette, A)))     # (N, n_illum)
+    return np.where(np.asarray(A).sum(axis=1) > 1e-9, _metameric_costs(des), 1e6)
+
+
+# ── Analytic gradient of the solver objective ───────────────────────────────
+# L-BFGS-B without jac= estimates the gradient by finite differences: k+1 full
+# mix → Lab → ΔE2000 evaluations (under every illuminant) per gradient. The cost is a
+# smooth composition almost everywhere, so we differentiate it exactly instead —
+# forward-mode through ciede2000 w.r.t. the sample Lab, then reverse through the Lab
+# transform, KM and the concentration weights to the subset fractions. Checked against
+# central finite differences by scripts/verify_spectral_gradient.py.
+_LAB_FROM_F = np.array([[0.0, 116.0, 0.0], [500.0, -500.0, 0.0], [0.0, 200.0, -200.0]])
+
+
+def _ciede2000_grad(lab1, lab2):
+    """ciede2000(lab1, lab2) plus its gradient w.r.t. lab2: returns (ΔE (…,), dΔE/dLab2
+    (…, 3)). Each intermediate of ciede2000 carries its tangent along (L2, a2, b2) in a
+    trailing axis of 3 (lab1 is the fixed target, so its terms have no tangent except
+    through the shared mean chroma). Hue wrapping is piecewise-constant and drops out; at
+    ΔE = 0 (the sqrt kink) the gradient is taken as 0."""
+    lab1 = np.asarray(lab1, dtype=float)
+    lab2 = np.asarray(lab2, dtype=float)
+    lab1, lab2 = np.broadcast_arrays(lab1, lab2)
+    L1, a1, b1 = lab1[..., 0], lab1[..., 1], lab1[..., 2]
+    L2, a2, b2 = lab2[..., 0], lab2[..., 1], lab2[..., 2]
+    eye = np.eye(3)
+    dL2, da2, db2 = eye[0], eye[1], eye[2]                 # seed tangents (3,)
+    rad = np.pi / 180.0
+
+    def safe_div(n, d):
+        return n / np.where(d == 0, 1.0, d) * (d != 0)
+
+    C1, C2 = np.hypot(a1, b1), np.hypot(a2, b2)
+    dC2 = safe_div(a2, C2)[..., None] * da2 + safe_div(b2, C2)[..., None] * db2
+    Cbar = (C1 + C2) / 2.0
+    dCbar = dC2 / 2.0
+    g = Cbar ** 7 / (Cbar ** 7 + 25.0 ** 7)
+    dg = (7 * Cbar ** 6 * 25.0 ** 7 / (Cbar ** 7 + 25.0 ** 7) ** 2)[..., None] * dCbar
+    G = 0.5 * (1 - np.sqrt(g))
+    dG = (-0.25 * safe_div(1.0, np.sqrt(g)))[..., None] * dg
+    a1p, a2p = (1 + G) * a1, (1 + G) * a2
+    da1p = a1[..., None] * dG
+    da2p = a2[..., None] * dG + (1 + G)[..., None] * da2
+    C1p, C2p = np.hypot(a1p, b1), np.hypot(a2p, b2)
+    dC1p = safe_div(a1p, C1p)[..., None] * da1p
+    dC2p = safe_div(a2p, C2p)[..., None] * da2p + safe_div(b2, C2p)[..., None] * db2
+    h1p = np.degrees(np.arctan2(b1, a1p)) % 360.0
+    h2p = np.degrees(np.arctan2(b2, a2p)) % 360.0
+    dh1p = (safe_div(-b1, C1p ** 2) / rad)[..., None] * da1p
+    dh2p = (safe_div(a2p, C2p ** 2) / rad)[..., None] * db2 \
+        - (safe_div(b2, C2p ** 2) / rad)[..., None] * da2p
+    zero = C1p * C2p == 0
+    dLp = L2 - L1
+    ddLp = np.broadcast_to(dL2, dLp.shape + (3,))
+    dCp = C2p - C1p
+    ddCp = dC2p - dC1p
+    dhp = h2p - h1p
+    dhp = np.where(dhp > 180, dhp - 360, dhp)
+    dhp = np.where(dhp < -180, dhp + 360, dhp)
+    dhp = np.where(zero, 0.0, dhp)
+    ddhp = np.where(zero[..., None], 0.0, dh2p - dh1p)
+    root = np.sqrt(C1p * C2p)
+    sin_h, cos_h = np.sin(np.radians(dhp) / 2.0), np.cos(np.radians(dhp) / 2.0)
+    dHp = 2 * root * sin_h
+    ddHp = (safe_div(sin_h, root)[..., None] * (C2p[..., None] * dC1p + C1p[..., None] * dC2p)
+            + (root * cos_h * rad)[..., None] * ddhp)
+    Lbarp = (L1 + L2) / 2.0
+    Cbarp = (C1p + C2p) / 2.0
+    dCbarp = (dC1p + dC2p) / 2.0
+    hsum, habs = h1p + h2p, np.abs(h1p - h2p)
+    hbarp = np.where(zero, hsum,
+                     np.where(habs <= 180, hsum / 2.0,
+                              np.where(hsum < 360, (hsum + 360) / 2.0, (hsum - 360) / 2.0)))
+    dhbarp = np.where(zero[..., None], dh1p + dh2p, (dh1p + dh2p) / 2.0)
+    T = (1 - 0.17 * np.cos(np.radians(hbarp - 30)) + 0.24 * np.cos(np.radians(2 * hbarp))
+         + 0.32 * np.cos(np.radians(3 * hbarp + 6)) - 0.20 * np.cos(np.radians(4 * hbarp - 63)))
+    dT = (rad * (0.17 * np.sin(np.radians(hbarp - 30)) - 0.48 * np.sin(np.radians(2 * hbarp))
+                 - 0.96 * np.sin(np.radians(3 * hbarp + 6)) + 0.80 * np.sin(np.radians(4 * hbarp - 63))
+                 ))[..., None] * dhbarp
+    dtheta = 30 * np.exp(-(((hbarp - 275) / 25.0) ** 2))
+    ddtheta = (dtheta * -2.0 * (hbarp - 275) / 625.0)[..., None] * dhbarp
+    q = Cbarp ** 7 / (Cbarp ** 7 + 25.0 ** 7)
+    RC = 2 * np.sqrt(q)
+    dRC = (safe_div(1.0, np.sqrt(q)) * 7 * Cbarp ** 6 * 25.0 ** 7
+           / (Cbarp ** 7 + 25.0 ** 7) ** 2)[..., None] * dCbarp
+    u = Lbarp - 50
+    SL = 1 + (0.015 * u ** 2) / np.sqrt(20 + u ** 2)
+    dSL = (0.015 * u * (40 + u ** 2) / (20 + u ** 2) ** 1.5 / 2.0)[..., None] * dL2
+    SC = 1 + 0.045 * Cbarp
+    dSC = 0.045 * dCbarp
+    SH = 1 + 0.015 * Cbarp * T
+    dSH = 0.015 * (T[..., None] * dCbarp + Cbarp[..., None] * dT)
+    RT = -np.sin(np.radians(2 * dtheta)) * RC
+    dRT = (-np.cos(np.radians(2 * dtheta)) * 2 * rad * RC)[..., None] * ddtheta \
+        - np.sin(np.radians(2 * dtheta))[..., None] * dRC
+    lt, ct, ht = dLp / SL, dCp / SC, dHp / SH
+    dlt = ddLp / SL[..., None] - (dLp / SL ** 2)[..., None] * dSL
+    dct = ddCp / SC[..., None] - (dCp / SC ** 2)[..., None] * dSC
+    dht = ddHp / SH[..., None] - (dHp / SH ** 2)[..., None] * dSH
+    de = np.sqrt(lt ** 2 + ct ** 2 + ht ** 2 + RT * ct * ht)
+    dP = (2 * lt[..., None] * dlt + 2 * ct[..., None] * dct + 2 * ht[..., None] * dht
+          + (ct * ht)[..., None] * dRT + RT[..., None] * (dct * ht[..., None] + ct[..., None] * dht))
+    return de, safe_div(1.0, 2.0 * de)[..., None] * dP
+
+
+def _cost_and_grad(palette, target_labs, x, squared=False):
+    """_metameric_cost of one recipe x (k,) and its exact gradient w.r.t. x, for
+    L-BFGS-B's jac=True. Empty recipes cost 1e6 with a zero gradient (as _cost_batch).
+
+    `squared=True` reads x as the *squared* fractions (concentration ∝ x·tinting²·lum) and
+    differentiates w.r.t. those. The solver optimises in that space: with amount² weights a
+    pigment at amount 0 has an exactly-zero gradient, so an exact-gradient L-BFGS-B could
+    never bring it back in, while the squared space is linear in each pigment's share."""
+    x = np.asarray(x, dtype=float)
+    sq = np.clip(x, 0.0, None) if squared else x ** 2
+    conc = sq * palette.weight                                       # (k,)
+    total = conc.sum()
+    if x.sum() <= 1e-9 or total <= 0:
+        return 1e6, np.zeros_like(x)
+    s = (conc @ palette.KS) / total                                  # (38,) mixed K/S
+    dsdsq = palette.weight[:, None] * (palette.KS - s) / total       # (k, 38)
+    dsdx = dsdsq if squared else 2 * x[:, None] * dsdsq
+    root = np.sqrt(s ** 2 + 2.0 * s)
+    R_raw = 1.0 + s - root
+    R = np.clip(R_raw, 1e-4, 1.0)
+    dRds = np.where((R_raw > 1e-4) & (R_raw < 1.0),
+                    1.0 - (s + 1.0) / np.where(root > 0, root, 1.0), 0.0)
+
+    st = _SCORING
+    ratios = (R @ st.WT).reshape(-1, 3) / st.white                   # (n, 3)
+    cube = np.cbrt(ratios)
+    big = ratios > 0.008856451679035631
+    f = np.where(big, cube, 7.787037037037037 * ratios + 16.0 / 116.0)
+    fprime = np.where(big, 1.0 / (3.0 * np.where(big, cube, 1.0) ** 2), 7.787037037037037)
+    labs = f @ _LAB_FROM_F.T                                         # (n, 3)
+    labs[:, 0] -= 16.0
+
+    des, ddes = _ciede2000_grad(target_labs, labs)                   # (n,), (n, 3)
+    n = len(des)
+    weights = np.zeros(n)
+    weights[0] = 1.0
+    if n > 1:
+        weights[1:] = METAMERISM_WEIGHT / (n - 1)
+    cost = float(weights @ des)
+    # Back-propagate: dcost/dLab (n,3) → df (n,3) → dratios → dXYZ → dR (38,).
+    dfeat = (weights[:, None] * ddes) @ _LAB_FROM_F                  # (n, 3)
+    dxyz = dfeat * fprime / st.white                                 # (n, 3)
+    dR = st.WT @ dxyz.ravel()                                        # (38,)
+    return cost, dsdx @ (dR * dRds)
+
+
 def _recipe_result(bases, keys, amounts, target):
     """Package a recipe (dict key→amount) with its achieved colour, headline ΔE
     (under D65), the per-illuminant ΔE breakdown, and the metamerism index."""
@@ -364,7 +965,25 @@ def _recipe_result(bases, keys, amounts, target):
     }
 
 
-def _best_for_subset(target, bases, keys, rng, light=False):
+class _Budget:
+    """Wall-clock budget of an anytime solve (deadline_ms). The solvers order their work
+    best-first and ask `expired()` between units (L-BFGS-B starts, subset solves); the
+    first True marks the solve `truncated`. No deadline → never expires."""
+
+    def __init__(self, deadline_ms=None):
+        self.end = None if deadline_ms is None else time.monotonic() + max(0.0, float(deadline_ms)) / 1000.0
+        self.truncated = False
+
+    def expired(self):
+        if self.end is not None and time.monotonic() >= self.end:
+            self.truncated = True
+        return self.truncated
+
+
+_NO_BUDGET = _Budget()
+
+
+def _best_for_subset(target, bases, keys, rng, light=False, seeds=(), budget=_NO_BUDGET):
     """Best continuous mix of exactly `keys` (a pigment subset), as normalised fractions.
 
     Low-dimensional and fairly smooth once the forward model and objective are correct, so a
@@ -375,33 +994,104 @@ def _best_for_subset(target, bases, keys, rng, light=False):
 
     `light=True` drops the per-pigment-alone starts (centroid + a few random only). Used by
     solve_mix for the wide first pass over a big palette, where n single-pigment L-BFGS-B
-    runs would dominate the cost; the subsequent re-solve on the reduced subset uses the
-    full start set."""
+    runs would dominate the cost, and for its clean-up re-solve, which is seeded with the
+    first pass's recipe instead. `seeds` are extra starting fractions aligned to `keys`
+    (e.g. the nearest recipe-atlas entries). Starts run best-first (centroid, seeds, singles, random)
+    and stop early once `budget` expires — the centroid start always runs."""
     n = len(keys)
+    palette = compile_palette(bases).subset(keys)
 
-    def objective(x):
-        s = x.sum()
-        if s <= 1e-9:
-            return 1e6
-        amounts = {keys[i]: float(x[i]) for i in range(n)}
-        return _metameric_cost(delta_e_by_illuminant(target, mix_amounts(bases, amounts).R))
+    def objective(y):
+        return _cost_and_grad(palette, target, y, squared=True)
 
     starts = [np.full(n, 1.0 / n)]                 # centroid
+    starts += [np.asarray(x, dtype=float) for x in seeds]
     if not light:
         starts += [np.eye(n)[i] for i in range(n)]  # each pigment alone
     starts += [rng.random(n) for _ in range(4 if light else 3)]    # seeded random
 
+    # Searched over squared fractions y = x² (see _cost_and_grad) with the exact gradient.
     bounds = [(0.0, 1.0)] * n
     best_x, best_f = None, np.inf
-    for s0 in starts:
-        res = minimize(objective, s0, method='L-BFGS-B', bounds=bounds)
+    for j, s0 in enumerate(starts):
+        if j and budget.expired():
+            break
+        res = minimize(objective, s0 ** 2, method='L-BFGS-B', jac=True, bounds=bounds)
         if res.fun < best_f:
-            best_f, best_x = res.fun, res.x
+            best_f, best_x = res.fun, np.sqrt(np.clip(res.x, 0.0, None))
 
     total = best_x.sum() or 1.0
     return best_x / total, float(best_f)
 
 
+# ── Population backend (backend='de') ──────────────────────────────────────
+# The default backend ('lbfgsb') runs scipy's L-BFGS-B from a handful of starts per
+# subset, one point at a time. 'de' is a differential evolution (DE/rand/1/bin) that
+# evolves a population per subset for *every* subset of a search at once: each
+# generation is one _cost_batch call over (subsets × population) candidate recipes.
+# No gradient and no Python-level per-point overhead, at the price of a coarser optimum —
+# scripts/bench_solver_backends.py measures the trade on the skin and gamut targets.
+BACKENDS = ('lbfgsb', 'de')
+DE_POPULATION = 24       # individuals per subset (at least 3× the subset size)
+DE_GENERATIONS = 150
+DE_F, DE_CR = 0.7, 0.9   # differential weight, crossover rate
+
+
+def _de_subsets(target, bases, subsets, rng, seeds=None, budget=_NO_BUDGET):
+    """Differential evolution over many pigment subsets simultaneously. Each subset's
+    population lives in the full palette's coordinates, masked to its own pigments, and
+    starts from its centroid (+ its atlas seed, if any) plus random members. Runs
+    DE_GENERATIONS (fewer once every population has converged or `budget` expires).
+    Returns [(fractions aligned to the subset, metameric cost)] in `subsets` order."""
+    palette = compile_palette(bases)
+    S, n = len(subsets), len(palette)
+    pop = max(DE_POPULATION, 3 * max(len(sub) for sub in subsets))
+    M = np.zeros((S, n))
+    for i, sub in enumerate(subsets):
+        M[i, [palette.index[k] for k in sub]] = 1.0
+    X = rng.random((S, pop, n)) * M[:, None, :]
+    X[:, 0] = M / M.sum(axis=1, keepdims=True)
+    for i, sub in enumerate(subsets):
+        for seed in _seeds_for(seeds, sub):
+            X[i, 1, [palette.index[k] for k in sub]] = seed
+    f = _cost_batch(palette, target, X.reshape(-1, n)).reshape(S, pop)
+
+    rows = np.arange(pop)
+    for _ in range(DE_GENERATIONS):
+        if budget.expired() or (f.max(axis=1) - f.min(axis=1) < 1e-7).all():
+            break
+        keys = rng.random((S, pop, pop))
+        keys[:, rows, rows] = np.inf                      # never pick yourself
+        r = np.argsort(keys, axis=2)[..., :3]             # three distinct partners
+        pick = lambda j: np.take_along_axis(X, r[..., j:j + 1], axis=1)   # noqa: E731
+        V = np.clip(pick(0) + DE_F * (pick(1) - pick(2)), 0.0, 1.0) * M[:, None, :]
+        cross = rng.random((S, pop, n)) < DE_CR
+        cross[np.arange(S)[:, None], rows[None, :], rng.integers(0, n, (S, pop))] = True
+        U = np.where(cross, V, X) * M[:, None, :]
+        empty = U.sum(axis=2) <= 1e-9
+        U[empty] = X[empty]
+        fu = _cost_batch(palette, target, U.reshape(-1, n)).reshape(S, pop)
+        better = fu <= f
+        X[better], f[better] = U[better], fu[better]
+
+    best = np.argmin(f, axis=1)
+    out = []
+    for i, sub in enumerate(subsets):
+        x = X[i, best[i], [palette.index[k] for k in sub]]
+        out.append((x / (x.sum() or 1.0), float(f[i, best[i]])))
+    return out
+
+
+def _solve_one(target, bases, keys, rng, backend='lbfgsb', light=False, budget=_NO_BUDGET, seed=None):
+    """Best mix of exactly `keys` with the chosen backend → (fractions, cost). `seed` is an
+    optional extra start (fractions aligned to `keys`)."""
+    if backend == 'de':
+        seeds = {frozenset(keys): dict(zip(keys, seed))} if seed is not None else None
+        return _de_subsets(target, bases, [tuple(keys)], rng, seeds, budget=budget)[0]
+    return _best_for_subset(target, bases, keys, rng, light=light, budget=budget,
+                            seeds=[seed] if seed is not None else ())
+
+
 # Gamut-reachability ladder, in headline (D65) ΔE2000. Five fixed pigments span a
 # limited gamut, so an arbitrary target may simply be unreachable — these bands turn
 # the best achievable ΔE into an honest verdict instead of a silently-large number.
@@ -426,54 +1116,262 @@ def _reachability(best_delta_e):
 # Palettes with at most this many pigments are solved by exhaustive subset enumeration
 # (2ⁿ); wider ones use forward-greedy selection so a solve stays sub-second.
 EXHAUSTIVE_MAX = 7
-
-
-def _effsets_exhaustive(target_labs, bases, keys_all, rng, significance):
-    """Solve every non-empty pigment subset; collapse to one entry per *effective* set
-    (pigments left after dropping near-zero ones), keeping the lowest-cost solve for each."""
-    by_effset = {}
-    for k in range(1, len(keys_all) + 1):
-        for subset in combinations(keys_all, k):
-            fracs, cost = _best_for_subset(target_labs, bases, list(subset), rng)
-            eff = [(subset[i], fracs[i]) for i in range(len(subset)) if fracs[i] >= significance]
-            if not eff:
-                continue
-            effset = frozenset(p for p, _ in eff)
-            if effset not in by_effset or cost < by_effset[effset][1]:
-                by_effset[effset] = (eff, cost)
-    return by_effset
-
-
-def _effsets_greedy(target_labs, bases, keys_all, rng, significance, max_pigments=8):
+# solve_mix's clean-up re-solve (insignificant pigments dropped) replaces the full-palette
+# recipe only if it costs at most this much more (metameric cost, ≈ ΔE2000).
+CLEANUP_TOLERANCE = 0.5
+
+
+# Subset-solve pool. The exhaustive search is up to 2⁷−1 independent multi-start solves, so
+# they can fan out across processes (L-BFGS-B + ΔE2000 are Python-heavy: threads would just
+# contend for the GIL). Each pool process holds its own numpy/scipy stack (~60–80 MB), so
+# the default of 1 — solve in the request thread — is what fits the single-worker 512 MB
+# layout in gunicorn.conf.py; set SPECTRAL_SUBSET_WORKERS where there is memory and CPU to
+# spare. The pool is created on first use and reused for every later solve.
+SUBSET_WORKERS = max(1, int(os.environ.get('SPECTRAL_SUBSET_WORKERS', '1')))
+_SUBSET_POOL = None
+_SUBSET_POOL_LOCK = threading.Lock()
+
+
+def set_subset_workers(workers):
+    """Resize the subset-solve pool (1 = serial). Shuts down the current pool, if any."""
+    global SUBSET_WORKERS, _SUBSET_POOL
+    with _SUBSET_POOL_LOCK:
+        SUBSET_WORKERS = max(1, int(workers))
+        if _SUBSET_POOL is not None:
+            _SUBSET_POOL.shutdown(wait=False, cancel_futures=True)
+            _SUBSET_POOL = None
+
+
+def _subset_pool():
+    """The shared subset-solve pool, or None to solve serially: SUBSET_WORKERS is 1, or we
+    are already inside a pool process (e.g. an app.spectral_batch worker) — no nesting."""
+    global _SUBSET_POOL
+    if SUBSET_WORKERS <= 1 or multiprocessing.parent_process() is not None:
+        return None
+    with _SUBSET_POOL_LOCK:
+        if _SUBSET_POOL is None:
+            # spawn, not fork: the gunicorn worker is threaded, and forking a threaded
+            # process can copy a lock some other thread holds.
+            _SUBSET_POOL = ProcessPoolExecutor(max_workers=SUBSET_WORKERS,
+                                               mp_context=multiprocessing.get_context('spawn'),
+                                               initializer=configure_illuminants,
+                                               initargs=illuminant_config())
+        return _SUBSET_POOL
+
+
+def _solve_subset(target_labs, palette, subset, seed_seq, seeds):
+    """One exhaustive-search task: _best_for_subset with the subset's own RNG stream."""
+    return _best_for_subset(target_labs, palette, list(subset), np.random.default_rng(seed_seq),
+                            seeds=seeds)
+
+
+def _solve_subsets(tasks, budget=_NO_BUDGET):
+    """Run _solve_subset over `tasks` — on the subset pool if there is one — in order.
+    Serially, the `budget` is checked between (and within) subset solves and the results
+    may come back short; a pool batch runs to completion (the caller checks in between)."""
+    pool = _subset_pool()
+    if pool is None or len(tasks) < 2:
+        solved = []
+        for task in tasks:
+            if solved and budget.expired():
+                break
+            solved.append(_best_for_subset(task[0], task[1], list(task[2]),
+                                           np.random.default_rng(task[3]), seeds=task[4],
+                                           budget=budget))
+        return solved
+    chunk = max(1, len(tasks) // (4 * SUBSET_WORKERS))
+    return list(pool.map(_solve_subset, *zip(*tasks), chunksize=chunk))
+
+
+def _record_effset(by_effset, subset, fracs, cost, significance):
+    """File a subset solve under its effective set (pigments ≥ significance), keeping the
+    cheapest solve per set. Returns the effective set (None if every fraction is tiny)."""
+    eff = [(subset[i], fracs[i]) for i in range(len(subset)) if fracs[i] >= significance]
+    if not eff:
+        return None
+    effset = frozenset(p for p, _ in eff)
+    if effset not in by_effset or cost < by_effset[effset][1]:
+        by_effset[effset] = (eff, cost)
+    return effset
+
+
+def _best_simpler(by_effset, size):
+    """Lowest cost recorded so far over effective sets of fewer than `size` pigments — an
+    upper bound on what a `size`-pigment recipe must beat to enter the Pareto front."""
+    return min((cost for eff, cost in by_effset.values() if len(eff) < size), default=np.inf)
+
+
+def _centroid_costs(palette, target_labs, subsets):
+    """Metameric cost of each subset's equal-parts mix — one _cost_batch call; the cheap
+    'promise' the anytime search orders subsets by."""
+    A = np.zeros((len(subsets), len(palette)))
+    for i, subset in enumerate(subsets):
+        A[i, [palette.index[k] for k in subset]] = 1.0 / len(subset)
+    return dict(zip(subsets, _cost_batch(palette, target_labs, A))) if subsets else {}
+
+
+def _effsets_exhaustive(target_labs, bases, keys_all, seed, significance, seeds=None,
+                        budget=_NO_BUDGET, backend='lbfgsb', prune=False):
+    """Solve every non-empty pigment subset that can still reach the Pareto front; collapse
+    to one entry per *effective* set (pigments left after dropping near-zero ones), keeping
+    the lowest-cost solve for each. `seeds` maps a subset (frozenset) to extra starting
+    amounts {key: amount}. Returns (by_effset, search stats).
+
+    Singles and pairs are solved first (cheap, and they set the bar every bigger recipe
+    must beat), then the remaining sizes largest first, so each subset S has all its
+    one-bigger supersets T settled and one test skips it without an L-BFGS-B run:
+      • redundant — some T's optimum only uses pigments of S, so S's optimum is that same
+        recipe (S ⊆ T, and T's solution is feasible for S).
+    `prune=True` adds a second, heuristic skip (opt-in: it can drop a front entry):
+      • hopeless — S's reachable mixes are a subset of each T's, so if T's *true* optimum
+        failed to beat the best simpler recipe, S's would too. But cost(T) is what a
+        multi-start local search found — an upper bound on T's optimum, not a lower bound
+        on S's — so when a superset's solve lands in a poor basin, S is skipped although
+        it might have entered the front.
+    Every subset draws its random starts from its own stream (SeedSequence(seed).spawn, in
+    enumeration order) and each size is solved as one batch merged in order, so the
+    outcome is the same serial or on the subset pool, however the solves get scheduled.
+
+    Anytime: within a size, subsets go most promising first (_centroid_costs); once
+    `budget` expires the search stops where it is and returns what it has.
+
+    backend='de' instead evolves every subset at once (_de_subsets) — no pruning, since
+    there is no one-subset-at-a-time schedule to prune from."""
+    palette = compile_palette(bases)
+    n = len(keys_all)
+    subsets = [s for k in range(1, n + 1) for s in combinations(keys_all, k)]
+    if backend == 'de':
+        by_effset = {}
+        solved = _de_subsets(target_labs, palette, subsets, np.random.default_rng(seed), seeds, budget)
+        for subset, (fracs, cost) in zip(subsets, solved):
+            _record_effset(by_effset, subset, fracs, cost, significance)
+        return by_effset, {'subsets': len(subsets), 'solved': len(subsets), 'pruned': 0}
+    streams = dict(zip(subsets, np.random.SeedSequence(seed).spawn(len(subsets))))
+    promise = _centroid_costs(palette, target_labs, subsets)
+    by_size = {k: sorted((s for s in subsets if len(s) == k), key=promise.get) for k in range(1, n + 1)}
+    found = {}       # frozenset(subset) → its solved cost (or the one it was skipped on)
+    eff_of = {}      # frozenset(subset) → effective set of its optimum (solved/redundant)
+    by_effset, solved_n, pruned = {}, 0, 0
+
+    for size in [k for k in (1, 2) if k <= n] + list(range(n, 2, -1)):
+        bar = _best_simpler(by_effset, size)
+        todo = []
+        for subset in by_size[size]:
+            key = frozenset(subset)
+            supers = [key | {p} for p in keys_all if p not in key] if size > 2 else []
+            same = next((t for t in supers if eff_of.get(t) is not None and eff_of[t] <= key), None)
+            if same is not None:
+                found[key], eff_of[key] = found[same], eff_of[same]
+                pruned += 1
+            elif prune and supers and max(found[t] for t in supers) >= bar - 1e-9:
+                found[key] = max(found[t] for t in supers)
+                pruned += 1
+            else:
+                todo.append(subset)
+        if solved_n and budget.expired():
+            break
+        solved = _solve_subsets([(target_labs, palette, s, streams[s], _seeds_for(seeds, s))
+                                 for s in todo], budget)
+        solved_n += len(solved)
+        for subset, (fracs, cost) in zip(todo, solved):
+            key = frozenset(subset)
+            found[key] = cost
+            eff_of[key] = _record_effset(by_effset, subset, fracs, cost, significance)
+        if budget.truncated:
+            break
+    return by_effset, {'subsets': len(subsets), 'solved': solved_n, 'pruned': pruned}
+
+
+def _seeds_for(seeds, subset):
+    """Extra starts for `subset` from a {frozenset: {key: amount}} seed map, aligned and
+    normalised to fractions — the solvers start from fractions, and raw drop counts
+    (12:1:2) would square to far outside L-BFGS-B's [0, 1] box and clip to equal parts."""
+    seed = (seeds or {}).get(frozenset(subset))
+    if not seed:
+        return []
+    vec = np.array([seed[k] for k in subset], dtype=float)
+    return [vec / vec.sum()] if vec.sum() > 0 else []
+
+
+def _atlas(bases):
+    """The palette's recipe atlas (recipe_atlas.atlas_for), None above five pigments."""
+    from .recipe_atlas import atlas_for    # lazy: recipe_atlas builds on this module
+    return atlas_for(bases)
+
+
+def _atlas_seeds(bases, target_labs, k=64):
+    """{pigment set: {key: drops}} — the closest recipe-atlas entry for each pigment set
+    among the k nearest to the target. Empty when the palette has no atlas."""
+    atlas = _atlas(bases)
+    if atlas is None:
+        return {}
+    seeds = {}
+    for i in atlas.nearest(target_labs, k):
+        vec = atlas.drops[i]
+        amounts = {atlas.keys[j]: float(vec[j]) for j in range(len(vec)) if vec[j] > 0}
+        seeds.setdefault(frozenset(amounts), amounts)
+    return seeds
+
+
+def _effsets_greedy(target_labs, bases, keys_all, rng, significance, max_pigments=8,
+                    budget=_NO_BUDGET, backend='lbfgsb'):
     """Forward-greedy subset search for wide palettes: start empty, repeatedly add the
     pigment that most lowers the metameric cost, recording the effective recipe at each
     step. Yields a simplicity/accuracy ladder (one entry per effective pigment count)
-    without the 2ⁿ blow-up. Stops once extra pigments stop helping or the cap is hit."""
+    without the 2ⁿ blow-up. Stops once extra pigments stop helping or the cap is hit.
+
+    A relaxed solve over the whole palette bounds every subset from below (no subset can
+    mix anything the full palette can't), so once a trial reaches that bound the rest of
+    its round — and any further round — is skipped and counted as pruned. Each round tries
+    the candidates most promising first (_centroid_costs) and, once `budget` expires,
+    keeps the best addition found so far and stops. With backend='de' a round's trials are
+    evolved together in one _de_subsets call. Returns (by_effset, search stats)."""
+    palette = compile_palette(bases)
     by_effset = {}
+    floor = _solve_one(target_labs, bases, keys_all, rng, backend, light=True, budget=budget)[1]
     chosen, last_cost = [], np.inf
     cap = min(max_pigments, len(keys_all))
+    solved, pruned = 1, 0
     while len(chosen) < cap:
         remaining = [k for k in keys_all if k not in chosen]
+        if last_cost <= floor + 1e-3:      # already as good as the whole palette gets
+            pruned += len(remaining)
+            break
+        if by_effset and budget.expired():
+            break
+        promise = _centroid_costs(palette, target_labs, [tuple(chosen + [c]) for c in remaining])
+        remaining.sort(key=lambda c: promise[tuple(chosen + [c])])
         best = None
-        for c in remaining:
+        if backend == 'de':
+            trials = [chosen + [c] for c in remaining]
+            results = _de_subsets(target_labs, palette, trials, rng, budget=budget)
+            solved += len(trials)
+            j = int(np.argmin([cost for _, cost in results]))
+            best = (trials[j], results[j][1], results[j][0])
+            remaining = []
+        for j, c in enumerate(remaining):
+            if best is not None and budget.expired():
+                break
             trial = chosen + [c]
-            fracs, cost = _best_for_subset(target_labs, bases, trial, rng, light=len(trial) > 6)
+            fracs, cost = _best_for_subset(target_labs, bases, trial, rng, light=len(trial) > 6,
+                                           budget=budget)
+            solved += 1
             if best is None or cost < best[1]:
                 best = (trial, cost, fracs)
+            if cost <= floor + 1e-3:
+                pruned += len(remaining) - j - 1
+                break
         trial, cost, fracs = best
         chosen = trial
-        eff = [(chosen[i], fracs[i]) for i in range(len(chosen)) if fracs[i] >= significance]
-        if eff:
-            effset = frozenset(p for p, _ in eff)
-            if effset not in by_effset or cost < by_effset[effset][1]:
-                by_effset[effset] = (eff, cost)
-        if cost > last_cost - 1e-3:    # adding another pigment no longer meaningfully helps
+        _record_effset(by_effset, chosen, fracs, cost, significance)
+        if budget.truncated or cost > last_cost - 1e-3:   # out of time / no longer helping
             break
         last_cost = cost
-    return by_effset
+    return by_effset, {'subsets': solved + pruned, 'solved': solved, 'pruned': pruned}
 
 
-def solve_recipe(target_color, bases, seed=0, max_options=3, significance=0.02):
+def solve_recipe(target_color, bases, seed=0, max_options=3, significance=0.02, cache=None,
+                 deadline_ms=None, backend='lbfgsb', prune=False):
     """Match target_color (a SpectralColor) with the measured bases, minimising ΔE2000.
 
     Adopts the reference engine's solver *strategy* (yargo13/color-formulation): instead of
@@ -488,24 +1386,56 @@ def solve_recipe(target_color, bases, seed=0, max_options=3, significance=0.02):
     A `reachability` verdict states how close the best recipe can actually get, since five
     fixed pigments span a limited gamut.
 
-    Returns {'options': [opt, …], 'reachability': {…}} ordered best-match first (so options[0]
-    is the headline recipe). Each opt = {pigments, num_pigments, continuous:{…}, rounded:{…}}.
+    Returns {'options': [opt, …], 'reachability': {…}, 'search': {…}, 'truncated': bool}
+    with options ordered best-match first (so options[0] is the headline recipe). Each opt
+    = {pigments, num_pigments, continuous:{…}, rounded:{…}}; `search` counts the pigment
+    subsets considered, solved and skipped (see _effsets_exhaustive; `prune=True` opts in
+    to its faster, heuristic skip that can miss a front entry).
+
+    `deadline_ms` makes it an anytime solve: the subset search runs best-first and stops
+    when the budget runs out, returning the best ladder found so far with truncated=True
+    (rounding and packaging the options still run after the deadline). `backend` picks
+    the subset optimiser: 'lbfgsb' (multi-start L-BFGS-B) or 'de' (population-based, every
+    subset at once — see _de_subsets).
 
     Works for any palette: the original five (and any set ≤ EXHAUSTIVE_MAX pigments) are
     solved exhaustively over every subset; wider palettes (the 8/10/12/16-pigment gamut sets)
     use a forward-greedy subset search so the solve stays fast instead of 2ⁿ-exploding.
+    Pass a SolveCache as `cache` to reuse results (truncated ones are never stored, and a
+    cached complete result is returned whatever the deadline).
     """
     # All bases, painter-primaries first; an arbitrary palette may add p6, p7, ….
-    keys_all = [k for k in ORDER if k in bases] + [k for k in bases if k not in ORDER]
+    bases = compile_palette(bases)
+    params = {'seed': seed, 'max_options': max_options, 'significance': significance,
+              'backend': backend, 'prune': prune}
+    if cache is not None:
+        key = SolveCache.key('solve_recipe', bases, target_color.R, params)
+        return cache.get_or_compute(key, lambda: solve_recipe(target_color, bases, **params,
+                                                              deadline_ms=deadline_ms))
     # Target curve is fixed for the whole solve — pre-compute its per-illuminant Labs
     # once and reuse them across the thousands of objective evaluations below.
-    target_labs = _labs_under_all(target_color.R)
-    rng = np.random.default_rng(seed)
-
+    return _solve_recipe_labs(_labs_under_all(target_color.R), bases, **params,
+                              deadline_ms=deadline_ms)
+
+
+def _solve_recipe_labs(target_labs, bases, seed=0, max_options=3, significance=0.02,
+                       deadline_ms=None, backend='lbfgsb', prune=False):
+    """solve_recipe against a pre-computed target Lab stack (see _labs_under_all) — lets a
+    batch compute every target's Labs in one pass (app.spectral_batch)."""
+    if backend not in BACKENDS:
+        raise ValueError(f'unknown backend {backend!r}; expected one of {BACKENDS}')
+    target_labs = prepare_reference(target_labs)   # fixed for the solve: prepare ΔE terms once
+    bases = compile_palette(bases)
+    keys_all = [k for k in ORDER if k in bases.index] + [k for k in bases.keys if k not in ORDER]
+    budget = _Budget(deadline_ms)
     if len(keys_all) <= EXHAUSTIVE_MAX:
-        by_effset = _effsets_exhaustive(target_labs, bases, keys_all, rng, significance)
+        by_effset, search = _effsets_exhaustive(target_labs, bases, keys_all, seed, significance,
+                                                seeds=_atlas_seeds(bases, target_labs),
+                                                budget=budget, backend=backend, prune=prune)
     else:
-        by_effset = _effsets_greedy(target_labs, bases, keys_all, rng, significance)
+        by_effset, search = _effsets_greedy(target_labs, bases, keys_all,
+                                            np.random.default_rng(seed), significance,
+                                            budget=budget, backend=backend)
 
     # Pareto front over (number of pigments, cost): keep a recipe only if no simpler-or-equal
     # recipe also matches better. This is the simplicity/accuracy trade-off ladder.
@@ -535,87 +1465,252 @@ def solve_recipe(target_color, bases, seed=0, max_options=3, significance=0.02):
     # headline ΔE (rounding to drops can only add error, so the continuous solve is the
     # true gamut-distance verdict).
     best_de = min((o['continuous']['delta_e'] for o in options), default=float('inf'))
-    return {'options': options, 'reachability': _reachability(best_de)}
-
-
-def _round_recipe(bases, keys, fractions, target, max_total=12):
-    """Snap continuous fractions to practical integer 'drops'. Try every small total,
-    re-score the metameric cost on the rounded recipe, then do a ±1-drop local search —
-    keeping the lowest-cost integer recipe (rounding the optimum naively can hurt the match)."""
-    fractions = np.asarray(fractions)
-
-    def score(vec):
-        amounts = {keys[i]: int(vec[i]) for i in range(len(keys))}
-        if sum(amounts.values()) == 0:
-            return 1e6, amounts
-        mixed = mix_amounts(bases, amounts)
-        return _metameric_cost(delta_e_by_illuminant(target, mixed.R)), amounts
-
-    best_vec, best_de = None, np.inf
-    for total in range(2, max_total + 1):
-        vec = np.round(fractions * total).astype(int)
-        vec = np.clip(vec, 0, None)
-        if vec.sum() == 0:
-            continue
-        d, _ = score(vec)
-        if d < best_de:
-            best_de, best_vec = d, vec
-
-    if best_vec is None:  # degenerate: put 1 drop on the strongest fraction
-        best_vec = np.zeros(len(keys), dtype=int)
-        best_vec[int(np.argmax(fractions))] = 1
-
-    # ±1-drop hill climb around the best integer vector.
-    improved = True
-    while improved:
-        improved = False
-        base_de, _ = score(best_vec)
-        for i in range(len(keys)):
-            for delta in (-1, 1):
-                cand = best_vec.copy()
-                cand[i] += delta
-                if cand[i] < 0 or cand.sum() == 0:
-                    continue
-                d, _ = score(cand)
-                if d < base_de - 1e-9:
-                    best_vec, base_de, improved = cand, d, True
-
+    return {'options': options, 'reachability': _reachability(best_de), 'search': search,
+            'truncated': budget.truncated}
+
+
+# Integer rounding scores every primitive drop vector (gcd 1 — 2:2 mixes exactly what 1:1
+# does) of up to max_total drops in one _cost_batch pass: 49 586 vectors for five pigments
+# at 20 drops, ~0.1 s. Beyond ROUND_EXHAUSTIVE_MAX stars-and-bars vectors (the 7+-pigment
+# options of wide palettes) it scores the ±1-drop box around every scaled rounding of the
+# fractions instead.
+ROUND_EXHAUSTIVE_MAX = 60000
+
+
+@functools.lru_cache(maxsize=32)
+def drop_vectors(k, max_total):
+    """Every primitive (gcd 1) non-zero integer vector of length k summing to ≤ max_total,
+    as (n, k) uint8 ordered by total drops — stars and bars over k pigments + one slack
+    bin. Cached: callers must not modify the array."""
+    bars = np.array(list(combinations(range(max_total + k), k)), dtype=np.int64)
+    edges = np.concatenate([np.full((len(bars), 1), -1), bars,
+                            np.full((len(bars), 1), max_total + k)], axis=1)
+    drops = (np.diff(edges, axis=1) - 1)[:, :k]
+    drops = drops[(drops.sum(axis=1) > 0) & (np.gcd.reduce(drops, axis=1) == 1)]
+    drops = drops[np.argsort(drops.sum(axis=1), kind='stable')].astype(np.uint8)
+    drops.setflags(write=False)
+    return drops
+
+
+def _rounding_candidates(fractions, max_total):
+    """Integer recipes _round_recipe scores: all drop vectors up to max_total when that is
+    at most ROUND_EXHAUSTIVE_MAX of them, else the ±1 box around round(fractions·t) for
+    every total t — either way simplest (fewest drops) first."""
+    k = len(fractions)
+    if comb(max_total + k, k) <= ROUND_EXHAUSTIVE_MAX:
+        return drop_vectors(k, max_total).astype(int)
+    centres = np.round(fractions[None, :] * np.arange(1, max_total + 1)[:, None]).astype(int)
+    box = np.array(np.meshgrid(*[[-1, 0, 1]] * k, indexing='ij')).reshape(k, -1).T
+    cands = np.unique((centres[:, None, :] + box[None, :, :]).reshape(-1, k), axis=0)
+    cands = cands[(cands >= 0).all(axis=1) & (cands.sum(axis=1) > 0) & (cands.sum(axis=1) <= max_total)]
+    return cands[np.argsort(cands.sum(axis=1), kind='stable')]
+
+
+def _round_recipe(bases, keys, fractions, target, max_total=20):
+    """Snap continuous fractions to practical integer 'drops': the exact best-scoring
+    integer recipe of at most max_total drops (metameric cost, rounding the optimum
+    naively can hurt the match), found by scoring every candidate (_rounding_candidates)
+    in one _cost_batch call. Ties go to the recipe with fewer drops."""
+    fractions = np.asarray(fractions, dtype=float)
+    palette = compile_palette(bases).subset(keys)
+    cands = _rounding_candidates(fractions, max_total)
+    best_vec = cands[int(np.argmin(_cost_batch(palette, target, cands)))]
     amounts = {keys[i]: int(best_vec[i]) for i in range(len(keys)) if best_vec[i] > 0}
     return _recipe_result(bases, list(amounts.keys()), amounts, target)
 
 
-def solve_mix(target_color, bases, seed=0, significance=0.03):
+# ── Solve-result cache ──────────────────────────────────────────────────────
+# Players and lab users re-solve the same targets over and over (catalog colours, the
+# skin targets), and a solve is deterministic given (palette, target, parameters) — so
+# the result is cached. Targets are quantised to SOLVE_CACHE_QUANTUM in reflectance,
+# far below anything visible, so float noise in a client-reconstructed curve still hits.
+# Bump SOLVER_VERSION whenever a change alters solver output: it is part of every key,
+# so the persistent tier can't serve recipes from an older solver.
+SOLVER_VERSION = 7
+SOLVE_CACHE_QUANTUM = 1e-4
+
+
+class SolveCache:
+    """Bounded, thread-safe LRU of solve results with an optional persistent tier.
+
+    maxsize : in-memory entries (least-recently-used evicted first).
+    path    : optional sqlite file. Entries written there survive the gunicorn worker
+              recycling (max_requests), and a fresh worker warms its memory tier from it
+              on demand. Capped at `disk_maxsize` rows (oldest writes pruned). Any sqlite
+              error disables the disk tier rather than failing a solve.
+    Counters: hits (memory), disk_hits, misses — see stats().
+    """
+
+    def __init__(self, maxsize=512, path=None, disk_maxsize=20000):
+        self.maxsize = max(1, int(maxsize))
+        self.disk_maxsize = int(disk_maxsize)
+        self.hits = self.disk_hits = self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            try:
+                self._db = sqlite3.connect(path, timeout=1.0, check_same_thread=False)
+                self._db.execute('CREATE TABLE IF NOT EXISTS solves (key TEXT PRIMARY KEY, value TEXT)')
+                self._db.commit()
+            except sqlite3.Error:
+                self._db = None
+
+    @staticmethod
+    def key(kind, palette, target_R, params):
+        """Cache key for one solve: solver kind + version, palette fingerprint, scoring
+        lights (IlluminantStack.fingerprint), the quantised target curve and the solver
+        parameters (a dict)."""
+        q = np.round(np.asarray(target_R, dtype=float) / SOLVE_CACHE_QUANTUM).astype(np.int64)
+        params = sorted(params.items())
+        h = hashlib.sha1(f'{kind}|{SOLVER_VERSION}|{palette.fingerprint}|{_SCORING.fingerprint}|'
+                         f'{params!r}|'.encode('utf-8'))
+        h.update(q.tobytes())
+        return h.hexdigest()
+
+    def get(self, key):
+        """The cached result for `key` (memory, then disk) or None; counts the lookup.
+        Callers always get their own copy, so mutating a result can't corrupt the cache."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(self._entries[key])
+            value = self._disk_get(key)
+            if value is not None:
+                self.disk_hits += 1
+                self._put(key, value)
+                return copy.deepcopy(value)
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        """Store a result. None and truncated (deadline-cut, see solve_mix) results are
+        skipped: they depend on the clock, not just on the key."""
+        if value is None or (isinstance(value, dict) and value.get('truncated')):
+            return
+        with self._lock:
+            self._put(key, copy.deepcopy(value))
+            self._disk_put(key, value)
+
+    def get_or_compute(self, key, compute):
+        """get(key), or compute() → put → return on a miss. The solve runs outside the
+        lock, so a slow solve never blocks other threads' hits."""
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {'hits': self.hits, 'disk_hits': self.disk_hits, 'misses': self.misses,
+                    'hit_rate': round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+                    'size': len(self._entries), 'maxsize': self.maxsize,
+                    'persistent': self._db is not None}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.disk_hits = self.misses = 0
+
+    def _put(self, key, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def _disk_get(self, key):
+        if self._db is None:
+            return None
+        try:
+            row = self._db.execute('SELECT value FROM solves WHERE key = ?', (key,)).fetchone()
+        except sqlite3.Error:
+            self._db = None
+            return None
+        return json.loads(row[0]) if row else None
+
+    def _disk_put(self, key, value):
+        if self._db is None:
+            return
+        try:
+            self._db.execute('INSERT OR REPLACE INTO solves (key, value) VALUES (?, ?)',
+                             (key, json.dumps(value)))
+            self._db.execute('DELETE FROM solves WHERE rowid <= (SELECT MAX(rowid) FROM solves) - ?',
+                             (self.disk_maxsize,))
+            self._db.commit()
+        except (sqlite3.Error, TypeError, ValueError):
+            self._db = None
+
+
+def solve_mix(target_color, bases, seed=0, significance=0.03, cache=None, deadline_ms=None,
+              backend='lbfgsb'):
     """A single best continuous recipe for `target_color` over ALL of `bases` — the fast,
     palette-agnostic "give me a mix" solve.
 
     Unlike solve_recipe (exhaustive 2ⁿ subset sweep + Pareto front, tuned for the fixed five),
     this does one multi-start continuous solve over every pigment in the palette, drops the
-    insignificant ones, and re-solves on what's left for a clean recipe. That stays fast for
+    insignificant ones, and re-solves on what's left for a clean recipe — kept only if it
+    costs at most CLEANUP_TOLERANCE more than the full recipe. That stays fast for
     the larger gamut palettes (8–16 pigments) where the subset sweep would blow up. Same
     multi-illuminant objective, so the recipe resists metamerism.
 
     Returns a _recipe_result dict (amounts as normalised fractions summing to 1, achieved
     sRGB, headline ΔE, per-illuminant breakdown, metamerism index) plus a 'reachability'
-    verdict — or None if there are no bases.
+    verdict, the 'search' counts and a 'truncated' flag — or None if there are no bases.
+    `deadline_ms` bounds the solve: L-BFGS-B starts run best-first (centroid first) and the
+    tightening re-solve is skipped once it runs out (truncated=True). `backend` is
+    'lbfgsb' or 'de', as for solve_recipe. Pass a SolveCache as `cache` to reuse results;
+    truncated ones are never stored.
     """
-    keys = list(bases.keys())
+    bases = compile_palette(bases)
+    keys = list(bases.keys)
+    if not keys:
+        return None
+    params = {'seed': seed, 'significance': significance, 'backend': backend}
+    if cache is not None:
+        key = SolveCache.key('solve_mix', bases, target_color.R, params)
+        return cache.get_or_compute(key, lambda: solve_mix(target_color, bases, **params,
+                                                           deadline_ms=deadline_ms))
+    return _solve_mix_labs(_labs_under_all(target_color.R), bases, **params, deadline_ms=deadline_ms)
+
+
+def _solve_mix_labs(target_labs, bases, seed=0, significance=0.03, deadline_ms=None,
+                    backend='lbfgsb'):
+    """solve_mix against a pre-computed target Lab stack (see _solve_recipe_labs)."""
+    if backend not in BACKENDS:
+        raise ValueError(f'unknown backend {backend!r}; expected one of {BACKENDS}')
+    target_labs = prepare_reference(target_labs)
+    bases = compile_palette(bases)
+    keys = list(bases.keys)
     if not keys:
         return None
-    target_labs = _labs_under_all(target_color.R)
     rng = np.random.default_rng(seed)
+    budget = _Budget(deadline_ms)
 
-    fracs, _ = _best_for_subset(target_labs, bases, keys, rng, light=len(keys) > 6)
+    fracs, cost = _solve_one(target_labs, bases, keys, rng, backend, light=len(keys) > 6, budget=budget)
+    amounts = {keys[i]: float(fracs[i]) for i in range(len(keys)) if fracs[i] > 1e-6}
     eff = [keys[i] for i in range(len(keys)) if fracs[i] >= significance]
     if not eff:
         eff = [keys[int(np.argmax(fracs))]]
-    if len(eff) < len(keys):                      # tighten on the pigments that matter
-        fracs2, _ = _best_for_subset(target_labs, bases, eff, rng)
-        amounts = {eff[i]: float(fracs2[i]) for i in range(len(eff)) if fracs2[i] > 1e-6}
-    else:
-        amounts = {keys[i]: float(fracs[i]) for i in range(len(keys)) if fracs[i] > 1e-6}
+    subsets, solved = (2 if len(eff) < len(keys) else 1), 1
+    if subsets == 2 and not budget.expired():     # tighten on the pigments that matter
+        # Started from the first pass's own recipe (minus the dropped pigments) as well as
+        # the usual starts, and kept only if dropping them costs at most CLEANUP_TOLERANCE:
+        # a 2 % black can carry the whole match, and re-solving without it from scratch
+        # used to land far from the first pass's optimum.
+        start = np.array([fracs[keys.index(k)] for k in eff])
+        fracs2, cost2 = _solve_one(target_labs, bases, eff, rng, backend, light=True, budget=budget,
+                                   seed=start / start.sum())
+        solved = 2
+        if cost2 <= cost + CLEANUP_TOLERANCE:
+            amounts = {eff[i]: float(fracs2[i]) for i in range(len(eff)) if fracs2[i] > 1e-6}
 
     total = sum(amounts.values()) or 1.0
     amounts = {k: v / total for k, v in amounts.items()}
     result = _recipe_result(bases, list(amounts.keys()), amounts, target_labs)
     result['reachability'] = _reachability(result['delta_e'])
+    result['search'] = {'subsets': subsets, 'solved': solved, 'pruned': 0}
+    result['truncated'] = budget.truncated
     return result
@@ -0,0 +1,164 @@
+"""Spectrophotometer exports → reflectance curves on the engine grid (/reverse_engineer and
+scripts/reverse_engineer_batch.py).
+
+A measurement file is a CSV in one of four layouts (headers matched case-insensitively):
+
+  single    Wavelength, Reflectance                   — one curve (the original upload format)
+  long      Sample|ID|Name, Wavelength, Reflectance   — one row per (sample, wavelength),
+                                                        rows grouped by sample
+  columns   Wavelength, <sample 1>, <sample 2>, …     — one column per sample
+  rows      [Sample|ID|Name,] 380, 390nm, R400, …     — one row per sample, one column per
+                                                        wavelength (the usual multi-sample export)
+
+The file is read in pandas chunks, so a file with hundreds of samples is never held as
+one DataFrame: `rows` and `long` files yield their samples as the chunks arrive, a
+`columns` file (every sample spans the whole file) once it has been read. Each yielded
+batch is resampled onto the 38-bin grid with one vectorised resample_to_grid call.
+Reflectance in percent (any value > 1.5) is scaled to 0–1 per sample.
+
+Public API:
+  open_spectra(f)   -> (layout, iterator of (ids, R (n, 38)) chunks)
+  SpectrumFileError    an unreadable upload (bad header, malformed sample); a ValueError
+"""
+import itertools
+import re
+
+import numpy as np
+import pandas as pd
+
+from . import spectral_km as E
+
+CHUNK_ROWS = 256          # CSV rows parsed per pandas chunk
+_ID_COLUMNS = ('sample', 'id', 'name', 'sample_id', 'sample name')
+# '380', '380nm', '380 nm', 'R380', 'nm380', '380.0' — a wavelength column of a `rows` file.
+_WAVELENGTH_COLUMN = re.compile(r'^(?:r|nm|wl)?\s*(\d{3}(?:\.\d+)?)\s*(?:nm)?$', re.IGNORECASE)
+_READ_ERRORS = (pd.errors.EmptyDataError, pd.errors.ParserError, UnicodeDecodeError)
+
+
+class SpectrumFileError(ValueError):
+    """The upload itself is at fault — unreadable CSV, unrecognised header, a malformed
+    sample, too many samples — as opposed to a failure solving what it contains."""
+
+
+def open_spectra(f, chunk_rows=CHUNK_ROWS):
+    """Detect the layout of spectrum CSV `f` (a path or file object) from its header.
+    Returns (layout, chunks) where chunks yields (ids, R (n, 38)) in file order. Raises
+    SpectrumFileError for an empty file or an unrecognised header; a malformed sample (or
+    a later chunk pandas cannot parse) raises SpectrumFileError while the chunks are consumed."""
+    try:
+        reader = pd.read_csv(f, chunksize=chunk_rows)
+        first = next(reader, None)
+    except _READ_ERRORS as e:
+        raise SpectrumFileError(f'Could not read the spectrum file: {e}') from None
+    if first is None or first.empty:
+        raise SpectrumFileError('Spectrum file is empty')
+    frames = itertools.chain([first], _rest(reader))
+    columns = {str(c).strip().lower(): c for c in first.columns}
+    id_col = next((columns[c] for c in _ID_COLUMNS if c in columns), None)
+
+    if 'wavelength' in columns and 'reflectance' in columns:
+        wl, refl = columns['wavelength'], columns['reflectance']
+        if id_col is None:
+            return 'single', _single(frames, wl, refl)
+        return 'long', _long(frames, id_col, wl, refl)
+    if 'wavelength' in columns:
+        samples = [c for c in first.columns if c != columns['wavelength']]
+        if not samples:
+            raise SpectrumFileError('Spectrum file has a Wavelength column but no sample columns')
+        return 'columns', _by_column(frames, columns['wavelength'], samples)
+    wl_cols = {c: float(m.group(1)) for c in first.columns
+               if (m := _WAVELENGTH_COLUMN.match(str(c).strip())) and 300 <= float(m.group(1)) <= 1100}
+    if len(wl_cols) >= 2:
+        if id_col is None:
+            id_col = next((c for c in first.columns if c not in wl_cols), None)
+        return 'rows', _by_row(frames, id_col, wl_cols)
+    raise SpectrumFileError('File must have Wavelength and Reflectance columns, a Wavelength column '
+                     'plus one column per sample, or one row per sample with a column per wavelength')
+
+
+def _rest(reader):
+    """The remaining chunks of `reader`, with pandas' parse errors as SpectrumFileError."""
+    try:
+        yield from reader
+    except _READ_ERRORS as e:
+        raise SpectrumFileError(f'Could not read the spectrum file: {e}') from None
+
+
+def _to_grid(ids, wavelengths, values):
+    """(ids, R (n, 38)) from curves `values` (n, W) sampled at `wavelengths` (W,)."""
+    wavelengths = np.asarray(wavelengths, dtype=float)
+    values = np.asarray(values, dtype=float).reshape(len(ids), -1)
+    bad = ~np.isfinite(values).all(axis=1)
+    if bad.any():
+        raise SpectrumFileError(f'sample {ids[int(np.argmax(bad))]!r}: missing or non-numeric reflectance values')
+    order = np.argsort(wavelengths)
+    values = values[:, order]
+    percent = values.max(axis=1) > 1.5          # 0–100 % exports → 0–1
+    values[percent] /= 100.0
+    return list(ids), E.resample_to_grid(wavelengths[order], values)
+
+
+def _numeric(frame):
+    return frame.apply(pd.to_numeric, errors='coerce')
+
+
+def _single(frames, wl, refl):
+    frame = pd.concat(list(frames), ignore_index=True)
+    frame = _numeric(frame[[wl, refl]]).dropna()
+    if frame.empty:
+        raise SpectrumFileError('Spectrum file is empty')
+    yield _to_grid([0], frame[wl].values, frame[refl].values[None])
+
+
+def _long(frames, id_col, wl, refl):
+    """Samples of a long file, each yielded (alongside any others completed in the same
+    chunk) once the rows move on to the next sample."""
+    done, current, parts = set(), None, []
+    ready_ids, ready = [], []
+
+    def finish():
+        frame = pd.concat(parts, ignore_index=True)
+        ids, R = _to_grid([current], frame[wl].values, frame[refl].values[None])
+        done.add(current)
+        ready_ids.extend(ids)
+        ready.append(R)
+
+    for frame in frames:
+        frame = frame[[id_col, wl, refl]].copy()
+        frame[[wl, refl]] = _numeric(frame[[wl, refl]])
+        frame = frame.dropna(subset=[wl])
+        for sample, rows in frame.groupby(frame[id_col].ne(frame[id_col].shift()).cumsum(), sort=False):
+            sample_id = rows[id_col].iloc[0]
+            sample_id = sample_id.item() if hasattr(sample_id, 'item') else sample_id
+            if sample_id != current:
+                if current is not None:
+                    finish()
+                if sample_id in done:
+                    raise SpectrumFileError(f'sample {sample_id!r}: long-format rows must be grouped by sample')
+                current, parts = sample_id, []
+            parts.append(rows)
+        if ready:
+            yield ready_ids, np.vstack(ready)
+            ready_ids, ready = [], []
+    if current is not None:
+        finish()
+        yield ready_ids, np.vstack(ready)
+
+
+def _by_column(frames, wl, samples):
+    frame = _numeric(pd.concat(list(frames), ignore_index=True)[[wl, *samples]])
+    frame = frame.dropna(subset=[wl])
+    yield _to_grid(samples, frame[wl].values, frame[samples].values.T)
+
+
+def _by_row(frames, id_col, wl_cols):
+    cols = list(wl_cols)
+    wavelengths = [wl_cols[c] for c in cols]
+    offset = 0
+    for frame in frames:
+        if id_col is not None:
+            ids = [v.item() if hasattr(v, 'item') else v for v in frame[id_col]]
+        else:
+            ids = list(range(offset, offset + len(frame)))
+        offset += len(frame)
+        yield _to_grid(ids, wavelengths, _numeric(frame[cols]).values)
@@ -17,6 +17,11 @@ workers = int(os.environ.get("WEB_CONCURRENCY", "1"))
 threads = int(os.environ.get("GUNICORN_THREADS", "4"))
 worker_class = "gthread"
 
+# /spectral solver pools (app.spectral_km SPECTRAL_SUBSET_WORKERS for the exhaustive
+# subset search, app.routes SPECTRAL_SOLVE_WORKERS for bulk solves) and the Gamut Lab
+# candidate-scoring pool (app.gamut_lab GAMUT_WORKERS) each add processes with their own
+# numpy/scipy stack — all three default to serial (1); keep them there on the 512 MB plan.
+
 # Recycle the worker after N requests (+ jitter) to release leaked memory.
 max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", "200"))
 max_requests_jitter = int(os.environ.get("GUNICORN_MAX_REQUESTS_JITTER", "50"))
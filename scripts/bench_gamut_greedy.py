@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Lazy (CELF) vs exhaustive gamut_lab.greedy: do they pick the same palettes, how many
+hull-volume evaluations does lazy save, and how much faster is it.
+
+Runs both modes over a fixed set of searches — whole-library sizes 6–24, a locked start,
+and seeded random sub-pools — and prints per search whether the palettes (the picked
+sets) and the pick sequences match, the two total volumes, evaluations performed /
+exhaustive and the wall time of each. Exits 1 if lazy picks differently from exhaustive
+anywhere — a different sequence is a different palette for some smaller size, since a
+size-k search returns the first k picks — or ends on a smaller volume (beyond --tol):
+the gate for keeping it as the /gamut/optimize default.
+
+Usage:
+    PYTHONPATH=. python3 scripts/bench_gamut_greedy.py [--pools 6] [--seed 0] [--tol 0.05]
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+
+
+def searches(P, pools, seed):
+    out = [{'size': size} for size in (6, 8, 10, 12, 14, 16, 20, 24)]
+    out.append({'size': 10, 'locked': ['white', '41000']})
+    rng = np.random.default_rng(seed)
+    for _ in range(pools):
+        pool = rng.choice(len(P), size=int(rng.integers(60, 200)), replace=False)
+        out.append({'size': int(rng.integers(6, 17)), 'pool': [str(P[i]['pnumber']) for i in sorted(pool)]})
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--pools', type=int, default=6, help='random sub-pool searches')
+    ap.add_argument('--seed', type=int, default=0)
+    ap.add_argument('--tol', type=float, default=0.05, help='allowed volume shortfall of lazy')
+    args = ap.parse_args()
+
+    from app import gamut_lab
+
+    P = gamut_lab._load()['P']
+    print(f'{"search":22} {"set":>4} {"seq":>4} {"exhaustive":>11} {"lazy":>11} {"evals":>11} '
+          f'{"t_exh":>6} {"t_lazy":>6}')
+    misses, differ, saved, total, t_exh, t_lazy = 0, 0, 0, 0, 0.0, 0.0
+    for s in searches(P, args.pools, args.seed):
+        t0 = time.perf_counter()
+        ex = gamut_lab.greedy(**s)
+        t1 = time.perf_counter()
+        lz = gamut_lab.greedy(lazy=True, **s)
+        t2 = time.perf_counter()
+        ex_seq, lz_seq = [r['pnumber'] for r in ex['sequence']], [r['pnumber'] for r in lz['sequence']]
+        same_set, same_seq = sorted(map(str, ex_seq)) == sorted(map(str, lz_seq)), ex_seq == lz_seq
+        ev = lz['evaluations']
+        label = f"size {s['size']}" + (f", pool {len(s['pool'])}" if 'pool' in s else '') \
+            + (', locked' if 'locked' in s else '')
+        print(f"{label:22} {'yes' if same_set else 'NO':>4} {'yes' if same_seq else 'no':>4} "
+              f"{ex['total_volume']:11.1f} {lz['total_volume']:11.1f} "
+              f"{ev['performed']:5d}/{ev['exhaustive']:<5d} {t1 - t0:6.2f} {t2 - t1:6.2f}")
+        misses += lz['total_volume'] < ex['total_volume'] - args.tol
+        differ += not same_seq
+        saved, total = saved + ev['saved'], total + ev['exhaustive']
+        t_exh, t_lazy = t_exh + t1 - t0, t_lazy + t2 - t1
+    print(f'lazy saved {saved}/{total} volume evaluations ({saved / total:.0%}), '
+          f'{t_exh:.1f}s → {t_lazy:.1f}s; {differ} different pick sequence(s), {misses} smaller')
+    if misses or differ:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
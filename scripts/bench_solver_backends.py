@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Compare the spectral solver backends — multi-start L-BFGS-B ('lbfgsb', the default)
+against the population-based differential evolution ('de') — on wall time and match.
+
+Targets: the Xiao skin means (gamut_lab.skin_targets) and the gamut target catalog
+(artifacts/gamut_targets/gamut_targets.csv), reconstructed to reflectance exactly as the
+/spectral client does. Every (target set × palette × solver) is solved with both
+backends, uncached; the table reports mean seconds per solve, mean/median headline ΔE
+(D65, the continuous best option for solve_recipe) and how often 'de' is worse / better
+than L-BFGS-B by more than 0.05 ΔE.
+
+Usage:
+    PYTHONPATH=. python3 scripts/bench_solver_backends.py [--palettes classic,16]
+        [--solvers mix,recipe] [--limit 40] [--json out.json]
+"""
+import argparse
+import contextlib
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+REPO = Path(__file__).resolve().parents[1]
+CATALOG = REPO / 'artifacts' / 'gamut_targets' / 'gamut_targets.csv'
+
+
+def target_sets(limit):
+    from app import gamut_lab, spectral_km as E
+    skin = [t['rgb'] for t in gamut_lab.skin_targets()]
+    catalog = pd.read_csv(CATALOG)[['R', 'G', 'B']].astype(int).values.tolist()
+    if limit and len(catalog) > limit:    # an even spread over the catalog, not its head
+        catalog = [catalog[i] for i in np.linspace(0, len(catalog) - 1, limit).astype(int)]
+    return {name: [E.SpectralColor(E.srgb_to_reflectance(rgb)) for rgb in rgbs]
+            for name, rgbs in (('skin', skin[:limit] if limit else skin), ('catalog', catalog))}
+
+
+def headline_de(solver, result):
+    if solver == 'mix':
+        return result['delta_e']
+    return min(o['continuous']['delta_e'] for o in result['options'])
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--palettes', default='classic,16', help='/spectral palette ids')
+    ap.add_argument('--solvers', default='mix,recipe')
+    ap.add_argument('--limit', type=int, default=40, help='targets per set (0 = all)')
+    ap.add_argument('--json', default=None, help='also write the rows to this file')
+    args = ap.parse_args()
+
+    from app import create_app, spectral_km as E
+    from app.routes import compiled_spectral_palette
+
+    with contextlib.redirect_stdout(sys.stderr):     # create_app() prints its folders
+        app = create_app()
+    with app.app_context():
+        palettes = {pid: compiled_spectral_palette(pid) for pid in args.palettes.split(',')}
+    sets = target_sets(args.limit)
+    solve = {'mix': E.solve_mix, 'recipe': E.solve_recipe}
+
+    rows = []
+    for set_name, targets in sets.items():
+        for pid, palette in palettes.items():
+            for solver in args.solvers.split(','):
+                des, secs = {}, {}
+                for backend in E.BACKENDS:
+                    t0 = time.perf_counter()
+                    des[backend] = np.array([headline_de(solver, solve[solver](t, palette, backend=backend))
+                                             for t in targets])
+                    secs[backend] = (time.perf_counter() - t0) / len(targets)
+                diff = des['de'] - des['lbfgsb']
+                for backend in E.BACKENDS:
+                    rows.append({
+                        'targets': set_name, 'n': len(targets), 'palette': pid, 'solver': solver,
+                        'backend': backend, 'sec_per_solve': round(secs[backend], 4),
+                        'mean_de': round(float(des[backend].mean()), 3),
+                        'median_de': round(float(np.median(des[backend])), 3),
+                        'de_worse': int((diff > 0.05).sum()) if backend == 'de' else None,
+                        'de_better': int((diff < -0.05).sum()) if backend == 'de' else None,
+                    })
+                print(f'{set_name}/{pid}/{solver} done', file=sys.stderr)
+
+    df = pd.DataFrame(rows)
+    print(df.to_string(index=False))
+    if args.json:
+        Path(args.json).write_text(json.dumps(rows, indent=1))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""Benchmark + regression gate for the spectral engine: solves/sec, p50/p95 latency and
+achieved ΔE of solve_mix, solve_recipe and _round_recipe over fixed target sets.
+
+Target sets (deterministic, so two runs solve exactly the same colours):
+  skin      the Xiao skin means (gamut_lab.skin_targets), evenly sampled
+  catalog   an even spread over the gamut target catalog (artifacts/gamut_targets)
+  mixes     random 2–3-pigment mixes of the palette itself (seeded) — in gamut by
+            construction, so their ΔE should sit near 0
+each reconstructed to reflectance exactly as the /spectral client does.
+
+Cases, each timed per target (fastest of --repeat solves), uncached:
+  solve_mix     ΔE = headline D65 ΔE
+  solve_recipe  ΔE = best continuous option (rounded_de: best rounded option)
+  round_recipe  _round_recipe on the solve_mix fractions (solved outside the timing)
+
+Writes one JSON document (rows sorted, stable keys) that diffs cleanly between commits.
+With --baseline it compares against an earlier run and exits 1 if any (palette, set, case)
+row regressed: p50 latency up by more than --latency-tol (relative) or mean ΔE up by more
+than --de-tol (absolute). artifacts/spectral_bench/baseline.json is the committed
+reference run (1 CPU, see its meta); refresh it with --json when a change is meant to move
+the numbers.
+
+Usage:
+    PYTHONPATH=. python3 scripts/bench_spectral.py [--palettes classic] [--per-set 6]
+        [--repeat 3] [--backend lbfgsb|de] [--json out.json]
+        [--baseline artifacts/spectral_bench/baseline.json] [--latency-tol 0.3] [--de-tol 0.05]
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+REPO = Path(__file__).resolve().parents[1]
+CATALOG = REPO / 'artifacts' / 'gamut_targets' / 'gamut_targets.csv'
+CASES = ('solve_mix', 'solve_recipe', 'round_recipe')
+
+
+def spread(items, n):
+    """n items evenly spaced over `items` (all of them if n is 0 or covers the list)."""
+    if not n or len(items) <= n:
+        return list(items)
+    return [items[i] for i in np.linspace(0, len(items) - 1, n).astype(int)]
+
+
+def target_sets(palette, per_set, seed=0):
+    from app import gamut_lab, spectral_km as E
+    skin = spread([t['rgb'] for t in gamut_lab.skin_targets()], per_set)
+    catalog = spread(pd.read_csv(CATALOG)[['R', 'G', 'B']].astype(int).values.tolist(), per_set)
+    rng = np.random.default_rng(seed)
+    mixes = []
+    for _ in range(per_set or 12):
+        keys = rng.choice(palette.keys, size=min(len(palette), int(rng.integers(2, 4))), replace=False)
+        amounts = dict(zip(keys, rng.random(len(keys)) + 0.1))
+        mixes.append(E.mix_amounts(palette, amounts).R)
+    return {
+        'skin': [E.srgb_to_reflectance(rgb) for rgb in skin],
+        'catalog': [E.srgb_to_reflectance(rgb) for rgb in catalog],
+        'mixes': mixes,
+    }
+
+
+def run_case(case, palette, curves, backend, repeat=3):
+    """(latencies in s, ΔEs, extra columns) for one case over one target set. Each target
+    is solved `repeat` times and its fastest time kept (the others are host noise); one
+    untimed solve first takes the lazy set-up (recipe atlas, pools) out of the numbers."""
+    from app import spectral_km as E
+    lat, des, rounded = [], [], []
+    for j, R in enumerate(curves):
+        target = E.SpectralColor(R)
+        if case == 'round_recipe':
+            mix = E.solve_mix(target, palette, backend=backend)
+            keys = list(mix['amounts'])
+            fractions = [mix['amounts'][k] for k in keys]
+            labs = E.prepare_reference(E._labs_under_all(target.R))
+            solve = lambda: E._round_recipe(palette, keys, fractions, labs)   # noqa: E731
+        elif case == 'solve_mix':
+            solve = lambda: E.solve_mix(target, palette, backend=backend)    # noqa: E731
+        else:
+            solve = lambda: E.solve_recipe(target, palette, backend=backend)  # noqa: E731
+        if j == 0:
+            solve()
+        times = []
+        for _ in range(max(1, repeat)):
+            t0 = time.perf_counter()
+            res = solve()
+            times.append(time.perf_counter() - t0)
+        lat.append(min(times))
+        if case == 'solve_recipe':
+            des.append(min(o['continuous']['delta_e'] for o in res['options']))
+            rounded.append(min(o['rounded']['delta_e'] for o in res['options']))
+        else:
+            des.append(res['delta_e'])
+    extra = {'rounded_de': round(float(np.mean(rounded)), 4)} if rounded else {}
+    return np.array(lat), np.array(des), extra
+
+
+def compare(rows, baseline, latency_tol, de_tol):
+    """Rows of `rows` that regressed against `baseline` (a previous run's JSON)."""
+    base = {(r['palette'], r['set'], r['case']): r for r in baseline['results']}
+    out = []
+    for r in rows:
+        b = base.get((r['palette'], r['set'], r['case']))
+        if b is None:
+            continue
+        reasons = []
+        if r['p50_ms'] > b['p50_ms'] * (1 + latency_tol):
+            reasons.append(f"p50 {b['p50_ms']:.1f} → {r['p50_ms']:.1f} ms")
+        if r['mean_de'] > b['mean_de'] + de_tol:
+            reasons.append(f"mean ΔE {b['mean_de']:.3f} → {r['mean_de']:.3f}")
+        if reasons:
+            out.append(f"{r['palette']}/{r['set']}/{r['case']}: " + ', '.join(reasons))
+    return out
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--palettes', default='classic', help='/spectral palette ids')
+    ap.add_argument('--cases', default=','.join(CASES))
+    ap.add_argument('--per-set', type=int, default=6, help='targets per set (0 = all skin/catalog)')
+    ap.add_argument('--repeat', type=int, default=3, help='timed solves per target (fastest kept)')
+    ap.add_argument('--backend', default='lbfgsb', choices=['lbfgsb', 'de'])
+    ap.add_argument('--json', default=None, help='write the run to this file')
+    ap.add_argument('--baseline', default=None, help='previous run to gate against')
+    ap.add_argument('--latency-tol', type=float, default=0.3, help='allowed relative p50 increase')
+    ap.add_argument('--de-tol', type=float, default=0.05, help='allowed absolute mean ΔE increase')
+    args = ap.parse_args()
+
+    from app import create_app, spectral_km as E
+    from app.routes import compiled_spectral_palette
+
+    with contextlib.redirect_stdout(sys.stderr):     # create_app() prints its folders
+        app = create_app()
+    with app.app_context():
+        palettes = {pid: compiled_spectral_palette(pid) for pid in args.palettes.split(',')}
+
+    rows = []
+    for pid, palette in palettes.items():
+        for set_name, curves in target_sets(palette, args.per_set).items():
+            for case in args.cases.split(','):
+                lat, des, extra = run_case(case, palette, curves, args.backend, args.repeat)
+                rows.append({
+                    'palette': pid, 'set': set_name, 'case': case, 'n': len(lat),
+                    'solves_per_sec': round(float(len(lat) / lat.sum()), 3),
+                    'p50_ms': round(float(np.percentile(lat, 50)) * 1e3, 2),
+                    'p95_ms': round(float(np.percentile(lat, 95)) * 1e3, 2),
+                    'mean_de': round(float(des.mean()), 4),
+                    'max_de': round(float(des.max()), 4),
+                    **extra,
+                })
+                print(f'{pid}/{set_name}/{case} done', file=sys.stderr)
+    rows.sort(key=lambda r: (r['palette'], r['set'], CASES.index(r['case'])))
+
+    doc = {
+        'meta': {
+            'commit': git_commit(), 'solver_version': E.SOLVER_VERSION,
+            'illuminants': list(E.ILLUMINANTS), 'backend': args.backend, 'per_set': args.per_set,
+            'repeat': args.repeat,
+            'python': platform.python_version(), 'numpy': np.__version__,
+            'cpus': os.cpu_count(), 'machine': platform.machine(),
+        },
+        'results': rows,
+    }
+    print(pd.DataFrame(rows).to_string(index=False))
+    if args.json:
+        Path(args.json).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.json).write_text(json.dumps(doc, indent=1, sort_keys=True) + '\n')
+
+    if args.baseline:
+        regressions = compare(rows, json.loads(Path(args.baseline).read_text()),
+                              args.latency_tol, args.de_tol)
+        for line in regressions:
+            print(f'REGRESSION {line}', file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print(f'no regressions against {args.baseline}', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
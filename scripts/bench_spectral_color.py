@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Microbenchmark: what one objective evaluation of _best_for_subset allocates and costs.
+
+Three ways of scoring a candidate recipe of a pigment subset against a target:
+
+  eager   mix → a SpectralColor that computes XYZ / K/S / luminance in __init__ (the
+          pre-__slots__ class, reproduced below) → ΔE2000 under every illuminant
+  lazy    the same through today's SpectralColor (__slots__, derived fields on demand)
+  solver  what _best_for_subset actually evaluates: _cost_and_grad on the compiled
+          palette's arrays — cost and exact gradient, no colour object at all
+
+For each: µs per evaluation and the transient memory one evaluation peaks at
+(tracemalloc), over the same random recipes. Also reports how many evaluations a real
+_best_for_subset call makes, and the bytes of a retained SpectralColor eager vs lazy.
+
+Usage:
+    PYTHONPATH=. python3 scripts/bench_spectral_color.py [--palette classic] [--evals 2000]
+"""
+import argparse
+import contextlib
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--palette', default='classic', help='/spectral palette id')
+    ap.add_argument('--evals', type=int, default=2000, help='objective evaluations per variant')
+    args = ap.parse_args()
+
+    from app import create_app, spectral_km as E
+    from app.routes import compiled_spectral_palette
+
+    class EagerSpectralColor:
+        """SpectralColor as it was: every derived field computed at construction."""
+
+        def __init__(self, R, tinting=1.0):
+            self.R = np.clip(np.asarray(R, dtype=float), 1e-4, 1.0)
+            self.tinting = tinting
+            self.XYZ = E.CMF @ self.R
+            self.KS = E.ks(self.R)
+            self.luminance = max(E.EPS, float(self.XYZ[1]))
+
+    with contextlib.redirect_stdout(sys.stderr):     # create_app() prints its folders
+        app = create_app()
+    with app.app_context():
+        palette = compiled_spectral_palette(args.palette)
+    keys = palette.keys[:3]
+    sub = palette.subset(keys)
+    target = E.SpectralColor(E.srgb_to_reflectance([150, 110, 90]))
+    target_labs = E.prepare_reference(E._labs_under_all(target.R))
+    ys = np.random.default_rng(0).random((args.evals, len(keys)))
+
+    def via_color(cls):
+        def objective(y):
+            color = cls(E.mix_batch(sub, np.sqrt(y)[None])[0])
+            return E._metameric_costs(E.ciede2000(target_labs, E._labs_under_all(color.R)))
+        return objective
+
+    variants = {
+        'eager': via_color(EagerSpectralColor),
+        'lazy': via_color(E.SpectralColor),
+        'solver': lambda y: E._cost_and_grad(sub, target_labs, y, squared=True),   # + gradient
+    }
+
+    print(f'palette {args.palette}, subset {keys}, {args.evals} evaluations each')
+    print(f'{"variant":8} {"us/eval":>9} {"peak bytes/eval":>16}')
+    for name, objective in variants.items():
+        objective(ys[0])
+        t0 = time.perf_counter()
+        for y in ys:
+            objective(y)
+        us = (time.perf_counter() - t0) / len(ys) * 1e6
+        tracemalloc.start()
+        peaks = []
+        for y in ys[:200]:
+            base = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            objective(y)
+            peaks.append(tracemalloc.get_traced_memory()[1] - base)
+        tracemalloc.stop()
+        print(f'{name:8} {us:9.1f} {int(np.mean(peaks)):16d}')
+
+    calls = 0
+
+    def counting(palette_, target_, x, squared=False, _inner=E._cost_and_grad):
+        nonlocal calls
+        calls += 1
+        return _inner(palette_, target_, x, squared)
+
+    E._cost_and_grad, inner = counting, E._cost_and_grad
+    try:
+        E._best_for_subset(target_labs, palette, keys, np.random.default_rng(0))
+    finally:
+        E._cost_and_grad = inner
+    print(f'_best_for_subset({len(keys)} pigments): {calls} objective evaluations')
+
+    R = E.srgb_to_reflectance(np.random.default_rng(1).integers(0, 256, (2000, 3)))
+    for name, cls in (('eager', EagerSpectralColor), ('lazy', E.SpectralColor)):
+        tracemalloc.start()
+        kept = [cls(r) for r in R]
+        size = tracemalloc.get_traced_memory()[0] / len(kept)
+        tracemalloc.stop()
+        t0 = time.perf_counter()
+        for r in R:
+            cls(r).R
+        us = (time.perf_counter() - t0) / len(R) * 1e6
+        print(f'retained {name} SpectralColor: {size:.0f} bytes, {us:.2f} us to build and read R')
+
+
+if __name__ == '__main__':
+    main()
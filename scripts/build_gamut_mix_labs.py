@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""Build the Gamut Lab mix-Lab table (app.gamut_lab): the CIELAB of every pure pigment and
+every pairwise mix at the _RATIOS steps over the whole pigment library, as
+app/data/gamut_mix_labs.npy (+ gamut_mix_labs.json with the library checksum). Run at
+deploy time (render.yaml buildCommand) and whenever app/data/pigments_library.json
+changes; a missing or stale table still works, it is just rebuilt in memory on first use
+in every worker.
+
+Usage:
+    PYTHONPATH=. python3 scripts/build_gamut_mix_labs.py [--out app/data/gamut_mix_labs.npy]
+"""
+import argparse
+import time
+
+
+def main():
+    from app import gamut_lab
+
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--out', default=gamut_lab.MIX_LABS_PATH, help='.npy path (meta JSON is written beside it)')
+    args = ap.parse_args()
+
+    t0 = time.time()
+    table = gamut_lab.save_mix_labs(args.out)
+    print(f'{table.shape[0]} pigments, table {table.shape} ({table.nbytes / 2**20:.1f} MiB) '
+          f'→ {args.out} ({time.time() - t0:.1f}s)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""Build the binary companion of the pigment library (app.gamut_lab): R, KS and masstone
+Lab of app/data/pigments_library.json as .npy files plus a meta.json (per-pigment
+metadata, the JSON's sha256 and the format version) in app/data/pigments_library/.
+Run at deploy time (render.yaml buildCommand) and whenever the JSON changes; a missing or
+stale companion still works, the JSON is just parsed again in every worker.
+
+Usage:
+    PYTHONPATH=. python3 scripts/build_pigment_library_bin.py [--out app/data/pigments_library]
+"""
+import argparse
+import time
+
+
+def main():
+    from app import gamut_lab
+
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--out', default=gamut_lab.LIBRARY_BIN_DIR, help='output directory')
+    args = ap.parse_args()
+
+    t0 = time.time()
+    n = gamut_lab.save_library_bin(args.out)
+    print(f'{n} pigments → {args.out} ({time.time() - t0:.2f}s)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""Build the recipe atlases (app.recipe_atlas) for every /spectral palette small enough to
+tabulate — 'classic', 'measured' (the /reverse_engineer bases) and the ≤5-pigment gamut
+sets — into app/data/recipe_atlas/<palette fingerprint>/. Run at deploy time (render.yaml
+buildCommand); a palette whose artifact is missing or stale still works, it just builds an
+in-memory atlas on first use in every worker.
+
+Usage:
+    PYTHONPATH=. python3 scripts/build_recipe_atlas.py [--max-total 20] [palette ...]
+"""
+import argparse
+import contextlib
+import sys
+import time
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('palettes', nargs='*', help='palette ids (default: every one with an atlas)')
+    ap.add_argument('--max-total', type=int, default=None, help='drops per recipe (default: recipe_atlas.MAX_TOTAL)')
+    args = ap.parse_args()
+
+    from app import create_app, recipe_atlas
+    from app.routes import build_spectral_palettes, compiled_spectral_palette
+
+    with contextlib.redirect_stdout(sys.stderr):     # create_app() prints its folders
+        app = create_app()
+    with app.app_context():
+        ids = args.palettes or ['measured', *build_spectral_palettes()['palettes']]
+        palettes = {pid: compiled_spectral_palette(pid) for pid in ids}
+
+    for pid, palette in palettes.items():
+        if palette is None or len(palette) > recipe_atlas.MAX_PIGMENTS:
+            print(f'{pid}: skipped ({len(palette) if palette else 0} pigments)')
+            continue
+        t0 = time.time()
+        atlas = recipe_atlas.RecipeAtlas.build(palette, max_total=args.max_total or recipe_atlas.MAX_TOTAL,
+                                               keep_R=True)
+        out = recipe_atlas.atlas_dir(palette)
+        atlas.save(out)
+        print(f'{pid}: {len(atlas)} recipes over {len(palette)} pigments → {out} ({time.time() - t0:.1f}s)')
+
+
+if __name__ == '__main__':
+    main()
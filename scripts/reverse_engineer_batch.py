@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""Recipes for every sample of a spectrophotometer export — the CLI twin of a multi-sample
+POST /reverse_engineer (same parser, palette, solver and NDJSON lines).
+
+Accepts the layouts of app.spectrum_files: Wavelength,Reflectance (one curve); long
+(Sample, Wavelength, Reflectance); one column per sample next to a Wavelength column; or
+one row per sample with a column per wavelength (380, 390nm, R400, …). The file is parsed
+in chunks and each chunk goes to the solve pool as soon as it is read.
+
+Usage:
+    PYTHONPATH=. python3 scripts/reverse_engineer_batch.py export.csv [--palette measured]
+        [--workers 2] [--backend lbfgsb|de] > recipes.ndjson
+"""
+import argparse
+import contextlib
+import json
+import sys
+import time
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('input', help='spectrum CSV')
+    ap.add_argument('--palette', default='measured', help='/spectral palette id')
+    ap.add_argument('--backend', default='lbfgsb', choices=['lbfgsb', 'de'], help='subset optimiser')
+    ap.add_argument('--workers', type=int, default=2, help='solver processes')
+    args = ap.parse_args()
+
+    from app import create_app, spectral_batch, spectral_km, spectrum_files
+    from app.routes import compiled_spectral_palette
+
+    with contextlib.redirect_stdout(sys.stderr):     # create_app() prints its folders
+        app = create_app()
+    with app.app_context():
+        palette = compiled_spectral_palette(args.palette)
+    if palette is None:
+        sys.exit(f'palette {args.palette!r} unavailable')
+    try:
+        layout, chunks = spectrum_files.open_spectra(args.input)
+    except ValueError as e:
+        sys.exit(str(e))
+    print(f'{args.input}: {layout} layout', file=sys.stderr)
+
+    ids, curves = [], []
+
+    def parsed():
+        for chunk_ids, chunk_R in chunks:
+            ids.extend(chunk_ids)
+            curves.extend(chunk_R)
+            yield chunk_R
+
+    t0 = time.time()
+    for n, (i, res) in enumerate(spectral_batch.solve_stream(
+            palette, parsed(), kind='recipe', workers=args.workers, backend=args.backend), start=1):
+        res['target_rgb'] = spectral_km.SpectralColor(curves[i]).sRGB
+        print(json.dumps({'index': i, 'id': ids[i], 'result': res}), flush=True)
+        print(f'{n}/{len(ids)} solved ({time.time() - t0:.1f}s)', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Solve recipes for a whole target set with one /spectral palette — the CLI twin of
+POST /spectral/solve_batch (same engine, cache kinds and NDJSON lines).
+
+Input is a CSV with either R,G,B columns (8-bit sRGB, reconstructed to a reflectance
+curve exactly as the /spectral client does) or 38 reflectance columns (380–750 nm),
+plus an optional id/name column; or a JSON list in the endpoint's `targets` format.
+Defaults to the gamut target set (artifacts/gamut_targets/gamut_targets.csv).
+
+Usage:
+    PYTHONPATH=. python3 scripts/solve_batch.py [--palette 8] [--solver mix|recipe]
+        [--backend lbfgsb|de] [--workers 4] [--limit N] [input.csv|input.json] > recipes.ndjson
+"""
+import argparse
+import contextlib
+import json
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+REPO = Path(__file__).resolve().parents[1]
+DEFAULT_INPUT = REPO / 'artifacts' / 'gamut_targets' / 'gamut_targets.csv'
+
+
+def read_targets(path):
+    """Targets in the /spectral/solve_batch `targets` format."""
+    if path.suffix == '.json':
+        return json.loads(path.read_text())
+    df = pd.read_csv(path)
+    id_col = next((c for c in ('id', 'name') if c in df.columns), None)
+    ids = df[id_col].tolist() if id_col else list(range(len(df)))
+    if {'R', 'G', 'B'} <= set(df.columns):
+        rows = df[['R', 'G', 'B']].astype(int).values.tolist()
+        return [{'id': i, 'rgb': rgb} for i, rgb in zip(ids, rows)]
+    curve = df.drop(columns=[id_col] if id_col else []).select_dtypes('number')
+    return [{'id': i, 'R': r} for i, r in zip(ids, curve.values.tolist())]
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('input', nargs='?', default=str(DEFAULT_INPUT), help='CSV or JSON target list')
+    ap.add_argument('--palette', default='classic', help='/spectral palette id (classic, 5, 8, …)')
+    ap.add_argument('--solver', default='mix', choices=['mix', 'recipe'])
+    ap.add_argument('--backend', default='lbfgsb', choices=['lbfgsb', 'de'], help='subset optimiser')
+    ap.add_argument('--workers', type=int, default=2, help='solver processes')
+    ap.add_argument('--limit', type=int, default=None, help='only the first N targets')
+    args = ap.parse_args()
+
+    from app import create_app, spectral_batch
+    from app.routes import compiled_spectral_palette
+
+    targets = read_targets(Path(args.input))[:args.limit]
+    ids, targets_R = spectral_batch.parse_targets(targets)
+    with contextlib.redirect_stdout(sys.stderr):     # create_app() prints its folders
+        app = create_app()
+    with app.app_context():
+        palette = compiled_spectral_palette(args.palette)
+    if palette is None:
+        sys.exit(f'palette {args.palette!r} unavailable')
+
+    t0 = time.time()
+    for n, (i, res) in enumerate(spectral_batch.solve_batch(
+            palette, targets_R, kind=args.solver, workers=args.workers, backend=args.backend), start=1):
+        print(json.dumps({'index': i, 'id': ids[i], 'result': res}), flush=True)
+        print(f'{n}/{len(ids)} solved ({time.time() - t0:.1f}s)', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
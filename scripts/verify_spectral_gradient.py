@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Check the solver's analytic gradient (spectral_km._cost_and_grad) against central
+finite differences. Run with:
+
+  PYTHONPATH=. python3 scripts/verify_spectral_gradient.py
+
+It also runs in the render.yaml build (about a second), where a failing check exits 1 and
+fails the deploy, so a gradient that drifts from the cost it differentiates never ships.
+
+Covers: the ΔE2000 gradient w.r.t. the sample Lab (incl. near-neutral and hue-wrap
+pairs), the full metameric-cost gradient w.r.t. the subset fractions for the classic
+and the 16-pigment gamut palette, in both the plain and the squared-fraction
+parametrisation the solver searches in, and that the cost it returns is the same
+number _cost_batch scores.
+"""
+import json
+import os
+import sys
+
+import numpy as np
+
+from app import spectral_km as E
+
+CHECKS = []
+H = 1e-6
+TOL = 1e-5
+
+
+def check(name, cond, detail=''):
+    CHECKS.append((name, bool(cond), detail))
+    print(('✅' if cond else '❌'), name, ('— ' + str(detail)) if detail and not cond else '')
+
+
+def rel_err(g, fd):
+    return float(np.abs(g - fd).max() / max(1.0, np.abs(fd).max()))
+
+
+def palettes():
+    """The 5- and 16-pigment gamut palettes, straight from the shipped data files."""
+    data = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app', 'data')
+    lib = json.load(open(os.path.join(data, 'pigments_library.json')))
+    recs = json.load(open(os.path.join(data, 'palette_recommendations.json')))
+    by_pn = {str(p['pnumber']): p for p in lib['pigments']}
+    out = {}
+    for size in ('5', '16'):
+        bases = {}
+        for p in recs['palettes'][size]['pigments']:
+            src = by_pn[str(p['pnumber'])]
+            bases[p['role']] = E.SpectralColor(src['R'], tinting=src.get('tinting', 1.0))
+        out[size] = E.compile_palette(bases)
+    return out
+
+
+rng = np.random.default_rng(7)
+
+# ── ΔE2000 w.r.t. the sample Lab ────────────────────────────────────────────
+pairs = [
+    (np.array([50.0, 20.0, -10.0]), np.array([52.0, 18.0, -7.0])),
+    (np.array([60.0, 0.5, 0.3]), np.array([61.0, -0.4, 0.6])),       # near-neutral
+    (np.array([40.0, 30.0, -1.0]), np.array([41.0, 29.0, 1.5])),     # hue wrap at 0°/360°
+]
+pairs += [(l1, l1 + rng.normal(0, 4, 3)) for l1 in rng.normal([50, 0, 0], [15, 30, 30], (5, 3))]
+for i, (l1, l2) in enumerate(pairs):
+    de, g = E._ciede2000_grad(l1, l2)
+    fd = np.array([(E.ciede2000(l1, l2 + h) - E.ciede2000(l1, l2 - h)) / (2 * H)
+                   for h in np.eye(3) * H])
+    check(f'ΔE2000 value #{i}', abs(de - E.ciede2000(l1, l2)) < 1e-9)
+    check(f'ΔE2000 gradient #{i}', rel_err(g, fd) < TOL, rel_err(g, fd))
+
+# ── Metameric cost w.r.t. the subset fractions ──────────────────────────────
+for size, pal in palettes().items():
+    k = len(pal)
+    target = E._labs_under_all(E.mix_batch(pal, rng.random((1, k)))[0] * 0.97)
+    for trial in range(4):
+        x = rng.random(k) * (rng.random(k) > 0.3) + 1e-3
+        cost, g = E._cost_and_grad(pal, target, x)
+        f = lambda v: E._cost_batch(pal, target, v[None, :])[0]          # noqa: E731
+        fd = np.array([(f(x + h) - f(x - h)) / (2 * H) for h in np.eye(k) * H])
+        check(f'{size}-pigment cost value #{trial}', abs(cost - f(x)) < 1e-9)
+        check(f'{size}-pigment gradient #{trial}', rel_err(g, fd) < TOL, rel_err(g, fd))
+
+        y = rng.random(k) + 1e-3
+        _, gy = E._cost_and_grad(pal, target, y, squared=True)
+        fy = lambda v: f(np.sqrt(v))                                      # noqa: E731
+        fdy = np.array([(fy(y + h) - fy(y - h)) / (2 * H) for h in np.eye(k) * H])
+        check(f'{size}-pigment squared-space gradient #{trial}', rel_err(gy, fdy) < TOL,
+              rel_err(gy, fdy))
+
+failed = [c for c in CHECKS if not c[1]]
+print(f'\n{len(CHECKS) - len(failed)}/{len(CHECKS)} checks passed')
+sys.exit(1 if failed else 0)
@@ -36,6 +36,25 @@
     return r.json();
   }
 
+  // Calls `onLine` with each parsed line of an NDJSON response as it arrives.
+  async function readNDJSON(response, onLine) {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buf = '';
+    for (;;) {
+      const { value, done } = await reader.read();
+      if (done) break;
+      buf += decoder.decode(value, { stream: true });
+      let nl;
+      while ((nl = buf.indexOf('\n')) >= 0) {
+        const line = buf.slice(0, nl).trim();
+        buf = buf.slice(nl + 1);
+        if (line) onLine(JSON.parse(line));
+      }
+    }
+    if (buf.trim()) onLine(JSON.parse(buf));
+  }
+
   function poolPnumbers(id) {
     const p = state.pal[id];
     if (p.poolMode === 'picks') return p.locked.slice();
@@ -253,15 +272,48 @@
   }
 
   // ── Actions ───────────────────────────────────────────────────────────────
+  // The search streams (/gamut/optimize/stream): each pick renders as its greedy step
+  // lands, and clicking the run button again stops it — the cancel call ends the server
+  // loop, the abort drops the connection.
+  const searches = {};     // id -> { controller, job } of the running search
+
   async function runGreedy(id) {
+    if (searches[id]) { stopGreedy(id); return; }
     const btn = q(id, '[data-run]');
-    busy(btn, true);
+    const p = state.pal[id];
+    const search = searches[id] = { controller: new AbortController(), job: null };
+    btn.classList.add('is-busy');
+    const seq = [];
     try {
-      const p = state.pal[id];
-      const res = await postJSON('/gamut/optimize', { size: p.size, locked: p.locked, pool: poolPnumbers(id) });
-      renderPalette(id, res);
-    } catch (e) { q(id, '[data-result]').innerHTML = `<p class="muted">Search failed: ${e.message}</p>`; }
-    finally { busy(btn, false); }
+      const r = await fetch('/gamut/optimize/stream', {
+        method: 'POST', headers: { 'Content-Type': 'application/json' }, signal: search.controller.signal,
+        body: JSON.stringify({ size: p.size, locked: p.locked, pool: poolPnumbers(id) }),
+      });
+      if (!r.ok) throw new Error(`/gamut/optimize/stream → ${r.status}`);
+      await readNDJSON(r, (line) => {
+        if (line.job) search.job = line.job;
+        else if (line.pick) {
+          seq.push(line.pick);
+          renderPalette(id, { sequence: seq.slice(), total_volume: line.pick.volume_after });
+        } else if (line.done) renderPalette(id, { ...line, sequence: seq });
+        else if (line.error) throw new Error(line.error);
+      });
+    } catch (e) {
+      if (e.name !== 'AbortError') q(id, '[data-result]').innerHTML = `<p class="muted">Search failed: ${e.message}</p>`;
+    } finally {
+      delete searches[id];
+      btn.classList.remove('is-busy');
+    }
+  }
+
+  function stopGreedy(id) {
+    const search = searches[id];
+    if (search.job) {
+      fetch('/gamut/optimize/cancel', {
+        method: 'POST', headers: { 'Content-Type': 'application/json' }, body: JSON.stringify({ job: search.job }),
+      }).catch(() => {});
+    }
+    search.controller.abort();
   }
 
   async function scorePicks(id) {